@@ -0,0 +1 @@
+"""Benchmarks for the pyomdbapi project"""
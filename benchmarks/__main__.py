@@ -0,0 +1,30 @@
+"""Run the full benchmark suite
+
+Usage:
+    python -m benchmarks [--latency SECONDS] [--concurrency N [N ...]] [--duration SECONDS] [--number N]
+
+Requires PyYAML to load the recorded cassettes; `pip install pyomdbapi[benchmark]`
+"""
+
+import argparse
+
+from benchmarks import bench_client, bench_format
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pyomdbapi benchmark suite")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency added to each response")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="The concurrency levels")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds to run each client scenario")
+    parser.add_argument("--number", type=int, default=200, help="Iterations per formatting microbenchmark")
+    args = parser.parse_args()
+
+    print("Client benchmarks")
+    bench_client.run(args.latency, args.concurrency, args.duration)
+    print()
+    print("Formatting microbenchmarks")
+    bench_format.run(args.number)
+
+
+if __name__ == "__main__":
+    main()
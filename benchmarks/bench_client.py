@@ -0,0 +1,120 @@
+"""Throughput and latency benchmarks of the OMDB client against the local cassette server
+
+Usage:
+    python -m benchmarks.bench_client [--latency SECONDS] [--concurrency N [N ...]] [--duration SECONDS]
+"""
+
+import argparse
+import threading
+import time
+from math import ceil
+from typing import Callable, Dict, List
+
+from benchmarks.server import CassetteServer
+from omdb import OMDB
+
+# the ids with recorded responses
+BULK_IDS = ["tt0190332", "tt1323594"]
+
+
+def percentile(vals: List[float], pct: float) -> float:
+    """the nearest rank percentile of the values"""
+    if not vals:
+        return 0.0
+    vals = sorted(vals)
+    idx = max(0, min(len(vals) - 1, ceil(pct / 100 * len(vals)) - 1))
+    return vals[idx]
+
+
+def build_client(server: CassetteServer, max_workers: int, coalesce: bool = False) -> OMDB:
+    """an OMDB client pointed at the local cassette server; coalescing is disabled unless the scenario measures it"""
+    omdb = OMDB(api_key="benchmark", max_workers=max_workers, timeout=30, coalesce=coalesce)
+    omdb._api_url = server.url
+    return omdb
+
+
+SCENARIOS: Dict[str, Callable[[OMDB], object]] = {
+    "get": lambda omdb: omdb.get_movie(imdbid="tt0190332"),
+    "search (all pages)": lambda omdb: omdb.search_movie("malcolm"),
+    "get_series(pull_episodes)": lambda omdb: omdb.get_series(title="Battlestar Galactica", pull_episodes=True),
+    "get_many (50 ids)": lambda omdb: omdb.get_many(BULK_IDS * 25, deduplicate=False),
+    "get (coalesced)": lambda omdb: omdb.get_movie(imdbid="tt0190332"),
+}
+
+# the client options of the scenarios that differ from `build_client`
+SCENARIO_OPTIONS: Dict[str, Dict] = {
+    "get (coalesced)": {"coalesce": True},
+}
+
+
+def run_scenario(server: CassetteServer, func: Callable, concurrency: int, duration: float, **options) -> Dict:
+    """run `func` from `concurrency` threads, sharing one client, for `duration` seconds
+
+    Returns:
+        dict: The operations, requests sent, requests per second, and p50 / p99 latency (in seconds) of the \
+        operations"""
+    omdb = build_client(server, concurrency, **options)
+    func(omdb)  # warm up the connections
+    server.reset_counts()
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def worker():
+        local = []
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            func(omdb)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    requests, _ = server.reset_counts()
+    omdb.close()
+
+    return {
+        "ops": len(latencies),
+        "requests": requests,
+        "requests_per_second": requests / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def run(latency: float = 0.0, concurrency: List[int] = (1, 4, 16), duration: float = 2.0):
+    """run every client scenario at every concurrency level and print the results
+
+    Args:
+        latency (float): The number of seconds the server waits before each response
+        concurrency (list): The concurrency levels (threads and `max_workers`) to test
+        duration (float): The number of seconds to run each scenario"""
+    with CassetteServer(latency=latency) as server:
+        print(f"{'scenario':<26} {'conc':>4} {'ops':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for name, func in SCENARIOS.items():
+            for level in concurrency:
+                res = run_scenario(server, func, level, duration, **SCENARIO_OPTIONS.get(name, {}))
+                print(
+                    f"{name:<26} {level:>4} {res['ops']:>6} {res['requests_per_second']:>9.1f} "
+                    f"{res['p50'] * 1000:>9.2f} {res['p99'] * 1000:>9.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OMDB client against the recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency added to each response")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="The concurrency levels")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds to run each scenario")
+    args = parser.parse_args()
+    run(args.latency, args.concurrency, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Microbenchmarks for formatting the OMDB API results
+
+Usage:
+    python -m benchmarks.bench_format [--number N]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.cassettes import load_bodies
+from omdb import OMDB
+from omdb.decoders import JSONDecoder, OrjsonDecoder, orjson
+from omdb.utilities import HYPHENS, camelcase_to_snake_case, clean_up_strings, format_keys
+
+
+def legacy_camelcase_to_snake_case(_input):
+    """the original, character by character, implementation"""
+    res = _input[0].lower()
+    for i, letter in enumerate(_input[1:], 1):
+        if letter.isupper():
+            try:
+                if _input[i - 1].islower() or _input[i + 1].islower():
+                    res += "_"
+            except IndexError:
+                pass
+        res += letter.lower()
+    return res
+
+
+def legacy_clean_up_strings(val):
+    """the original implementation that builds the translation table on every call"""
+    hypens_dd = {ord(c): "-" for c in HYPHENS}
+    return val.translate(hypens_dd)
+
+
+def legacy_format_results(res):
+    """the original, in place, implementation of `OMDB._format_results` (without error checking)"""
+    keys = sorted(list(res.keys()))
+    for key in keys:
+        val = res.pop(key)
+        if isinstance(val, dict):
+            val = legacy_format_results(val)
+        if isinstance(val, list):
+            tmp = []
+            for _, itm in enumerate(val):
+                if isinstance(itm, dict):
+                    tmp.append(legacy_format_results(itm))
+                else:
+                    tmp.append(itm)
+            val = tmp
+        if isinstance(val, str):
+            val = legacy_clean_up_strings(val)
+        res[legacy_camelcase_to_snake_case(key)] = val
+    return res
+
+
+def compare(name, legacy, current, number):
+    """time the legacy and current implementations and print the speedup"""
+    legacy_time = min(timeit.repeat(legacy, number=number, repeat=5))
+    current_time = min(timeit.repeat(current, number=number, repeat=5))
+    print(
+        f"{name:<26} legacy: {legacy_time / number * 1e6:9.2f} us  "
+        f"current: {current_time / number * 1e6:9.2f} us  speedup: {legacy_time / current_time:5.2f}x"
+    )
+
+
+def run(number: int = 200):
+    """run the formatting microbenchmarks
+
+    Args:
+        number (int): The number of iterations per timing"""
+    omdb = OMDB(api_key="benchmark", strict=False)
+    raw = json.dumps(load_bodies())
+    keys = ["imdbID", "totalSeasons", "BoxOffice", "DVD", "Title", "imdbVotes", "seriesID", "totalResults"]
+    text = "Band of Brothers: The 7\u2010ELEVEN Story \u2013 2008\u2013"
+
+    def run_legacy_format():
+        for body in json.loads(raw):
+            legacy_format_results(body)
+
+    def run_current_format():
+        for body in json.loads(raw):
+            omdb._format_results(body, {})
+
+    compare(
+        "camelcase_to_snake_case",
+        lambda: [legacy_camelcase_to_snake_case(k) for k in keys],
+        lambda: [camelcase_to_snake_case(k) for k in keys],
+        number * 10,
+    )
+    compare("clean_up_strings", lambda: legacy_clean_up_strings(text), lambda: clean_up_strings(text), number * 10)
+    # both include decoding the JSON as the legacy implementation mutates the input
+    compare("_format_results", run_legacy_format, run_current_format, number)
+
+    # decoding the raw bodies; the legacy is `Response.json()` (decode the text) followed by formatting the keys
+    bodies = [json.dumps(body).encode("utf-8") for body in load_bodies()]
+    decoders = [("decode (json)", JSONDecoder()), ("decode (json, fused)", JSONDecoder(format_keys=True))]
+    if orjson is not None:
+        decoders.append(("decode (orjson)", OrjsonDecoder()))
+    for name, decoder in decoders:
+        compare(
+            name,
+            lambda: [format_keys(json.loads(body.decode("utf-8"))) for body in bodies],
+            lambda decoder=decoder: [omdb._format_results(decoder.decode(b), {}, decoder.formats_keys) for b in bodies],
+            number,
+        )
+    omdb.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for formatting the OMDB API results")
+    parser.add_argument("--number", type=int, default=200, help="The number of iterations per timing")
+    args = parser.parse_args()
+    run(args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Load the recorded OMDB API responses from the test cassettes"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import yaml
+
+CASSETTE_DIR = Path(__file__).resolve().parent.parent / "tests" / "cassettes"
+
+
+def iter_interactions(cassette_dir: Path = CASSETTE_DIR) -> Iterator[Tuple[Dict, bytes]]:
+    """Yield the request parameters (minus the `apikey`) and raw response body of every recorded interaction
+
+    Args:
+        cassette_dir (Path): The directory holding the VCR cassettes
+    Yields:
+        tuple: The request parameters and the raw response body"""
+    for path in sorted(cassette_dir.rglob("*.yaml")):
+        with open(path, encoding="utf-8") as fobj:
+            cassette = yaml.safe_load(fobj)
+        for interaction in cassette["interactions"]:
+            query = urlsplit(interaction["request"]["uri"]).query
+            params = {k: v for k, v in parse_qsl(query) if k != "apikey"}
+            body = interaction["response"]["body"]["string"]
+            yield params, body.encode("utf-8") if isinstance(body, str) else body
+
+
+def load_bodies(cassette_dir: Path = CASSETTE_DIR) -> List[Dict]:
+    """Decode every recorded JSON response body
+
+    Args:
+        cassette_dir (Path): The directory holding the VCR cassettes
+    Returns:
+        list: The decoded response bodies"""
+    bodies = []
+    for _, body in iter_interactions(cassette_dir):
+        try:
+            bodies.append(json.loads(body))
+        except ValueError:
+            continue
+    return bodies
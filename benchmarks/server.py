@@ -0,0 +1,115 @@
+"""Local stand-ins for the OMDB API; the base `LocalServer` is also used by the unittests"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.cassettes import CASSETTE_DIR, iter_interactions
+from omdb.cache import cache_key
+
+APOLLO_13 = {"Title": "Apollo 13", "imdbID": "tt0112384", "Response": "True"}
+NOT_FOUND = b'{"Response":"False","Error":"Movie not found!"}'
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Send the response built by the `respond` of the server"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = 1 << 16  # send the headers and body together
+
+    def do_GET(self):
+        server: LocalServer = self.server  # type: ignore
+        server.record_client(self.client_address)
+        status, headers, body = server.respond(self)
+        self.send_response(status)
+        for name, val in headers.items():
+            self.send_header(name, val)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    """A threaded HTTP server, on localhost, served from a background thread while used as a context manager; \
+    override `respond` to change the response, by default the Apollo 13 movie
+
+    Args:
+        port (int): The port to listen on; 0 to use any free port"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), LocalHandler)
+        self.lock = threading.Lock()
+        self.clients: Set[Tuple[str, int]] = set()
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.01,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        """str: The URL to use as the OMDB API url"""
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    def record_client(self, address: Tuple[str, int]):
+        """record the address of the connection used for the request"""
+        with self.lock:
+            self.clients.add(address)
+
+    def respond(self, handler: BaseHTTPRequestHandler) -> Response:
+        """build the status, headers, and body of the response to the request of the handler"""
+        return 200, {"Content-Type": "application/json"}, json.dumps(APOLLO_13).encode()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class CassetteServer(LocalServer):
+    """A threaded HTTP server, on localhost, serving the recorded OMDB API responses matching the request \
+    parameters (the `apikey` is ignored)
+
+    Args:
+        latency (float): The number of seconds to wait before responding to each request
+        cassette_dir (Path): The directory holding the VCR cassettes
+        port (int): The port to listen on; 0 to use any free port"""
+
+    def __init__(self, latency: float = 0.0, cassette_dir: Path = CASSETTE_DIR, port: int = 0):
+        super().__init__(port)
+        self.latency = latency
+        self.responses: Dict[str, bytes] = {cache_key(params): body for params, body in iter_interactions(cassette_dir)}
+        self.requests = 0
+        self.bytes_sent = 0
+
+    def respond(self, handler: BaseHTTPRequestHandler) -> Response:
+        params = dict(parse_qsl(urlsplit(handler.path).query))
+        body = self.responses.get(cache_key(params), NOT_FOUND)
+        self.record_request(len(body))
+        if self.latency:
+            time.sleep(self.latency)
+        return 200, {"Content-Type": "application/json; charset=utf-8"}, body
+
+    def record_request(self, num_bytes: int):
+        """count the requests served"""
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += num_bytes
+
+    def reset_counts(self) -> Tuple[int, int]:
+        """reset the request counters, returning the number of requests and bytes served since the last reset"""
+        with self.lock:
+            res = (self.requests, self.bytes_sent)
+            self.requests = 0
+            self.bytes_sent = 0
+        return res
@@ -1,7 +1,17 @@
 """the omdb module"""
 
-from omdb.exceptions import OMDBException, OMDBLimitReached, OMDBNoResults, OMDBTooManyResults
+from omdb.aliases import TitleAliases
+from omdb.async_omdb import AsyncOMDB
+from omdb.cache import LRUCache, SQLiteCache
+from omdb.concurrency import ConcurrencyLimiter
+from omdb.exceptions import OMDBException, OMDBLimitReached, OMDBNoResults, OMDBRateLimited, OMDBTooManyResults
+from omdb.hedging import HedgePolicy
+from omdb.index import TitleIndex
+from omdb.metrics import ClientMetrics, RequestEvent
+from omdb.models import Episode, Movie, Rating, SearchItem, Series
 from omdb.omdb import OMDB
+from omdb.prefetch import Prefetcher
+from omdb.rate_limiter import RateLimiter
 
 __author__ = "Tyler Barrus"
 __maintainer__ = "Tyler Barrus"
@@ -12,8 +22,25 @@ __url__ = "https://github.com/barrust/pyomdbapi"
 __bugtrack_url__ = f"{__url__}/issues"
 __all__ = [
     "OMDB",
+    "AsyncOMDB",
+    "LRUCache",
+    "SQLiteCache",
+    "TitleIndex",
+    "TitleAliases",
+    "RateLimiter",
+    "Prefetcher",
+    "HedgePolicy",
+    "ConcurrencyLimiter",
+    "ClientMetrics",
+    "RequestEvent",
+    "Movie",
+    "Series",
+    "Episode",
+    "SearchItem",
+    "Rating",
     "OMDBException",
     "OMDBNoResults",
     "OMDBLimitReached",
     "OMDBTooManyResults",
+    "OMDBRateLimited",
 ]
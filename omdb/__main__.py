@@ -0,0 +1,8 @@
+"""Run the command line batch tool: python -m omdb --help"""
+
+import sys
+
+from omdb.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Resolve titles to IMDB ids so title lookups share the id keyed cache entries and requests"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from omdb.models import Result
+from omdb.utilities import normalize_title
+
+AliasKey = Tuple[str, str, str]
+
+
+class TitleAliases:
+    """A thread-safe, least recently used, map of normalized title, year, and type to IMDB id, learned from \
+    the results of the OMDB API
+
+    Args:
+        max_entries (int): The maximum number of aliases to keep
+    Note:
+        When passed to `OMDB` as the `aliases`, title lookups that resolve are requested, and cached, using \
+        the IMDB id; the result of a title lookup not yet resolved is cached using its IMDB id, not the title. \
+        Episode lookups (using `season` or `episode`) are never resolved
+    Note:
+        Titles are matched ignoring case, accents, and punctuation, with hyphens standardized; see \
+        `omdb.utilities.normalize_title`"""
+
+    __slots__ = ["_max_entries", "_data", "_lock", "_hits", "_misses"]
+
+    def __init__(self, max_entries: int = 10000):
+        """init"""
+        if int(max_entries) < 1:
+            raise ValueError(f"TitleAliases max_entries must be at least 1! {max_entries} provided")
+        self._max_entries = int(max_entries)
+        self._data: OrderedDict[AliasKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def max_entries(self) -> int:
+        """int: The maximum number of aliases to keep"""
+        return self._max_entries
+
+    @property
+    def hits(self) -> int:
+        """int: The number of title lookups resolved to an IMDB id"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: The number of title lookups not resolved"""
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def key(title: str, year: Optional[Union[int, str]] = None, type: Optional[str] = None) -> AliasKey:
+        """Build the alias key
+
+        Args:
+            title (str): The title
+            year (int): The year; `None` if not specified
+            type (str): The type; `None` if not specified
+        Returns:
+            tuple: The normalized title, year, and type"""
+        return normalize_title(title), str(year or "").strip(), str(type or "").strip().lower()
+
+    def get(self, title: str, year: Optional[Union[int, str]] = None, type: Optional[str] = None) -> Optional[str]:
+        """Retrieve the IMDB id of a title
+
+        Args:
+            title (str): The title
+            year (int): The year; `None` if not specified
+            type (str): The type; `None` if not specified
+        Returns:
+            str: The IMDB id; `None` if not known"""
+        key = self.key(title, year, type)
+        with self._lock:
+            imdb_id = self._data.get(key)
+            if imdb_id is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._data.move_to_end(key)
+        return imdb_id
+
+    def set(self, title: str, imdb_id: str, year: Optional[Union[int, str]] = None, type: Optional[str] = None):
+        """Add, or replace, the IMDB id of a title; the least recently used alias is evicted when full
+
+        Args:
+            title (str): The title
+            imdb_id (str): The IMDB id
+            year (int): The year; `None` if not specified
+            type (str): The type; `None` if not specified"""
+        key = self.key(title, year, type)
+        if not key[0]:
+            return
+        with self._lock:
+            self._data[key] = imdb_id
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all aliases"""
+        with self._lock:
+            self._data.clear()
+
+    def resolve(self, params: Dict) -> Dict:
+        """Rewrite the parameters of a title lookup into an IMDB id lookup, if the title is known
+
+        Args:
+            params (dict): The parameters of the API request
+        Returns:
+            dict: The IMDB id lookup parameters; the original parameters if not a resolvable title lookup"""
+        if not _is_title_lookup(params):
+            return params
+        imdb_id = self.get(params["t"], params.get("y"), params.get("type"))
+        return params if imdb_id is None else self.id_lookup(params, imdb_id)
+
+    @staticmethod
+    def id_lookup(params: Dict, imdb_id: str) -> Dict:
+        """Rewrite the parameters of a title lookup into the IMDB id lookup of its result
+
+        Args:
+            params (dict): The parameters of the API request
+            imdb_id (str): The IMDB id of the result
+        Returns:
+            dict: The IMDB id lookup parameters; the original parameters if not a title lookup"""
+        if not _is_title_lookup(params):
+            return params
+        res = {k: v for k, v in params.items() if k not in ("t", "y")}
+        res["i"] = imdb_id
+        return res
+
+    def learn(self, params: Dict, res: Union[Dict, Result]):
+        """Learn the aliases of a result: the title lookup, if any, and the title, year, and type of each result
+
+        Args:
+            params (dict): The parameters of the API request
+            res (dict): The formatted result"""
+        if isinstance(res, Result):
+            res = res.to_dict()
+        if res.get("response") == "False":
+            return
+        if "search" in res:
+            for itm in res["search"] or ():
+                self._learn_result(itm)
+            return
+        if not res.get("imdb_id"):
+            return
+        if _is_title_lookup(params):
+            self.set(params["t"], res["imdb_id"], params.get("y"), params.get("type"))
+        self._learn_result(res)
+
+    def _learn_result(self, res: Union[Dict, Result]):
+        """learn the fully specified alias of a result"""
+        if isinstance(res, Result):
+            res = res.to_dict()
+        if res.get("title") and res.get("imdb_id"):
+            self.set(res["title"], res["imdb_id"], res.get("year"), res.get("type"))
+
+
+def _is_title_lookup(params: Dict) -> bool:
+    """whether the parameters are a title, rather than IMDB id or episode, lookup"""
+    return "t" in params and "i" not in params and "Season" not in params and "Episode" not in params
@@ -0,0 +1,401 @@
+"""OMDB API python wrapper library; asyncio version"""
+
+import asyncio
+from math import ceil
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+from omdb.aliases import TitleAliases
+from omdb.base import BaseOMDB
+from omdb.cache import BaseCache, cache_key
+from omdb.decoders import JSONDecoder
+from omdb.index import TitleIndex
+from omdb.models import Episode, Movie, Result, Series
+from omdb.singleflight import AsyncSingleFlight
+from omdb.utilities import range_inclusive, to_int
+
+
+class AsyncOMDB(BaseOMDB):
+    """ The asyncio OMDB API wrapper instance
+
+        Args:
+            api_key (str): The API Key to use for the requests
+            timeout (float): The timeout, in seconds
+            strict (bool): To use strict error checking or not; strict (True) \
+            will throw errors if the API returns an error code, non-strict will not
+            max_workers (int): The maximum number of concurrent requests used when pulling multiple pages \
+            or seasons; also used as the size of the connection pool
+            cache (BaseCache): The cache to use for formatted results; `None` to disable caching
+            coalesce (bool): `True` to share a single request between concurrent identical requests
+            models (bool): `True` to return compact, typed, result objects (see `omdb.models`) from `get_movie`, \
+            `get_series`, `get_episode`, and the searches rather than dictionaries
+            decoder (JSONDecoder): The decoder of the raw response bodies; `None` to use the fastest available
+            index (TitleIndex): The local index every `search` and `get` result is added to, for \
+            `search_local`; `None` to disable
+            aliases (TitleAliases): The map of titles to IMDB ids, learned from every result, used to request \
+            known titles by IMDB id; `None` to disable
+        Returns:
+            AsyncOMDB: An asyncio OMDB API wrapper connection object
+        Note:
+            Requires the `httpx` library; install using `pip install pyomdbapi[async]`
+        Note:
+            The cache is accessed synchronously; `LRUCache` is recommended over `SQLiteCache`
+        Note:
+            With `strict` disabled, it is up to the user to check for and handle errors """
+
+    __slots__ = ["_session", "_singleflight"]
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 5.0,
+        strict: bool = True,
+        max_workers: int = 4,
+        cache: Optional[BaseCache] = None,
+        coalesce: bool = True,
+        models: bool = False,
+        decoder: Optional[JSONDecoder] = None,
+        index: Optional[TitleIndex] = None,
+        aliases: Optional[TitleAliases] = None,
+    ):
+        """the init object"""
+        if httpx is None:
+            raise ImportError("AsyncOMDB requires httpx; install using `pip install pyomdbapi[async]`")
+        super().__init__(api_key, timeout, strict, max_workers, cache, coalesce, models, decoder, index, aliases)
+        self._singleflight = AsyncSingleFlight()
+        limits = httpx.Limits(max_connections=self.max_workers, max_keepalive_connections=self.max_workers)
+        self._session: Optional[httpx.AsyncClient] = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the httpx connection pool if necessary"""
+        if self._session:
+            await self._session.aclose()
+            self._session = None
+
+    async def search(self, title: str, pull_all_results: bool = True, page: int = 1, **kwargs) -> Dict:
+        """Perform a search based on title
+
+        Args:
+            title (str): The query string to lookup
+            page (int): The page of results to return
+            pull_all_results (bool): True to return all results; False to pull page only
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results
+        Note:
+            If `pull_all_results` is `True` then page is ignored; when using `models`, each search result is \
+            a `SearchItem`"""
+        params = self._search_params(title, pull_all_results, page, kwargs)
+        results = await self._query(params)
+
+        total_results = int(results.get("total_results", 0))
+        if not pull_all_results or total_results <= 10:  # 10 is the max that it will ever return
+            return self._to_search_models(results)
+
+        if "search" not in results:
+            results["search"] = []  # defensive
+
+        max_i = ceil(total_results / 10)
+        for data in await self._get_pages(params, range_inclusive(2, max_i)):
+            results["search"].extend(data.get("search", []))
+
+        return self._to_search_models(results)
+
+    async def search_local(
+        self, title: str, fuzzy: bool = False, fallback: bool = True, limit: Optional[int] = None, **kwargs
+    ) -> Dict:
+        """Search the local `index` of the titles already retrieved; every word must match, the last as a prefix
+
+        Args:
+            title (str): The query string to lookup, e.g., the text typed so far
+            fuzzy (bool): `True` to also include similar titles, e.g., misspelled, after the word matches
+            fallback (bool): `True` to `search` the OMDB API, adding the results to the index, when no titles match
+            limit (int): The maximum number of results from the index; `None` for all
+            kwargs (dict): the kwargs to add additional parameters to the API request; `type` and `y` also \
+            filter the index
+        Returns:
+            dict: A dictionary of all the results, the same as `search`
+        Raises:
+            OMDBException: When no `index` is used"""
+        res = self._search_index(title, fuzzy, limit, kwargs)
+        if res["search"] or not fallback:
+            return res
+        return await self.search(title, **kwargs)
+
+    async def iter_search(self, title: str, max_results: Optional[int] = None, **kwargs) -> AsyncIterator[Dict]:
+        """Lazily perform a search based on title, yielding each result
+
+        Args:
+            title (str): The query string to lookup
+            max_results (int): The maximum number of results to yield; `None` for all results
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Yields:
+            dict: The next search result; a `SearchItem` when using `models`
+        Note:
+            The next page is only requested once all results from the current page are consumed"""
+        if max_results is not None and max_results <= 0:
+            return
+
+        params = self._search_params(title, False, 1, kwargs)
+        num_yielded = 0
+        page = 1
+        max_page = 1
+        while page <= max_page:
+            results = await self._query({**params, "page": page})
+            if page == 1:
+                max_page = ceil(int(results.get("total_results", 0)) / 10)
+
+            for itm in self._to_search_models(results).get("search", []):
+                yield itm
+                num_yielded += 1
+                if max_results is not None and num_yielded >= max_results:
+                    return
+            page += 1
+
+    async def get(self, *, title: Optional[str] = None, imdbid: Optional[str] = None, **kwargs) -> Dict:
+        """Retrieve a specific movie, series, or episode
+
+        Args:
+            title (str): The title of the movie, series, or episode to return
+            imdbid (str): The IMDB Id to use to pull the result
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results
+        Raises:
+            OMDBException: Raised when both title or imdbid is not provided
+        Note:
+            Either `title` or `imdbid` is required"""
+        params = self._get_params(title, imdbid, kwargs)
+        return await self._query(params)
+
+    async def search_movie(self, title: str, pull_all_results: bool = True, page: int = 1, **kwargs) -> Dict:
+        """Search for a movie by title
+
+        Args:
+            title (str): The name, or part of a name, of the movie to look up
+            pull_all_results (bool): True to return all results; False to pull page only
+            page (int): The page of results to return
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results"""
+        params = {"type": "movie"}
+        params.update(kwargs)
+        return await self.search(title, pull_all_results, page, **params)
+
+    async def search_series(self, title: str, pull_all_results: bool = True, page: int = 1, **kwargs) -> Dict:
+        """Search for a TV series by title
+
+        Args:
+            title (str): The name, or part of a name, of the TV series to look up
+            pull_all_results (bool): True to return all results; False to pull page only
+            page (int): The page of results to return
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results"""
+        params = {"type": "series"}
+        params.update(kwargs)
+        return await self.search(title, pull_all_results, page, **params)
+
+    async def get_movie(
+        self, *, title: Optional[str] = None, imdbid: Optional[str] = None, **kwargs
+    ) -> Union[Dict, Movie]:
+        """Retrieve a movie by title or IMDB id
+
+        Args:
+            title (str): The name of the movie to retrieve
+            imdbid (str): The IMDB id of the movie to retrieve
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results; a `Movie` when using `models`
+        Note:
+            Either `title` or `imdbid` is required"""
+        params = {"type": "movie"}
+        params.update(kwargs)
+        return self._to_model(Movie, await self.get(title=title, imdbid=imdbid, **params))
+
+    async def get_series(
+        self,
+        *,
+        title: Optional[str] = None,
+        imdbid: Optional[str] = None,
+        pull_episodes: bool = False,
+        partial_results: bool = False,
+        **kwargs,
+    ) -> Union[Dict, Series]:
+        """Retrieve a TV series information by title or IMDB id
+
+        Args:
+            title (str): The name of the TV series to retrieve
+            imdbid (str): The IMDB id of the TV series to retrieve
+            pull_episodes (bool): `True` to pull the episodes; seasons are pulled concurrently
+            partial_results (bool): `True` to record seasons that fail to be pulled in `season_errors` \
+            rather than raising the exception
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results; a `Series` when using `models`
+        Note:
+            Either `title` or `imdbid` is required"""
+        params = {"type": "series"}
+        params.update(kwargs)
+        res = await self.get(title=title, imdbid=imdbid, **params)
+        if not pull_episodes:
+            return self._to_model(Series, res)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def pull_season(season_num: int) -> Dict:
+            async with semaphore:
+                return await self.get_episodes(title=title, imdbid=imdbid, season=season_num)
+
+        season_nums = list(range_inclusive(1, to_int(res.get("total_seasons", 0))))
+        seasons = await asyncio.gather(*[pull_season(i) for i in season_nums], return_exceptions=partial_results)
+
+        res["seasons"] = {}
+        if partial_results:
+            res["season_errors"] = {}
+        for season_num, season in zip(season_nums, seasons):
+            if isinstance(season, Exception):
+                res["season_errors"][season_num] = season
+            else:
+                res["seasons"][season_num] = season
+
+        return self._to_model(Series, res)
+
+    async def refresh_series(
+        self,
+        previous: Union[Dict, Series],
+        *,
+        title: Optional[str] = None,
+        imdbid: Optional[str] = None,
+        partial_results: bool = False,
+        **kwargs,
+    ) -> Tuple[Union[Dict, Series], Dict]:
+        """Incrementally refresh a TV series previously retrieved using `get_series(pull_episodes=True)`; only \
+        the newest previously pulled season and any new seasons are pulled
+
+        Args:
+            previous (dict): The previous `get_series` result; season numbers may be strings, e.g., when \
+            loaded from JSON
+            title (str): The name of the TV series to refresh; defaults to the IMDB id of `previous`
+            imdbid (str): The IMDB id of the TV series to refresh; defaults to the IMDB id of `previous`
+            partial_results (bool): `True` to record seasons that fail to be pulled in `season_errors` \
+            rather than raising the exception
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            tuple: The refreshed series, a dictionary or a `Series` when using `models`, with the previous and \
+            pulled seasons merged; and the episodes `added` and `changed`, each keyed by season number
+        Note:
+            Episodes are matched by their episode number; changes to seasons before the newest previously \
+            pulled season are not detected"""
+        if isinstance(previous, Result):
+            previous = previous.to_dict()
+        by_key = self._refresh_params(previous, title, imdbid)
+        params = {"type": "series"}
+        params.update(kwargs)
+        res = await self.get(**by_key, **params)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def pull_season(season_num: int) -> Dict:
+            async with semaphore:
+                return await self.get_episodes(**by_key, season=season_num)
+
+        previous_seasons = {to_int(k): v for k, v in (previous.get("seasons") or {}).items()}
+        season_nums = self._seasons_to_refresh(previous_seasons, to_int(res.get("total_seasons", 0)))
+        seasons = await asyncio.gather(*[pull_season(i) for i in season_nums], return_exceptions=partial_results)
+        diff = self._merge_seasons(res, previous_seasons, season_nums, seasons, partial_results)
+        return self._to_model(Series, res), diff
+
+    async def get_episode(
+        self,
+        *,
+        title: Optional[str] = None,
+        imdbid: Optional[str] = None,
+        season: int = 1,
+        episode: Optional[int] = 1,
+        **kwargs,
+    ) -> Union[Dict, Episode]:
+        """Retrieve a TV series episode by title or IMDB id and season and episode number
+
+        Args:
+            title (str): The name of the TV series to retrieve
+            imdbid (str): The IMDB id of the TV series to retrieve
+            season (int): The season number of the episode to retrieve
+            episode (int): The episode number (based on season) of the episode to retrieve
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results; a `Episode` when using `models`
+        Note:
+            Either `title` or `imdbid` is required"""
+        params = self._episode_params(season, episode, kwargs)
+        res = await self.get(title=title, imdbid=imdbid, **params)
+        return self._to_model(Episode, res) if episode else res
+
+    async def get_episodes(
+        self, *, title: Optional[str] = None, imdbid: Optional[str] = None, season: int = 1, **kwargs
+    ) -> Dict:
+        """Retrieve all episodes of a TV series by season number
+
+        Args:
+            title (str): The name of the TV series to retrieve
+            imdbid (str): The IMDB id of the movie to retrieve
+            season (int): The season number of the episode to retrieve
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            dict: A dictionary of all the results
+        Note:
+            Either `title` or `imdbid` is required"""
+        return await self.get_episode(title=title, imdbid=imdbid, season=season, episode=None, **kwargs)
+
+    async def _get_pages(self, params: Dict, pages) -> List[Dict]:
+        """pull the requested pages as concurrent tasks; results are returned in page order"""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def pull_page(page: int) -> Dict:
+            async with semaphore:
+                return await self._query({**params, "page": page})
+
+        return await asyncio.gather(*[pull_page(i) for i in pages])
+
+    async def _query(self, params: Dict) -> Dict:
+        """serve the request from the cache, if possible, otherwise from the OMDB API"""
+        return self._learn(params, await self._cached_query(self._resolve(params)))
+
+    async def _cached_query(self, params: Dict) -> Dict:
+        """serve the request from the cache, if possible, otherwise from the OMDB API"""
+        if self._cache is not None:
+            res = self._cache.get(params)
+            if res is not None:
+                return res
+
+        if not self._coalesce:
+            return await self._fetch_and_cache(params)
+
+        res, _ = await self._singleflight.do(cache_key(params), lambda: self._fetch_and_cache(params))
+        return res
+
+    async def _fetch_and_cache(self, params: Dict) -> Dict:
+        """request from the OMDB API and add the result to the cache"""
+        res = await self._get_response(params)
+        if self._cache is not None and res.get("response") != "False":  # do not cache errors when not `strict`
+            self._cache.set(self._cache_params(params, res), res)
+        return res
+
+    async def _get_response(self, kwargs):
+        """request, decode, and format the results"""
+        response = await self._send(kwargs)
+        return self._decode_results(response.content, kwargs)
+
+    async def _send(self, kwargs) -> "httpx.Response":
+        """wrapper for the `httpx` library call"""
+        return await self._session.get(self._api_url, params=kwargs, timeout=self._timeout)
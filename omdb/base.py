@@ -0,0 +1,351 @@
+"""Shared functionality for the sync and async OMDB API wrappers"""
+
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from requests.exceptions import JSONDecodeError
+
+from omdb.aliases import TitleAliases
+from omdb.cache import BaseCache
+from omdb.decoders import JSONDecoder, default_decoder
+from omdb.exceptions import OMDBException, OMDBInvalidAPIKey, error_of
+from omdb.index import TitleIndex
+from omdb.models import Result, SearchItem
+from omdb.utilities import format_keys, range_inclusive
+
+
+class BaseOMDB:
+    """ The base OMDB API wrapper; holds the settings, parameter building, and result formatting
+
+        Args:
+            api_key (str): The API Key to use for the requests
+            timeout (float): The timeout, in seconds
+            strict (bool): To use strict error checking or not; strict (True) \
+            will throw errors if the API returns an error code, non-strict will not
+            max_workers (int): The maximum number of concurrent requests used when pulling multiple pages
+            cache (BaseCache): The cache to use for formatted results; `None` to disable caching
+            coalesce (bool): `True` to share a single request between concurrent identical requests
+            models (bool): `True` to return compact, typed, result objects (see `omdb.models`) from `get_movie`, \
+            `get_series`, `get_episode`, and the searches rather than dictionaries
+            decoder (JSONDecoder): The decoder of the raw response bodies; `None` to use the fastest available
+            index (TitleIndex): The local index every `search` and `get` result is added to, for \
+            `search_local`; `None` to disable
+            aliases (TitleAliases): The map of titles to IMDB ids, learned from every result, used to request \
+            known titles by IMDB id; `None` to disable
+        Note:
+            With `strict` disabled, it is up to the user to check for and handle errors """
+
+    __slots__ = [
+        "_api_url",
+        "_timeout",
+        "_api_key",
+        "_strict",
+        "_max_workers",
+        "_cache",
+        "_coalesce",
+        "_models",
+        "_decoder",
+        "_index",
+        "_aliases",
+    ]
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 5.0,
+        strict: bool = True,
+        max_workers: int = 4,
+        cache: Optional[BaseCache] = None,
+        coalesce: bool = True,
+        models: bool = False,
+        decoder: Optional[JSONDecoder] = None,
+        index: Optional[TitleIndex] = None,
+        aliases: Optional[TitleAliases] = None,
+    ):
+        """the init object"""
+        self._api_url: str = "https://www.omdbapi.com/"
+        self._timeout: float = 5.0
+        self.timeout = timeout
+        self._api_key: str = ""
+        self.api_key = api_key
+        self._strict: bool = True
+        self.strict = strict
+        self._max_workers: int = 4
+        self.max_workers = max_workers
+        self._cache: Optional[BaseCache] = None
+        self.cache = cache
+        self._coalesce: bool = True
+        self.coalesce = coalesce
+        self._models: bool = False
+        self.models = models
+        self._decoder: JSONDecoder = default_decoder()
+        self.decoder = decoder
+        self._index: Optional[TitleIndex] = None
+        self.index = index
+        self._aliases: Optional[TitleAliases] = None
+        self.aliases = aliases
+
+    @property
+    def api_key(self) -> str:
+        """str: The API Key to use to connect to the OMDB API"""
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, val: str):
+        """set the API Key"""
+        if isinstance(val, str):
+            self._api_key = val
+        else:
+            raise OMDBInvalidAPIKey(val)
+
+    @property
+    def timeout(self) -> float:
+        """float: The timeout parameter to pass to requests for how long to wait"""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, val: float):
+        """set the timeout property"""
+        try:
+            self._timeout = float(val)
+        except ValueError as exc:
+            raise ValueError(f"OMDB Timeout must be a float or convertable to float! {val} provided") from exc
+
+    @property
+    def strict(self) -> bool:
+        """bool: Whether to throw or swallow errors; True will throw exceptions"""
+        return self._strict
+
+    @strict.setter
+    def strict(self, val: bool):
+        """set the strict property"""
+        self._strict = bool(val)
+
+    @property
+    def max_workers(self) -> int:
+        """int: The maximum number of concurrent requests to use when pulling multiple pages"""
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, val: int):
+        """set the max_workers property"""
+        try:
+            val = int(val)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"OMDB max_workers must be an int! {val} provided") from exc
+        if val < 1:
+            raise ValueError(f"OMDB max_workers must be at least 1! {val} provided")
+        self._max_workers = val
+
+    @property
+    def cache(self) -> Optional[BaseCache]:
+        """BaseCache: The cache used for formatted results; `None` if caching is disabled"""
+        return self._cache
+
+    @cache.setter
+    def cache(self, val: Optional[BaseCache]):
+        """set the cache property"""
+        if val is not None and not isinstance(val, BaseCache):
+            raise TypeError(f"OMDB cache must be a BaseCache or None! {type(val)} provided")
+        self._cache = val
+
+    @property
+    def coalesce(self) -> bool:
+        """bool: Whether concurrent identical requests share a single request to the OMDB API"""
+        return self._coalesce
+
+    @coalesce.setter
+    def coalesce(self, val: bool):
+        """set the coalesce property"""
+        self._coalesce = bool(val)
+
+    @property
+    def models(self) -> bool:
+        """bool: Whether results are returned as typed result objects rather than dictionaries"""
+        return self._models
+
+    @models.setter
+    def models(self, val: bool):
+        """set the models property"""
+        self._models = bool(val)
+
+    @property
+    def decoder(self) -> JSONDecoder:
+        """JSONDecoder: The decoder of the raw response bodies; set to `None` to use the fastest available"""
+        return self._decoder
+
+    @decoder.setter
+    def decoder(self, val: Optional[JSONDecoder]):
+        """set the decoder property"""
+        if val is None:
+            val = default_decoder()
+        elif not isinstance(val, JSONDecoder):
+            raise TypeError(f"OMDB decoder must be a JSONDecoder or None! {type(val)} provided")
+        self._decoder = val
+
+    @property
+    def index(self) -> Optional[TitleIndex]:
+        """TitleIndex: The local index of the titles retrieved; `None` if not used"""
+        return self._index
+
+    @index.setter
+    def index(self, val: Optional[TitleIndex]):
+        """set the index property"""
+        if val is not None and not isinstance(val, TitleIndex):
+            raise TypeError(f"OMDB index must be a TitleIndex or None! {type(val)} provided")
+        self._index = val
+
+    @property
+    def aliases(self) -> Optional[TitleAliases]:
+        """TitleAliases: The map of titles to IMDB ids; `None` if not used"""
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, val: Optional[TitleAliases]):
+        """set the aliases property"""
+        if val is not None and not isinstance(val, TitleAliases):
+            raise TypeError(f"OMDB aliases must be a TitleAliases or None! {type(val)} provided")
+        self._aliases = val
+
+    def _search_params(self, title: str, pull_all_results: bool, page: int, kwargs: Dict) -> Dict:
+        """build the parameters for a search request"""
+        params = {
+            "s": title,
+            "page": 1,
+            "apikey": self.api_key,
+        }  # set to the default...
+
+        if not pull_all_results:
+            params["page"] = page  # we are going to set it so that we can pull everything!
+
+        params.update(kwargs)
+        return params
+
+    def _get_params(self, title: Optional[str], imdbid: Optional[str], kwargs: Dict) -> Dict:
+        """build the parameters for a get request"""
+        params = {"apikey": self.api_key}
+        if imdbid:
+            params["i"] = imdbid
+        elif title:
+            params["t"] = title
+        else:
+            raise OMDBException("Either title or imdbid is required!")
+
+        params.update(kwargs)
+        return params
+
+    @staticmethod
+    def _episode_params(season: int, episode: Optional[int], kwargs: Dict) -> Dict:
+        """build the additional parameters for an episode request"""
+        params: Dict[str, Any] = {"type": "episode"}
+        if season:
+            params["Season"] = season
+        if episode:
+            params["Episode"] = episode
+        params.update(kwargs)
+        return params
+
+    @staticmethod
+    def _refresh_params(previous: Dict, title: Optional[str], imdbid: Optional[str]) -> Dict:
+        """the title or IMDB id of the series to refresh; the IMDB id of the previous result by default"""
+        if title or imdbid:
+            return {"title": title, "imdbid": imdbid}
+        if not previous.get("imdb_id"):
+            raise OMDBException("Either title or imdbid is required when the previous result has no imdb_id!")
+        return {"title": None, "imdbid": previous["imdb_id"]}
+
+    @staticmethod
+    def _seasons_to_refresh(previous_seasons: Dict[int, Dict], total_seasons: int) -> List[int]:
+        """the seasons that may have changed: the newest previously pulled season and any not pulled"""
+        season_nums = {i for i in range_inclusive(1, total_seasons) if i not in previous_seasons}
+        if previous_seasons:
+            season_nums.add(max(previous_seasons))
+        return sorted(season_nums)
+
+    @staticmethod
+    def _merge_seasons(
+        res: Dict, previous_seasons: Dict[int, Dict], season_nums: Sequence[int], seasons: Sequence, partial: bool
+    ) -> Dict:
+        """merge the pulled seasons into the previous seasons of the refreshed series; returns the episodes \
+        `added` and `changed`, keyed by season number"""
+        res["seasons"] = dict(previous_seasons)
+        if partial:
+            res["season_errors"] = {}
+        diff: Dict[str, Dict[int, List[Dict]]] = {"added": {}, "changed": {}}
+        for season_num, season in zip(season_nums, seasons):
+            if isinstance(season, Exception):
+                res["season_errors"][season_num] = season
+                continue
+            res["seasons"][season_num] = season
+            previous = {ep.get("episode"): ep for ep in previous_seasons.get(season_num, {}).get("episodes", [])}
+            for ep in season.get("episodes", []):
+                key = "added" if ep.get("episode") not in previous else "changed"
+                if key == "added" or ep != previous[ep.get("episode")]:
+                    diff[key].setdefault(season_num, []).append(ep)
+        res["seasons"] = dict(sorted(res["seasons"].items()))
+        return diff
+
+    def _resolve(self, params: Dict) -> Dict:
+        """rewrite a title lookup into an IMDB id lookup when the title is known"""
+        return params if self._aliases is None else self._aliases.resolve(params)
+
+    def _cache_params(self, params: Dict, res: Dict) -> Dict:
+        """the parameters the result is cached under; with aliases, title lookups are cached as the IMDB id \
+        lookup the title resolves to once learned"""
+        if self._aliases is None or not res.get("imdb_id"):
+            return params
+        return self._aliases.id_lookup(params, res["imdb_id"])
+
+    def _learn(self, params: Dict, res: Dict) -> Dict:
+        """add the titles of the result to the index and aliases, if used"""
+        if self._index is not None:
+            self._index.add_result(res)
+        if self._aliases is not None:
+            self._aliases.learn(params, res)
+        return res
+
+    def _search_index(self, title: str, fuzzy: bool, limit: Optional[int], kwargs: Dict) -> Dict:
+        """search the local index, using the `type` and `y` parameters as filters, formatted as a search result"""
+        if self._index is None:
+            raise OMDBException("search_local requires an index!")
+        items = self._index.search(title, type=kwargs.get("type"), year=kwargs.get("y"), fuzzy=fuzzy, limit=limit)
+        res = {"response": "True" if items else "False", "search": items, "total_results": str(len(items))}
+        return self._to_search_models(res)
+
+    def _to_model(self, model: Type[Result], res: Dict) -> Union[Dict, Result]:
+        """convert the formatted result to the model, when enabled; error results are not converted"""
+        if not self._models or res.get("response") == "False":
+            return res
+        return model.from_dict(res)
+
+    def _to_search_models(self, res: Dict) -> Dict:
+        """convert each search result to a `SearchItem`, when enabled"""
+        if self._models and "search" in res:
+            res["search"] = [SearchItem.from_dict(itm) for itm in res["search"]]
+        return res
+
+    def _decode_results(self, content: bytes, params: Dict) -> Dict:
+        """decode the raw response body and format the results
+
+        A body that is not JSON, such as an HTML error page, raises `requests.exceptions.JSONDecodeError` as \
+        `requests.Response.json` does"""
+        try:
+            res = self._decoder.decode(content)
+        except ValueError as exc:
+            doc = content.decode("utf-8", "replace") if isinstance(content, bytes) else str(content)
+            raise JSONDecodeError(getattr(exc, "msg", str(exc)), doc, getattr(exc, "pos", 0)) from exc
+        return self._format_results(res, params, self._decoder.formats_keys)
+
+    def _format_results(self, res, params, formatted: bool = False):
+        """format the results into non-camelcase dictionaries; `formatted` if the keys are already formatted"""
+        if not isinstance(res, dict):
+            raise TypeError(f"Expecting dict type, recieved {type(res)}")
+
+        if not formatted:
+            res = format_keys(res)
+
+        if self.strict:
+            exc = error_of(res, params, self.api_key)
+            if exc is not None:
+                raise exc
+
+        return res
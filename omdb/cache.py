@@ -0,0 +1,414 @@
+"""Response caches for the OMDB API wrappers"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+def cache_key(params: Dict) -> str:
+    """Build the canonical cache key for a set of request parameters; the `apikey` is excluded
+
+    Args:
+        params (dict): The parameters of the API request
+    Returns:
+        str: The canonical cache key"""
+    return urlencode(sorted((str(k), str(v)) for k, v in params.items() if k != "apikey"))
+
+
+class CacheEntry:
+    """A cached result along with its freshness and HTTP validators
+
+    Args:
+        value (dict): A copy of the cached result
+        fresh (bool): `False` if the result has expired and must be revalidated before use
+        validators (dict): The `etag` and `last_modified` validators of the result; `None` if there are none"""
+
+    __slots__ = ["value", "fresh", "validators"]
+
+    def __init__(self, value: Dict, fresh: bool = True, validators: Optional[Dict[str, str]] = None):
+        """init"""
+        self.value = value
+        self.fresh = fresh
+        self.validators = validators
+
+
+class BaseCache:
+    """The base response cache; stores the formatted results keyed on the canonical request parameters
+
+    Note:
+        Expired results that have validators are kept, until evicted, so they may be revalidated using a \
+        conditional request; see `get_entry`
+    Note:
+        Sub-classes need to implement `_get_entry`, `_set`, `_refresh`, `_delete`, and `clear`"""
+
+    __slots__ = ["_hits", "_misses", "_evictions", "_stats_lock"]
+
+    def __init__(self):
+        """init"""
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        """int: The number of lookups that were served from the cache"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: The number of lookups that were not found in the cache"""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """int: The number of entries removed due to size or age"""
+        return self._evictions
+
+    def get(self, params: Dict) -> Optional[Dict]:
+        """Retrieve the cached result for the request parameters
+
+        Args:
+            params (dict): The parameters of the API request
+        Returns:
+            dict: A copy of the cached result; `None` if not cached or expired"""
+        entry = self._get_entry(cache_key(params), False)
+        val = None if entry is None else entry.value
+        with self._stats_lock:
+            if val is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return val
+
+    def get_entry(self, params: Dict) -> Optional[CacheEntry]:
+        """Retrieve the cached result for the request parameters, including an expired result that may be \
+        revalidated; the hits and misses are not updated
+
+        Args:
+            params (dict): The parameters of the API request
+        Returns:
+            CacheEntry: The cached result, its freshness, and its validators; `None` if not cached"""
+        return self._get_entry(cache_key(params), True)
+
+    def set(self, params: Dict, value: Dict, ttl: Optional[float] = None, validators: Optional[Dict[str, str]] = None):
+        """Add the result for the request parameters to the cache
+
+        Args:
+            params (dict): The parameters of the API request
+            value (dict): The formatted result to cache
+            ttl (float): The number of seconds this result is valid; `None` to use the cache default, 0 to \
+            require revalidation before use
+            validators (dict): The `etag` and `last_modified` validators used to revalidate the result"""
+        self._set(cache_key(params), value, ttl, validators)
+
+    def refresh(self, params: Dict, ttl: Optional[float] = None, validators: Optional[Dict[str, str]] = None) -> bool:
+        """Extend the lifetime of a cached result; used when revalidation shows it is not modified
+
+        Args:
+            params (dict): The parameters of the API request
+            ttl (float): The number of seconds this result is valid; `None` to use the cache default
+            validators (dict): The new validators of the result; `None` to keep the current validators
+        Returns:
+            bool: `True` if the result was cached"""
+        return self._refresh(cache_key(params), ttl, validators)
+
+    def invalidate(self, params: Dict) -> bool:
+        """Remove the cached result for the request parameters
+
+        Args:
+            params (dict): The parameters of the API request
+        Returns:
+            bool: `True` if an entry was removed"""
+        return self._delete(cache_key(params))
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        raise NotImplementedError
+
+    def _record_evictions(self, num: int):
+        """update the evictions counter"""
+        if num:
+            with self._stats_lock:
+                self._evictions += num
+
+    def _get_entry(self, key: str, include_stale: bool) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Dict, ttl: Optional[float], validators: Optional[Dict[str, str]]):
+        raise NotImplementedError
+
+    def _refresh(self, key: str, ttl: Optional[float], validators: Optional[Dict[str, str]]) -> bool:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class LRUCache(BaseCache):
+    """An in-memory, thread-safe, least recently used response cache with optional time to live
+
+    Args:
+        max_entries (int): The maximum number of results to keep
+        ttl (float): The number of seconds a result is valid; `None` to never expire"""
+
+    __slots__ = ["_max_entries", "_ttl", "_data", "_lock"]
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        """init"""
+        super().__init__()
+        if int(max_entries) < 1:
+            raise ValueError(f"LRUCache max_entries must be at least 1! {max_entries} provided")
+        self._max_entries = int(max_entries)
+        self._ttl = float(ttl) if ttl else None
+        self._data: OrderedDict[str, Tuple[float, Any, Optional[Dict[str, str]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self) -> int:
+        """int: The maximum number of results to keep"""
+        return self._max_entries
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """float: The number of seconds a result is valid"""
+        return self._ttl
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._data.clear()
+
+    def _get_entry(self, key: str, include_stale: bool) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value, validators = entry
+            fresh = not expires or expires > time.monotonic()
+            if not fresh and validators is None:
+                del self._data[key]
+                self._record_evictions(1)
+                return None
+            if not fresh and not include_stale:
+                return None
+            self._data.move_to_end(key)
+        return CacheEntry(deepcopy(value), fresh, validators)
+
+    def _expires(self, ttl: Optional[float]) -> float:
+        """the monotonic expiry time; 0 to never expire"""
+        ttl = self._ttl if ttl is None else ttl
+        return time.monotonic() + ttl if ttl is not None else 0.0
+
+    def _set(self, key: str, value: Dict, ttl: Optional[float], validators: Optional[Dict[str, str]]):
+        expires = self._expires(ttl)
+        value = deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires, value, validators)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        self._record_evictions(evicted)
+
+    def _refresh(self, key: str, ttl: Optional[float], validators: Optional[Dict[str, str]]) -> bool:
+        expires = self._expires(ttl)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            self._data[key] = (expires, entry[1], entry[2] if validators is None else validators)
+            self._data.move_to_end(key)
+        return True
+
+    def _delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+
+class SQLiteCache(BaseCache):
+    """A persistent, file based, response cache; safe to share between threads and processes
+
+    Args:
+        path (str): The path to the SQLite database file
+        max_entries (int): The maximum number of results to keep; least recently used results are removed
+        ttl (float): The default number of seconds a result is valid; `None` to never expire
+        prune_interval (int): The number of writes, per instance, between enforcing `max_entries`
+        busy_timeout (float): The number of seconds to wait on a database locked by another process
+        touch_interval (float): The number of seconds between recording when a result was last used; reads \
+        within the interval do not write, so processes sharing the file are not serialized on reads
+    Note:
+        Entries are read from disk as requested; nothing is loaded into memory on startup
+    Note:
+        The number of entries may exceed `max_entries` by up to `prune_interval` between prunes"""
+
+    __slots__ = [
+        "_path",
+        "_max_entries",
+        "_ttl",
+        "_prune_interval",
+        "_busy_timeout",
+        "_touch_interval",
+        "_writes",
+        "_conns",
+        "_lock",
+    ]
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        ttl: Optional[float] = None,
+        prune_interval: int = 100,
+        busy_timeout: float = 30.0,
+        touch_interval: float = 60.0,
+    ):
+        """init"""
+        super().__init__()
+        if int(max_entries) < 1:
+            raise ValueError(f"SQLiteCache max_entries must be at least 1! {max_entries} provided")
+        self._path = str(path)
+        self._max_entries = int(max_entries)
+        self._ttl = float(ttl) if ttl else None
+        self._prune_interval = max(1, int(prune_interval))
+        self._busy_timeout = float(busy_timeout)
+        self._touch_interval = max(0.0, float(touch_interval))
+        self._writes = 0
+        self._conns: Dict[threading.Thread, sqlite3.Connection] = {}  # the connection of each thread
+        self._lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS omdb_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL, "
+            "validators TEXT)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(omdb_cache)")}
+        if "validators" not in columns:  # created by an earlier version
+            conn.execute("ALTER TABLE omdb_cache ADD COLUMN validators TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS omdb_cache_accessed ON omdb_cache (accessed)")
+
+    @property
+    def path(self) -> str:
+        """str: The path to the SQLite database file"""
+        return self._path
+
+    @property
+    def max_entries(self) -> int:
+        """int: The maximum number of results to keep"""
+        return self._max_entries
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """float: The default number of seconds a result is valid"""
+        return self._ttl
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM omdb_cache").fetchone()[0]
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._connection().execute("DELETE FROM omdb_cache")
+
+    def close(self):
+        """Close the database connections of every thread; a new connection is opened if used again"""
+        with self._lock:
+            conns, self._conns = list(self._conns.values()), {}
+        for conn in conns:
+            conn.close()
+
+    def prune(self) -> int:
+        """Remove expired results, other than those that may be revalidated, and enforce `max_entries`
+
+        Returns:
+            int: The number of results removed"""
+        conn = self._connection()
+        with conn:
+            removed = conn.execute(
+                "DELETE FROM omdb_cache WHERE expires > 0 AND expires <= ? AND validators IS NULL", (time.time(),)
+            ).rowcount
+            removed += conn.execute(
+                "DELETE FROM omdb_cache WHERE key IN "
+                "(SELECT key FROM omdb_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            ).rowcount
+        self._record_evictions(removed)
+        return removed
+
+    def _connection(self) -> sqlite3.Connection:
+        """a connection per thread; sqlite3 connections are not to be shared between threads, but may be closed \
+        by `close` or once their thread exits"""
+        thread = threading.current_thread()
+        conn = self._conns.get(thread)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                exited = [self._conns.pop(other) for other in list(self._conns) if not other.is_alive()]
+                self._conns[thread] = conn
+            for other in exited:
+                other.close()
+        return conn
+
+    def _get_entry(self, key: str, include_stale: bool) -> Optional[CacheEntry]:
+        conn = self._connection()
+        sql = "SELECT value, expires, validators, accessed FROM omdb_cache WHERE key = ?"
+        row = conn.execute(sql, (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        fresh = not row[1] or row[1] > now
+        if not fresh and row[2] is None:
+            sql = "DELETE FROM omdb_cache WHERE key = ? AND expires > 0 AND expires <= ? AND validators IS NULL"
+            if conn.execute(sql, (key, now)).rowcount:
+                self._record_evictions(1)
+            return None
+        if not fresh and not include_stale:
+            return None
+        if now - row[3] >= self._touch_interval:  # reads only write occasionally
+            sql = "UPDATE omdb_cache SET accessed = ? WHERE key = ? AND accessed < ?"
+            conn.execute(sql, (now, key, now - self._touch_interval))
+        return CacheEntry(json.loads(row[0]), fresh, None if row[2] is None else json.loads(row[2]))
+
+    def _expires(self, ttl: Optional[float], now: float) -> float:
+        """the expiry time; 0 to never expire"""
+        ttl = self._ttl if ttl is None else ttl
+        return now + ttl if ttl is not None else 0.0
+
+    def _set(self, key: str, value: Dict, ttl: Optional[float], validators: Optional[Dict[str, str]]):
+        now = time.time()
+        row = (key, json.dumps(value), self._expires(ttl, now), now, self._dumps(validators))
+        self._connection().execute(
+            "INSERT OR REPLACE INTO omdb_cache (key, value, expires, accessed, validators) VALUES (?, ?, ?, ?, ?)", row
+        )
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % self._prune_interval == 0
+        if should_prune:
+            self.prune()
+
+    def _refresh(self, key: str, ttl: Optional[float], validators: Optional[Dict[str, str]]) -> bool:
+        now = time.time()
+        sql = "UPDATE omdb_cache SET expires = ?, accessed = ?, validators = COALESCE(?, validators) WHERE key = ?"
+        cursor = self._connection().execute(sql, (self._expires(ttl, now), now, self._dumps(validators), key))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _dumps(validators: Optional[Dict[str, str]]) -> Optional[str]:
+        """serialize the validators"""
+        return None if validators is None else json.dumps(validators)
+
+    def _delete(self, key: str) -> bool:
+        return self._connection().execute("DELETE FROM omdb_cache WHERE key = ?", (key,)).rowcount > 0
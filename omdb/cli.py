@@ -0,0 +1,240 @@
+"""Command line batch lookups against the OMDB API
+
+Usage:
+    python -m omdb [INPUT] [--mode {get,series,search}] [--concurrency N] [--rate-limit PER_SECOND] [--cache PATH]
+
+Each line of INPUT (stdin by default) is an IMDB id or title, or a search string for `search`; the results are
+written to stdout as JSON Lines and a summary is written to stderr.
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from requests.adapters import DEFAULT_POOLSIZE
+
+from omdb.cache import SQLiteCache
+from omdb.export import JSONLinesWriter
+from omdb.metrics import ClientMetrics, Histogram
+from omdb.omdb import OMDB
+from omdb.rate_limiter import RateLimiter
+from omdb.utilities import imap_bounded, is_imdbid
+
+MODES = ("get", "series", "search")
+
+
+def read_keys(fobj: IO[str]) -> Iterator[str]:
+    """Lazily read the IMDB ids or titles, one per line; blank lines are skipped
+
+    Args:
+        fobj (file): The text file to read
+    Yields:
+        str: The next key"""
+    for line in fobj:
+        key = line.strip()
+        if key:
+            yield key
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser
+
+    Returns:
+        ArgumentParser: The parser"""
+    parser = argparse.ArgumentParser(
+        prog="python -m omdb",
+        description="Look up IMDB ids or titles, one per line, writing the results to stdout as JSON Lines",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="The file of IMDB ids or titles; - for stdin")
+    parser.add_argument("--mode", choices=MODES, default="get", help="The lookup to run for each line")
+    parser.add_argument("--api-key", default=None, help="The OMDB API key; defaults to $OMDB_API_KEY")
+    parser.add_argument("--concurrency", type=int, default=4, help="The maximum number of requests in flight")
+    parser.add_argument("--rate-limit", type=float, default=None, help="The maximum requests per second")
+    parser.add_argument("--daily-limit", type=int, default=None, help="The maximum requests per day")
+    parser.add_argument("--max-wait", type=float, default=None, help="Seconds to wait for the rate limit")
+    parser.add_argument("--cache", default=None, help="The path of a SQLite cache of results")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="Seconds before cached results expire")
+    parser.add_argument("--timeout", type=float, default=5.0, help="The request timeout, in seconds")
+    parser.add_argument("--no-strict", dest="strict", action="store_false", help="Write API errors as results")
+    parser.add_argument("--ordered", action="store_true", help="Write results in input order")
+    parser.add_argument("--type", choices=("movie", "series", "episode"), default=None, help="The type of result")
+    parser.add_argument("--plot", choices=("short", "full"), default=None, help="The length of the plot")
+    parser.add_argument("--year", default=None, help="The year of release")
+    parser.add_argument("--pull-episodes", action="store_true", help="Pull the episodes of each series")
+    return parser
+
+
+def build_client(args: argparse.Namespace) -> OMDB:
+    """Build the OMDB API wrapper from the command line arguments
+
+    Args:
+        args (Namespace): The parsed arguments
+    Returns:
+        OMDB: The OMDB API wrapper
+    Note:
+        The lookups of `run` are the only fan out; each lookup sends its requests, e.g., the pages of a \
+        search or the seasons of a series, one at a time so `--concurrency` bounds the requests in flight"""
+    rate_limiter = None
+    if args.rate_limit or args.daily_limit:
+        rate_limiter = RateLimiter(per_second=args.rate_limit, per_day=args.daily_limit, max_wait=args.max_wait)
+    cache = SQLiteCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+    return OMDB(
+        args.api_key,
+        timeout=args.timeout,
+        strict=args.strict,
+        max_workers=1,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        pool_maxsize=max(DEFAULT_POOLSIZE, args.concurrency),
+    )
+
+
+def request_params(args: argparse.Namespace) -> Dict[str, str]:
+    """The additional parameters of each API request from the command line arguments
+
+    Args:
+        args (Namespace): The parsed arguments
+    Returns:
+        dict: The parameters"""
+    return {k: v for k, v in (("type", args.type), ("plot", args.plot), ("y", args.year)) if v is not None}
+
+
+def _lookup(omdb: OMDB, mode: str, pull_episodes: bool, params: Dict) -> Callable[[str], Dict]:
+    """the lookup to run for each key"""
+    if mode == "search":
+        return lambda key: omdb.search(key, **params)
+
+    def lookup(key: str) -> Dict:
+        by_key = {"imdbid": key} if is_imdbid(key) else {"title": key}
+        if mode == "series":
+            return omdb.get_series(pull_episodes=pull_episodes, **by_key, **params)
+        return omdb.get(**by_key, **params)
+
+    return lookup
+
+
+def run(
+    omdb: OMDB,
+    keys: Iterable[str],
+    out: IO[str],
+    mode: str = "get",
+    ordered: bool = False,
+    pull_episodes: bool = False,
+    concurrency: Optional[int] = None,
+    **kwargs,
+) -> Dict:
+    """Look up each key concurrently, writing the results to `out` as JSON Lines as they complete
+
+    Args:
+        omdb (OMDB): The OMDB API wrapper to use
+        keys (iterable): The IMDB ids or titles, or search strings for `search`
+        out (file): The text file to write to
+        mode (str): The lookup to run; `get`, `series`, or `search`
+        ordered (bool): `True` to write the results in the order of `keys`; otherwise in completion order
+        pull_episodes (bool): `True` to pull the episodes of each series
+        concurrency (int): The number of lookups in flight; defaults to the `max_workers` of `omdb`
+        kwargs (dict): the kwargs to add additional parameters to the API requests
+    Returns:
+        dict: The number of `keys`, `results`, and `errors`, the `elapsed` seconds, and the `latency` \
+        histogram of each lookup
+    Note:
+        Each search result is written as its own line
+    Note:
+        Each lookup also fans out using the `max_workers` of `omdb`, e.g., the pages of a search; build `omdb` \
+        with `max_workers=1` to bound the requests in flight to `concurrency`"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode}; use one of {', '.join(MODES)}")
+    lookup = _lookup(omdb, mode, pull_episodes, kwargs)
+    latency = Histogram()
+
+    def timed(key: str) -> Dict:
+        start = perf_counter()
+        try:
+            return lookup(key)
+        finally:
+            latency.observe(perf_counter() - start)
+
+    num_keys = 0
+    start = perf_counter()
+    with JSONLinesWriter(out) as writer:
+        for key, res in imap_bounded(timed, keys, concurrency or omdb.max_workers, ordered):
+            num_keys += 1
+            if mode == "search" and not isinstance(res, Exception):
+                for itm in res.get("search", []):
+                    writer.write(itm, key)
+            else:
+                writer.write(res, key)
+    return {
+        "keys": num_keys,
+        "results": writer.written,
+        "errors": writer.errors,
+        "elapsed": perf_counter() - start,
+        "latency": latency,
+    }
+
+
+def format_summary(stats: Dict, metrics: Optional[ClientMetrics] = None) -> str:
+    """Format the throughput and latency summary of a run
+
+    Args:
+        stats (dict): The statistics returned by `run`
+        metrics (ClientMetrics): The metrics of the requests sent during the run
+    Returns:
+        str: The summary"""
+    elapsed = stats["elapsed"]
+    latency: Histogram = stats["latency"]
+    lines = [
+        f"{stats['keys']} keys: {stats['results']} results, {stats['errors']} errors in {elapsed:.2f}s "
+        f"({stats['keys'] / elapsed if elapsed else 0.0:.1f} keys/s)",
+        "latency: " + ", ".join(f"p{int(q * 100)} {latency.quantile(q):.3f}s" for q in (0.5, 0.95, 0.99)),
+    ]
+    if metrics is not None:
+        snap = metrics.snapshot()
+        requests = sum(snap["requests"].values())
+        parts: List[str] = [f"{requests} requests", f"{snap['cache'].get('hit', 0)} cache hits"]
+        parts.append(f"{snap['coalesced']} coalesced")
+        parts.extend(f"{num} {name}" for name, num in sorted(snap["errors"].items()))
+        lines.append("requests: " + ", ".join(parts))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line tool
+
+    Args:
+        argv (list): The command line arguments; defaults to `sys.argv`
+    Returns:
+        int: The exit code; 1 if any lookup failed"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.api_key = args.api_key or os.getenv("OMDB_API_KEY")
+    if not args.api_key:
+        parser.error("an API key is required; use --api-key or set OMDB_API_KEY")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    omdb = build_client(args)
+    metrics = ClientMetrics()
+    omdb.add_hook(metrics)
+    fobj = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")  # noqa: SIM115
+    try:
+        stats = run(
+            omdb,
+            read_keys(fobj),
+            sys.stdout,
+            mode=args.mode,
+            ordered=args.ordered,
+            pull_episodes=args.pull_episodes,
+            concurrency=args.concurrency,
+            **request_params(args),
+        )
+    finally:
+        if fobj is not sys.stdin:
+            fobj.close()
+        omdb.close()
+        if omdb.cache is not None:
+            omdb.cache.close()
+    print(format_summary(stats, metrics), file=sys.stderr)
+    return 1 if stats["errors"] else 0
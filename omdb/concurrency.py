@@ -0,0 +1,206 @@
+"""Adaptive concurrency limiting of the requests to the OMDB API"""
+
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, Optional, Union
+
+from omdb.exceptions import OMDBException, OMDBLimitReached
+
+# the errors of the OMDB API that signal it is overloaded; e.g., "Error getting data."
+OVERLOAD_ERRORS = ("error getting data", "request limit reached")
+
+# the number of response times observed before latency degradation is detected
+MIN_SAMPLES = 50
+
+
+def is_overloaded(error: Union[Exception, str, None]) -> bool:
+    """Determine if an exception, or the error of a result, signals that the OMDB API is overloaded
+
+    Args:
+        error (Exception or str): The exception raised, or the `error` of a result when not `strict`
+    Returns:
+        bool: `True` for request limits, unknown errors such as `Error getting data.`, timeouts, and \
+        connection errors"""
+    if error is None:
+        return False
+    if isinstance(error, (OMDBLimitReached, OSError)):  # the `requests` exceptions are `OSError`
+        return True
+    if isinstance(error, OMDBException):
+        error = error.message
+    if not isinstance(error, str):
+        return False
+    error = error.lower()
+    return any(err in error for err in OVERLOAD_ERRORS)
+
+
+class ConcurrencyLimiter:
+    """A thread-safe, additive increase multiplicative decrease (AIMD), limit of the requests in flight
+
+    Args:
+        initial (int): The starting limit
+        min_limit (int): The smallest the limit is reduced to
+        max_limit (int): The largest the limit grows to
+        backoff (float): The factor the limit is multiplied by when the OMDB API is overloaded
+        tolerance (float): A median recent response time over `tolerance` times the baseline signals latency \
+        degradation
+        window (int): The number of recent response times used to determine the median
+        baseline_window (int): The number of responses the baseline, a moving average of the median, \
+        follows; larger adapts to lasting changes in the response times more slowly
+    Note:
+        While every slot is in use, each healthy response grows the limit by `1 / limit`; about one per round \
+        trip. Overload errors (see `is_overloaded`) and degraded latency reduce it, at most once per round \
+        trip; only requests sent after the last reduction may reduce it again
+    Note:
+        Comparing the median, rather than each response, to the baseline tolerates the occasional slow \
+        response of a healthy, long tailed, OMDB API
+    Note:
+        Use `limit` and `stats` to monitor the current limit"""
+
+    __slots__ = [
+        "_limit",
+        "_min_limit",
+        "_max_limit",
+        "_backoff",
+        "_tolerance",
+        "_latencies",
+        "_smoothing",
+        "_baseline",
+        "_observed",
+        "_in_flight",
+        "_reduced",
+        "_cond",
+        "_increases",
+        "_decreases",
+    ]
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+        window: int = 100,
+        baseline_window: int = 1000,
+    ):
+        """init"""
+        if not 1 <= int(min_limit) <= int(initial) <= int(max_limit):
+            raise ValueError(
+                f"ConcurrencyLimiter requires 1 <= min_limit <= initial <= max_limit! {min_limit}, {initial}, "
+                f"{max_limit} provided"
+            )
+        if not 0.0 < backoff < 1.0:
+            raise ValueError(f"ConcurrencyLimiter backoff must be between 0 and 1! {backoff} provided")
+        if tolerance <= 1.0:
+            raise ValueError(f"ConcurrencyLimiter tolerance must be greater than 1! {tolerance} provided")
+        self._limit = float(initial)
+        self._min_limit = int(min_limit)
+        self._max_limit = int(max_limit)
+        self._backoff = float(backoff)
+        self._tolerance = float(tolerance)
+        self._latencies: Deque[float] = deque(maxlen=max(MIN_SAMPLES, int(window)))
+        self._smoothing = 2.0 / (max(1, int(baseline_window)) + 1)  # the weight of each new median
+        self._baseline: Optional[float] = None
+        self._observed: int = 0
+        self._in_flight: int = 0
+        self._reduced: float = float("-inf")  # when the limit was last reduced
+        self._cond = threading.Condition()
+        self._increases: int = 0
+        self._decreases: int = 0
+
+    @property
+    def limit(self) -> int:
+        """int: The current maximum number of requests in flight"""
+        return int(self._limit)
+
+    @property
+    def min_limit(self) -> int:
+        """int: The smallest the limit is reduced to"""
+        return self._min_limit
+
+    @property
+    def max_limit(self) -> int:
+        """int: The largest the limit grows to"""
+        return self._max_limit
+
+    @property
+    def in_flight(self) -> int:
+        """int: The number of requests in flight"""
+        return self._in_flight
+
+    @property
+    def increases(self) -> int:
+        """int: The number of times the limit grew"""
+        return self._increases
+
+    @property
+    def decreases(self) -> int:
+        """int: The number of times the limit was reduced"""
+        return self._decreases
+
+    @property
+    def baseline(self) -> Optional[float]:
+        """float: The long term, moving average, median response time in seconds; `None` if no response was \
+        observed"""
+        return self._baseline
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """The current limit, the requests in flight, the counters, and the baseline response time
+
+        Returns:
+            dict: The `limit`, `in_flight`, `increases`, `decreases`, and `baseline`"""
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "baseline": self._baseline,
+            }
+
+    def acquire(self) -> float:
+        """Wait for a free slot
+
+        Returns:
+            float: The time the request started; pass to `release`"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        return perf_counter()
+
+    def release(self, start: float, overloaded: bool = False):
+        """Free the slot, adjusting the limit using the response time and whether the OMDB API is overloaded
+
+        Args:
+            start (float): The time the request started, as returned by `acquire`
+            overloaded (bool): `True` if the request failed because the OMDB API is overloaded"""
+        now = perf_counter()
+        latency = now - start
+        with self._cond:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            degraded = False
+            if not overloaded:
+                self._latencies.append(latency)
+                self._observed += 1
+                median = sorted(self._latencies)[len(self._latencies) // 2]
+                baseline = median if self._baseline is None else self._baseline
+                degraded = self._observed >= MIN_SAMPLES and median > self._tolerance * baseline
+                # the plain average of the medians until enough are observed for the moving average
+                self._baseline = baseline + max(self._smoothing, 1.0 / self._observed) * (median - baseline)
+
+            if overloaded or degraded:
+                if start > self._reduced:  # not already reduced for the requests in flight
+                    self._reduced = now
+                    limit = max(float(self._min_limit), self._limit * self._backoff)
+                    if int(limit) < int(self._limit):
+                        self._decreases += 1
+                    self._limit = limit
+            elif saturated and self._limit < self._max_limit:
+                limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+                if int(limit) > int(self._limit):
+                    self._increases += 1
+                self._limit = limit
+            self._cond.notify_all()
@@ -0,0 +1,234 @@
+"""A checkpointed, resumable, multi-process crawler for retrieving very large lists of IMDB ids or titles"""
+
+import json
+import logging
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from omdb.exceptions import OMDBLimitReached, OMDBNoResults, OMDBTooManyResults, error_of
+from omdb.models import Result
+from omdb.omdb import OMDB
+
+logger = logging.getLogger(__name__)
+
+# errors that retrying will not fix; they are recorded as complete
+PERMANENT_ERRORS = (OMDBNoResults, OMDBTooManyResults)
+
+
+def shard_of(key: str, num_shards: int) -> int:
+    """The shard of the key; stable across processes and python versions
+
+    Args:
+        key (str): The IMDB id or title
+        num_shards (int): The number of shards
+    Returns:
+        int: The shard, from 0 to `num_shards - 1`"""
+    return zlib.crc32(key.encode("utf-8")) % num_shards
+
+
+def read_checkpoint(path: str) -> Set[str]:
+    """Read the keys completed in a shard output file; a partially written last line is truncated
+
+    Args:
+        path (str): The path of the shard output file
+    Returns:
+        set: The completed keys"""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r+b") as fobj:
+        valid = 0  # the offset after the last complete line
+        for line in fobj:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(line)["key"])
+            except (ValueError, KeyError, TypeError):
+                break
+            valid += len(line)
+        if valid != os.fstat(fobj.fileno()).st_size:
+            logger.warning("truncating the partially written checkpoint %s at %d bytes", path, valid)
+            fobj.truncate(valid)
+    return done
+
+
+class Crawler:
+    """Retrieve every IMDB id or title in a file, sharded across processes, recording each result durably \
+    so an interrupted or rate limited crawl resumes where it stopped
+
+    Args:
+        keys_path (str): The file of IMDB ids or titles, one per line
+        output_dir (str): The directory of the shard output files; each is also the checkpoint of its shard
+        shards (int): The number of shards; one process per shard is used by `run`
+        client_factory (callable): Called, in each process, with `client_kwargs` to build the `OMDB` client
+        client_kwargs (dict): The arguments of `client_factory`; e.g., `api_key` and `max_workers`
+        request_kwargs (dict): the kwargs to add additional parameters to the API requests
+        sync_every (int): The number of results between flushing the shard output to disk using `fsync`
+    Note:
+        Each line of a shard output file is `{"key": ..., "result": ...}` or, for results that do not exist, \
+        `{"key": ..., "error": ...}`; transient errors are not recorded so are retried when resumed
+    Note:
+        Error results of clients not using `strict` are handled as the matching exception; e.g., \
+        `Request limit reached!` stops every shard and `Error getting data.` is retried when resumed
+    Note:
+        The number of shards must not change between runs of the same output directory
+    Note:
+        When the OMDB API reports the request limit is reached, every shard stops; `run` again once the \
+        limit resets. Rate limits of `client_factory` apply per process"""
+
+    __slots__ = [
+        "_keys_path",
+        "_output_dir",
+        "_shards",
+        "_client_factory",
+        "_client_kwargs",
+        "_request_kwargs",
+        "_sync_every",
+    ]
+
+    def __init__(
+        self,
+        keys_path: str,
+        output_dir: str,
+        shards: int = 4,
+        client_factory: Callable[..., OMDB] = OMDB,
+        client_kwargs: Optional[Dict[str, Any]] = None,
+        request_kwargs: Optional[Dict[str, Any]] = None,
+        sync_every: int = 100,
+    ):
+        """init"""
+        if int(shards) < 1:
+            raise ValueError(f"Crawler shards must be at least 1! {shards} provided")
+        self._keys_path = keys_path
+        self._output_dir = output_dir
+        self._shards = int(shards)
+        self._client_factory = client_factory
+        self._client_kwargs = dict(client_kwargs or {})
+        self._request_kwargs = dict(request_kwargs or {})
+        self._sync_every = max(1, int(sync_every))
+        os.makedirs(output_dir, exist_ok=True)
+        self._check_shards()
+
+    @property
+    def shards(self) -> int:
+        """int: The number of shards"""
+        return self._shards
+
+    def shard_path(self, shard: int) -> str:
+        """The path of the output file of the shard
+
+        Args:
+            shard (int): The shard
+        Returns:
+            str: The path"""
+        return os.path.join(self._output_dir, f"shard-{shard:04d}-of-{self._shards:04d}.jsonl")
+
+    def iter_keys(self, shard: Optional[int] = None) -> Iterator[str]:
+        """Lazily read the keys; blank lines are skipped
+
+        Args:
+            shard (int): Only yield the keys of the shard; `None` for all keys
+        Yields:
+            str: The next key"""
+        with open(self._keys_path, encoding="utf-8") as fobj:
+            for line in fobj:
+                key = line.strip()
+                if key and (shard is None or shard_of(key, self._shards) == shard):
+                    yield key
+
+    def iter_results(self) -> Iterator[Dict]:
+        """Read the records, `{"key": ..., "result": ...}` or `{"key": ..., "error": ...}`, of every shard
+
+        Yields:
+            dict: The next record"""
+        for shard in range(self._shards):
+            path = self.shard_path(shard)
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as fobj:
+                for line in fobj:
+                    if line.endswith("\n"):
+                        yield json.loads(line)
+
+    def run(self, processes: Optional[int] = None) -> List[Dict]:
+        """Crawl every shard, each in its own process
+
+        Args:
+            processes (int): The maximum number of processes; defaults to the number of shards
+        Returns:
+            list: The statistics of each shard; see `run_shard`"""
+        processes = min(processes or self._shards, self._shards)
+        with multiprocessing.Manager() as manager:
+            stop = manager.Event()
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(self.run_shard, shard, stop) for shard in range(self._shards)]
+                return [future.result() for future in futures]
+
+    def run_shard(self, shard: int, stop: Optional[Any] = None) -> Dict:
+        """Crawl the keys of a shard not already completed, in the current process
+
+        Args:
+            shard (int): The shard to crawl
+            stop (Event): Set to stop every shard; set when the OMDB API request limit is reached
+        Returns:
+            dict: The `shard`, the number of keys `skipped` as already completed, `written` results, \
+            `errors` that are recorded, `failed` transient errors, and `True` if `paused` by the request limit"""
+        path = self.shard_path(shard)
+        done = read_checkpoint(path)
+        stats = {"shard": shard, "skipped": 0, "written": 0, "errors": 0, "failed": 0, "paused": False}
+
+        def pending() -> Iterator[str]:
+            for key in self.iter_keys(shard):
+                if key in done:
+                    stats["skipped"] += 1
+                elif stop is not None and stop.is_set():
+                    stats["paused"] = True
+                    return
+                else:
+                    yield key
+
+        omdb = self._client_factory(**self._client_kwargs)
+        try:
+            with open(path, "a", encoding="utf-8") as fobj:
+                since_sync = 0
+                for key, res in omdb.iter_many(pending(), deduplicate=True, **self._request_kwargs):
+                    if isinstance(res, Result):
+                        res = res.to_dict()
+                    if isinstance(res, dict):  # the error results of a client not using `strict`
+                        res = error_of(res, {}, getattr(omdb, "api_key", "")) or res
+                    if isinstance(res, OMDBLimitReached):
+                        stats["paused"] = True
+                        if stop is not None:
+                            stop.set()
+                        break
+                    if isinstance(res, PERMANENT_ERRORS):
+                        record = {"key": key, "error": str(res)}
+                        stats["errors"] += 1
+                    elif isinstance(res, Exception):
+                        logger.warning("failed to retrieve %s: %r", key, res)
+                        stats["failed"] += 1
+                        continue
+                    else:
+                        record = {"key": key, "result": res}
+                        stats["written"] += 1
+                    done.add(key)  # a duplicate key is not retrieved again
+                    fobj.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    fobj.flush()
+                    since_sync += 1
+                    if since_sync >= self._sync_every:
+                        os.fsync(fobj.fileno())
+                        since_sync = 0
+                os.fsync(fobj.fileno())
+        finally:
+            omdb.close()
+        return stats
+
+    def _check_shards(self):
+        """ensure the output directory was not crawled using a different number of shards"""
+        suffix = f"-of-{self._shards:04d}.jsonl"
+        for name in os.listdir(self._output_dir):
+            if name.startswith("shard-") and name.endswith(".jsonl") and not name.endswith(suffix):
+                raise ValueError(f"{self._output_dir} was crawled using a different number of shards: {name}")
@@ -0,0 +1,82 @@
+"""Decoders for the raw OMDB API response bodies"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+from omdb.utilities import format_pairs
+
+
+class JSONDecoder:
+    """Decode the response body using the standard library `json` module
+
+    Args:
+        format_keys (bool): `True` to format the keys while decoding, using an `object_pairs_hook`, rather \
+        than in a second pass over the result
+    Note:
+        Formatting while decoding avoids the second pass but, as the same work is done in Python for each \
+        object, it is not faster on CPython; see `python -m benchmarks.bench_format`
+    Note:
+        Sub-classes implement `decode`, raising a `ValueError` for an invalid body, and set `formats_keys` \
+        if the decoded result is already formatted; the client raises invalid bodies as \
+        `requests.exceptions.JSONDecodeError`"""
+
+    __slots__ = ["_format_keys"]
+
+    def __init__(self, format_keys: bool = False):
+        """init"""
+        self._format_keys = bool(format_keys)
+
+    @property
+    def formats_keys(self) -> bool:
+        """bool: Whether the decoded result is already formatted"""
+        return self._format_keys
+
+    def decode(self, content: bytes) -> Any:
+        """Decode the raw response body
+
+        Args:
+            content (bytes): The response body
+        Returns:
+            The decoded JSON"""
+        if self._format_keys:
+            return json.loads(content, object_pairs_hook=format_pairs)
+        return json.loads(content)
+
+
+class OrjsonDecoder(JSONDecoder):
+    """Decode the response body using `orjson`; the keys are formatted after decoding
+
+    Note:
+        Requires the `orjson` library; install using `pip install pyomdbapi[fast]`"""
+
+    __slots__ = []
+
+    def __init__(self):
+        """init"""
+        if orjson is None:
+            raise ImportError("OrjsonDecoder requires orjson; install using `pip install pyomdbapi[fast]`")
+        super().__init__(format_keys=False)
+
+    def decode(self, content: bytes) -> Any:
+        """Decode the raw response body
+
+        Args:
+            content (bytes): The response body
+        Returns:
+            The decoded JSON"""
+        return orjson.loads(content)
+
+
+def default_decoder() -> JSONDecoder:
+    """The fastest decoder available: `OrjsonDecoder` if `orjson` is installed, otherwise `JSONDecoder`
+
+    Returns:
+        JSONDecoder: The decoder"""
+    if orjson is not None:
+        return OrjsonDecoder()
+    return JSONDecoder()
@@ -1,6 +1,6 @@
 """Exceptions for the pyomdbapi project"""
 
-from typing import Dict
+from typing import Dict, Optional
 
 
 class OMDBException(Exception):
@@ -104,3 +104,53 @@ class OMDBLimitReached(OMDBException):
     def api_key(self) -> str:
         """str: The OMDB API API key used"""
         return self._api_key
+
+
+class OMDBRateLimited(OMDBException):
+    """The client side rate limit would be exceeded by the request
+
+    Args:
+        retry_after (float): The number of seconds until the request would be permitted
+    """
+
+    def __init__(self, retry_after: float):
+        """init"""
+        self._retry_after = retry_after
+        super().__init__(f"Client rate limit reached; retry after {self.retry_after:.3f} seconds")
+
+    @property
+    def retry_after(self) -> float:
+        """float: The number of seconds until the request would be permitted"""
+        return self._retry_after
+
+
+def error_of(res: Dict, params: Dict, api_key: str) -> Optional[OMDBException]:
+    """Build the exception matching the error of a result, as raised when using `strict`
+
+    Args:
+        res (dict): The formatted result
+        params (dict): The parameters of the API request
+        api_key (str): The API Key used for the request
+    Returns:
+        OMDBException: The exception; `None` if the result is not an error"""
+    # NOTE: I dislike having to use string comparisons to check for specific error conditions
+    if res.get("response") != "False":
+        return None
+    err = res.get("error", "").lower()
+    if err == "too many results.":
+        return OMDBTooManyResults(res["error"], params)
+    if err in {
+        "movie not found!",
+        "series or season not found!",
+        "series not found!",
+        "series or episode not found!",
+        "incorrect imdb id.",
+    }:
+        return OMDBNoResults(res["error"], params)
+    if err == "request limit reached!":
+        return OMDBLimitReached(api_key)
+    if err == "invalid api key!":
+        return OMDBInvalidAPIKey(api_key)
+    # known reasons:
+    # Error getting data.
+    return OMDBException(f"An unknown exception was returned: {err}")
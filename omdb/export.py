@@ -0,0 +1,273 @@
+"""Stream OMDB API results to JSON Lines or CSV files with bounded memory"""
+
+import csv
+import json
+from typing import IO, Any, Dict, Iterable, Optional, Sequence, Union
+
+from omdb.exceptions import error_of
+from omdb.models import Result
+from omdb.utilities import snake_case_key
+
+# the ratings sources returned by the OMDB API and their CSV column
+RATING_COLUMNS = {
+    "Internet Movie Database": "rating_imdb",
+    "Rotten Tomatoes": "rating_rotten_tomatoes",
+    "Metacritic": "rating_metacritic",
+}
+
+CSV_COLUMNS = (
+    "key",
+    "imdb_id",
+    "title",
+    "type",
+    "year",
+    "rated",
+    "released",
+    "runtime",
+    "genre",
+    "director",
+    "writer",
+    "actors",
+    "plot",
+    "language",
+    "country",
+    "awards",
+    "poster",
+    "metascore",
+    "imdb_rating",
+    "imdb_votes",
+    "dvd",
+    "box_office",
+    "production",
+    "website",
+    "total_seasons",
+    "series_id",
+    "season",
+    "episode",
+    "rating_imdb",
+    "rating_rotten_tomatoes",
+    "rating_metacritic",
+    "error",
+)
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+def flatten_result(res: Dict) -> Dict:
+    """Flatten a result into a single level dictionary; each rating becomes a `rating_<source>` column
+
+    Args:
+        res (dict): The formatted result
+    Returns:
+        dict: The flattened result"""
+    out = {k: v for k, v in res.items() if k != "ratings"}
+    for rating in res.get("ratings") or ():
+        source = rating.get("source", "")
+        column = RATING_COLUMNS.get(source)
+        if column is None:
+            column = "rating_" + snake_case_key(source.replace(" ", ""))
+        out[column] = rating.get("value")
+    return out
+
+
+class BaseWriter:
+    """The base results writer; writes to a path, using a buffer of `buffer_size`, or to an open text file
+
+    Args:
+        output (str or file): The path, or the text file object, to write to
+        buffer_size (int): The size of the write buffer when opening a path"""
+
+    __slots__ = ["_fobj", "_owned", "_written", "_errors"]
+
+    def __init__(self, output: Union[str, IO[str]], buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """init"""
+        if isinstance(output, str):
+            self._fobj: IO[str] = open(output, "w", encoding="utf-8", newline="", buffering=buffer_size)  # noqa: SIM115
+            self._owned = True
+        else:
+            self._fobj = output
+            self._owned = False
+        self._written = 0
+        self._errors = 0
+
+    @property
+    def written(self) -> int:
+        """int: The number of results written"""
+        return self._written
+
+    @property
+    def errors(self) -> int:
+        """int: The number of errors written"""
+        return self._errors
+
+    def write(self, result: Union[Dict, Result, Exception], key: Optional[str] = None):
+        """Write a result, or the exception raised while retrieving it
+
+        Args:
+            result (dict): The result; exceptions, and the error results of clients not using `strict`, are \
+            written as the key and the error message
+            key (str): The IMDB id or title used to retrieve the result"""
+        if isinstance(result, Result):
+            result = result.to_dict()
+        if isinstance(result, dict):
+            result = error_of(result, {}, "") or result
+        if isinstance(result, Exception):
+            self._errors += 1
+            self._write_error(key, result)
+            return
+        self._written += 1
+        self._write_result(key, result)
+
+    def close(self):
+        """Flush the output; closing it if opened by the writer"""
+        if self._owned:
+            self._fobj.close()
+        else:
+            self._fobj.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write_result(self, key: Optional[str], result: Dict):
+        raise NotImplementedError
+
+    def _write_error(self, key: Optional[str], exc: Exception):
+        raise NotImplementedError
+
+
+class JSONLinesWriter(BaseWriter):
+    """Write each result as a line of JSON
+
+    Args:
+        output (str or file): The path, or the text file object, to write to
+        buffer_size (int): The size of the write buffer when opening a path
+    Note:
+        Errors are written as `{"key": ..., "error": ...}`"""
+
+    __slots__ = []
+
+    def __init__(self, output: Union[str, IO[str]], buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """init"""
+        super().__init__(output, buffer_size)
+
+    def _write_result(self, key: Optional[str], result: Dict):
+        self._fobj.write(json.dumps(result, ensure_ascii=False, default=str))
+        self._fobj.write("\n")
+
+    def _write_error(self, key: Optional[str], exc: Exception):
+        self._fobj.write(json.dumps({"key": key, "error": str(exc)}, ensure_ascii=False))
+        self._fobj.write("\n")
+
+
+class CSVWriter(BaseWriter):
+    """Write each result as a CSV row with the ratings flattened into columns
+
+    Args:
+        output (str or file): The path, or the text file object, to write to
+        columns (list): The columns to write; other fields are dropped
+        buffer_size (int): The size of the write buffer when opening a path
+    Note:
+        The columns are fixed so every row lines up regardless of the fields each result has; the header \
+        row is written first"""
+
+    __slots__ = ["_csv", "_columns"]
+
+    def __init__(
+        self,
+        output: Union[str, IO[str]],
+        columns: Sequence[str] = CSV_COLUMNS,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        """init"""
+        super().__init__(output, buffer_size)
+        self._columns = tuple(columns)
+        self._csv = csv.DictWriter(self._fobj, fieldnames=self._columns, extrasaction="ignore")
+        self._csv.writeheader()
+
+    @property
+    def columns(self) -> Sequence[str]:
+        """tuple: The columns written"""
+        return self._columns
+
+    def _write_result(self, key: Optional[str], result: Dict):
+        row = flatten_result(result)
+        if key is not None:
+            row["key"] = key
+        self._csv.writerow(row)
+
+    def _write_error(self, key: Optional[str], exc: Exception):
+        self._csv.writerow({"key": key, "error": str(exc)})
+
+
+WRITERS = {"jsonl": JSONLinesWriter, "csv": CSVWriter}
+
+
+def _writer(output: Union[str, IO[str]], fmt: str, **kwargs) -> BaseWriter:
+    """build the writer for the format"""
+    try:
+        cls = WRITERS[fmt]
+    except KeyError as exc:
+        raise ValueError(f"Unknown export format {fmt}; use one of {', '.join(WRITERS)}") from exc
+    return cls(output, **kwargs)
+
+
+def export_many(
+    omdb,
+    keys: Iterable[str],
+    output: Union[str, IO[str]],
+    fmt: str = "jsonl",
+    ordered: bool = False,
+    deduplicate: bool = True,
+    writer_kwargs: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> Dict[str, int]:
+    """Retrieve many movies, series, or episodes concurrently, writing each result as it arrives
+
+    Args:
+        omdb (OMDB): The OMDB API wrapper to use
+        keys (iterable): The IMDB ids or titles to retrieve; may be an unbounded iterator
+        output (str or file): The path, or the text file object, to write to
+        fmt (str): The output format; `jsonl` or `csv`
+        ordered (bool): `True` to write the results in the order of `keys`; otherwise in completion order
+        deduplicate (bool): `True` to only retrieve each key once; the keys seen are retained in memory
+        writer_kwargs (dict): Additional arguments for the writer; e.g., `columns` or `buffer_size`
+        kwargs (dict): the kwargs to add additional parameters to the API requests
+    Returns:
+        dict: The number of results `written` and `errors`
+    Note:
+        Only `max_workers` lookups are in flight at a time and each result is written once retrieved so \
+        memory does not grow with the number of keys"""
+    with _writer(output, fmt, **(writer_kwargs or {})) as writer:
+        for key, res in omdb.iter_many(keys, ordered=ordered, deduplicate=deduplicate, **kwargs):
+            writer.write(res, key)
+    return {"written": writer.written, "errors": writer.errors}
+
+
+def export_search(
+    omdb,
+    title: str,
+    output: Union[str, IO[str]],
+    fmt: str = "jsonl",
+    max_results: Optional[int] = None,
+    writer_kwargs: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> Dict[str, int]:
+    """Search based on title, writing each result as its page arrives
+
+    Args:
+        omdb (OMDB): The OMDB API wrapper to use
+        title (str): The query string to lookup
+        output (str or file): The path, or the text file object, to write to
+        fmt (str): The output format; `jsonl` or `csv`
+        max_results (int): The maximum number of results to write; `None` for all results
+        writer_kwargs (dict): Additional arguments for the writer; e.g., `columns` or `buffer_size`
+        kwargs (dict): the kwargs to add additional parameters to the API request
+    Returns:
+        dict: The number of results `written` and `errors`"""
+    with _writer(output, fmt, **(writer_kwargs or {})) as writer:
+        for res in omdb.iter_search(title, max_results=max_results, **kwargs):
+            writer.write(res)
+    return {"written": writer.written, "errors": writer.errors}
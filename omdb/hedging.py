@@ -0,0 +1,231 @@
+"""Hedged requests: send a second, duplicate, request when the first is slower than usual"""
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import perf_counter
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# the maximum number of threads sending the original requests; idle threads are reused, so each keeps its \
+# thread-local session, and connections, rather than being capped like the duplicates
+PRIMARY_THREADS = 1024
+
+
+class HedgePolicy:
+    """Send one duplicate request when no response arrives within the adaptive delay, the `quantile` of the \
+    recent response times, and use whichever response arrives first; the slower is ignored
+
+    Args:
+        quantile (float): The quantile of the recent response times to wait before hedging; e.g., 0.95
+        min_delay (float): The minimum number of seconds to wait before hedging
+        max_delay (float): The maximum number of seconds to wait before hedging
+        max_ratio (float): The maximum fraction of requests that may be hedged; caps the extra requests
+        window (int): The number of recent response times used to estimate the delay
+        min_samples (int): The number of response times observed before hedging starts
+        max_threads (int): The maximum number of threads sending duplicate requests
+    Note:
+        Until `min_samples` response times are observed, requests are sent on the calling thread; afterwards \
+        each is sent on a reused background thread so the calling thread can wait for either response
+    Note:
+        Each hedge also consumes from the rate limiter budget, if any; the request is not hedged when the \
+        budget does not permit a request right now
+    Note:
+        Use `hedged`, `wins`, and `win_ratio` to see how often hedging helps"""
+
+    __slots__ = [
+        "_quantile",
+        "_min_delay",
+        "_max_delay",
+        "_max_ratio",
+        "_min_samples",
+        "_max_threads",
+        "_latencies",
+        "_observed",
+        "_delay",
+        "_pool",
+        "_primary_pool",
+        "_lock",
+        "_requests",
+        "_hedged",
+        "_wins",
+        "_capped",
+    ]
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        max_ratio: float = 0.05,
+        window: int = 256,
+        min_samples: int = 20,
+        max_threads: int = 32,
+    ):
+        """init"""
+        if not 0.0 < quantile < 1.0:
+            raise ValueError(f"HedgePolicy quantile must be between 0 and 1! {quantile} provided")
+        if not 0.0 < max_ratio <= 1.0:
+            raise ValueError(f"HedgePolicy max_ratio must be between 0 and 1! {max_ratio} provided")
+        if min_delay > max_delay:
+            raise ValueError(f"HedgePolicy min_delay must not exceed max_delay! {min_delay} > {max_delay}")
+        self._quantile = float(quantile)
+        self._min_delay = float(min_delay)
+        self._max_delay = float(max_delay)
+        self._max_ratio = float(max_ratio)
+        self._min_samples = max(1, int(min_samples))
+        self._max_threads = max(2, int(max_threads))
+        self._latencies: Deque[float] = deque(maxlen=max(self._min_samples, int(window)))
+        self._observed: int = 0
+        self._delay: Optional[float] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._primary_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._requests: int = 0
+        self._hedged: int = 0
+        self._wins: int = 0
+        self._capped: int = 0
+
+    @property
+    def delay(self) -> Optional[float]:
+        """float: The number of seconds to wait before hedging; `None` until `min_samples` are observed"""
+        return self._delay
+
+    @property
+    def requests(self) -> int:
+        """int: The number of requests sent using the policy, not including hedges"""
+        return self._requests
+
+    @property
+    def hedged(self) -> int:
+        """int: The number of duplicate requests sent"""
+        return self._hedged
+
+    @property
+    def wins(self) -> int:
+        """int: The number of hedges that responded before the original request"""
+        return self._wins
+
+    @property
+    def capped(self) -> int:
+        """int: The number of slow requests not hedged due to `max_ratio` or the rate limiter budget"""
+        return self._capped
+
+    @property
+    def win_ratio(self) -> float:
+        """float: The fraction of the hedges that responded first"""
+        return self._wins / self._hedged if self._hedged else 0.0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """The counters, the current delay, and the win ratio
+
+        Returns:
+            dict: The `requests`, `hedged`, `wins`, and `capped` counters, the `delay`, and the `win_ratio`"""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "wins": self._wins,
+                "capped": self._capped,
+                "delay": self._delay,
+                "win_ratio": self._wins / self._hedged if self._hedged else 0.0,
+            }
+
+    def observe(self, latency: float):
+        """Add a response time used to estimate the delay
+
+        Args:
+            latency (float): The number of seconds the request took"""
+        with self._lock:
+            self._latencies.append(latency)
+            self._observed += 1
+            num = len(self._latencies)
+            if num < self._min_samples or (self._delay is not None and self._observed % 16):
+                return  # the estimate is refreshed periodically; sorting on every response is not needed
+            estimate = sorted(self._latencies)[min(num - 1, int(self._quantile * num))]
+            self._delay = min(self._max_delay, max(self._min_delay, estimate))
+
+    def run(self, send: Callable[[], T], admit: Optional[Callable[[], bool]] = None) -> T:
+        """Send the request, hedging it if no response arrives within the `delay`
+
+        Args:
+            send (callable): Sends the request and returns the response; called a second time to hedge
+            admit (callable): Returns `True` if the rate limiter budget permits the hedge now
+        Returns:
+            The first successful response
+        Raises:
+            Exception: The exception of the original request when every request fails"""
+        with self._lock:
+            self._requests += 1
+            delay = self._delay
+        if delay is None:  # not hedged; nothing to wait on
+            return self._timed(send)()
+
+        primary = self._start(send)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self._admit(admit):
+            return primary.result()
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_threads, thread_name_prefix="omdb-hedge")
+            pool = self._pool
+        backup = pool.submit(self._timed(send))
+        done, _ = wait([primary, backup], return_when=FIRST_COMPLETED)
+        first = primary if primary in done else backup
+        if first.exception() is not None:  # use the other request
+            first = backup if first is primary else primary
+            wait([first])
+        if first.exception() is not None:
+            return primary.result()
+        if first is backup:
+            with self._lock:
+                self._wins += 1
+        return first.result()
+
+    def close(self):
+        """Wait for the requests in progress, including ignored hedges, to complete; the policy may still be \
+        used afterwards"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            primary_pool, self._primary_pool = self._primary_pool, None
+        if primary_pool is not None:
+            primary_pool.shutdown(wait=True)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _admit(self, admit: Optional[Callable[[], bool]]) -> bool:
+        """whether a hedge is permitted by `max_ratio` and the rate limiter budget; consumes if so"""
+        with self._lock:
+            allowed = self._hedged < max(1.0, self._max_ratio * self._requests)
+        if allowed and (admit is None or admit()):
+            with self._lock:
+                self._hedged += 1
+            return True
+        with self._lock:
+            self._capped += 1
+        return False
+
+    def _timed(self, send: Callable[[], T]) -> Callable[[], T]:
+        """wrap `send` to observe the response time of successful requests, from when the request is sent"""
+
+        def timed() -> T:
+            start = perf_counter()
+            res = send()
+            self.observe(perf_counter() - start)
+            return res
+
+        return timed
+
+    def _start(self, send: Callable[[], T]) -> "Future[T]":
+        """send the original request in the background; see `PRIMARY_THREADS`"""
+        with self._lock:
+            if self._primary_pool is None:
+                self._primary_pool = ThreadPoolExecutor(max_workers=PRIMARY_THREADS, thread_name_prefix="omdb-send")
+            pool = self._primary_pool
+        return pool.submit(self._timed(send))
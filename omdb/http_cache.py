@@ -0,0 +1,137 @@
+"""HTTP caching header support: freshness lifetimes, validators, and conditional requests"""
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+def _parse_http_date(val: Optional[str]) -> Optional[float]:
+    """parse an HTTP date to a unix timestamp; `None` if missing or invalid"""
+    if not val:
+        return None
+    try:
+        return parsedate_to_datetime(val).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def cache_control(headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    """Parse the `Cache-Control` header directives
+
+    Args:
+        headers (dict): The response headers; case-insensitive, as returned by `requests`
+    Returns:
+        dict: The lowercase directives and their values; `None` for directives without a value"""
+    res: Dict[str, Optional[str]] = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, val = directive.strip().partition("=")
+        if name:
+            res[name.lower()] = val.strip('"') if val else None
+    return res
+
+
+def is_cacheable(headers: Mapping[str, str]) -> bool:
+    """Determine if the response may be stored
+
+    Args:
+        headers (dict): The response headers
+    Returns:
+        bool: `False` if the response is marked `no-store` or `private`"""
+    directives = cache_control(headers)
+    return "no-store" not in directives and "private" not in directives
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """The number of seconds the response is fresh for, from `Cache-Control` or `Expires`
+
+    Args:
+        headers (dict): The response headers
+        now (float): The current unix timestamp; defaults to now
+    Returns:
+        float: The number of seconds the response is fresh; 0 if it must be revalidated before use, `None` if \
+        the headers do not say"""
+    directives = cache_control(headers)
+    if "no-cache" in directives:
+        return 0.0
+    age = _to_float(headers.get("Age")) or 0.0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            max_age = _to_float(directives[name])
+            if max_age is not None:
+                return max(0.0, max_age - age)
+
+    expires = headers.get("Expires")
+    if expires is not None:
+        expires_at = _parse_http_date(expires)
+        if expires_at is None:  # an invalid date, such as 0, means already expired
+            return 0.0
+        date = _parse_http_date(headers.get("Date"))
+        base = date if date is not None else (time.time() if now is None else now)
+        return max(0.0, expires_at - base)
+    return None
+
+
+def response_validators(headers: Mapping[str, str]) -> Optional[Dict[str, str]]:
+    """The validators, `etag` and `last_modified`, of the response used to make conditional requests
+
+    Args:
+        headers (dict): The response headers
+    Returns:
+        dict: The validators; `None` if the response has none"""
+    res = {}
+    if headers.get("ETag"):
+        res["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        res["last_modified"] = headers["Last-Modified"]
+    return res or None
+
+
+def _to_float(val: Optional[str]) -> Optional[float]:
+    """convert the header value to a float; `None` if not a number"""
+    try:
+        return float(val)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+
+class Revalidation:
+    """The state of a request that may be answered with `304 Not Modified`
+
+    Args:
+        validators (dict): The validators, `etag` and `last_modified`, of the cached result; `None` if there \
+        is no cached result"""
+
+    __slots__ = ["validators", "status", "headers"]
+
+    def __init__(self, validators: Optional[Dict[str, str]] = None):
+        """init"""
+        self.validators: Optional[Dict[str, str]] = validators
+        self.status: Optional[int] = None  # the HTTP status code of the response
+        self.headers: Mapping[str, str] = {}  # the headers of the response
+
+    @property
+    def not_modified(self) -> bool:
+        """bool: Whether the cached result is still valid"""
+        return self.status == 304 and self.validators is not None
+
+    def request_headers(self) -> Dict[str, str]:
+        """The conditional request headers
+
+        Returns:
+            dict: The `If-None-Match` and `If-Modified-Since` headers"""
+        res = {}
+        if self.validators:
+            if "etag" in self.validators:
+                res["If-None-Match"] = self.validators["etag"]
+            if "last_modified" in self.validators:
+                res["If-Modified-Since"] = self.validators["last_modified"]
+        return res
+
+    def record(self, status: int, headers: Mapping[str, str]):
+        """Record the response
+
+        Args:
+            status (int): The HTTP status code
+            headers (dict): The response headers"""
+        self.status = status
+        self.headers = headers
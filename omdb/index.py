@@ -0,0 +1,285 @@
+"""A local, in-memory, full-text index of the titles retrieved from the OMDB API for offline search"""
+
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from omdb.models import Result
+from omdb.utilities import clean_up_strings, normalize_title, to_int
+
+# the fields of a result stored in the index; the same fields as a search result
+INDEX_FIELDS = ("imdb_id", "poster", "title", "type", "year")
+
+YEAR_RE = re.compile(r"\d{4}")
+
+
+def trigrams(val: str) -> Set[str]:
+    """The three character substrings of the normalized title, padded so short words and the start and end \
+    of each word are included
+
+    Args:
+        val (str): The normalized title
+    Returns:
+        set: The trigrams"""
+    val = f"  {val} "
+    return {val[i : i + 3] for i in range(len(val) - 2)}
+
+
+def year_range(val: str) -> Optional[Tuple[int, float]]:
+    """Parse the year of a result, e.g., `1995`, `2011-2019`, or `2005-` for a running series
+
+    Args:
+        val (str): The year of the result
+    Returns:
+        tuple: The first and last year; the last is infinite if still running; `None` if there is no year"""
+    val = clean_up_strings(val or "")
+    years = YEAR_RE.findall(val)
+    if not years:
+        return None
+    start = int(years[0])
+    if len(years) > 1:
+        return start, int(years[1])
+    return start, float("inf") if val.rstrip().endswith("-") else start
+
+
+class TitleIndex:
+    """An in-memory inverted index of titles, keyed by IMDB id, answering exact title, word prefix, and fuzzy \
+    (trigram similarity) queries without requesting the OMDB API
+
+    Args:
+        min_similarity (float): The minimum trigram (Jaccard) similarity, from 0 to 1, of fuzzy matches
+    Note:
+        When passed to `OMDB` as the `index`, every `search` and `get` result is added automatically; \
+        see `OMDB.search_local`
+    Note:
+        Only the `imdb_id`, `poster`, `title`, `type`, and `year` of each result are stored; the same fields \
+        as a search result"""
+
+    __slots__ = ["_docs", "_words", "_sorted_words", "_trigrams", "_min_similarity", "_lock"]
+
+    def __init__(self, min_similarity: float = 0.3):
+        """init"""
+        if not 0.0 < min_similarity <= 1.0:
+            raise ValueError(f"TitleIndex min_similarity must be between 0 and 1! {min_similarity} provided")
+        self._min_similarity = float(min_similarity)
+        self._docs: Dict[str, Tuple[str, Dict, int]] = {}  # imdb_id: (normalized title, record, trigram count)
+        self._words: Dict[str, Set[str]] = {}  # word: imdb_ids
+        self._sorted_words: List[str] = []  # for prefix matching
+        self._trigrams: Dict[str, Set[str]] = {}  # trigram: imdb_ids
+        self._lock = threading.Lock()
+
+    @property
+    def min_similarity(self) -> float:
+        """float: The minimum trigram similarity of fuzzy matches"""
+        return self._min_similarity
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, imdb_id: str) -> bool:
+        return imdb_id in self._docs
+
+    def add(self, result: Union[Dict, Result]) -> bool:
+        """Add, or update, a title; results without an `imdb_id` or `title` are ignored
+
+        Args:
+            result (dict): A formatted `get` or search result
+        Returns:
+            bool: `True` if the title was added or updated"""
+        if isinstance(result, Result):
+            result = result.to_dict()
+        imdb_id, title = result.get("imdb_id"), result.get("title")
+        if not imdb_id or not title or result.get("response") == "False":
+            return False
+        record = {k: result[k] for k in INDEX_FIELDS if k in result}
+        norm = normalize_title(title)
+        with self._lock:
+            current = self._docs.get(imdb_id)
+            if current is not None and current[0] == norm:
+                current[1].update(record)
+                return True
+            if current is not None:
+                self._unlink(imdb_id, current[0])
+            grams = trigrams(norm)
+            self._docs[imdb_id] = (norm, record, len(grams))
+            for word in set(norm.split()):
+                if word not in self._words:
+                    self._words[word] = set()
+                    self._sorted_words.insert(bisect_left(self._sorted_words, word), word)
+                self._words[word].add(imdb_id)
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(imdb_id)
+        return True
+
+    def add_result(self, res: Union[Dict, Result]) -> int:
+        """Add each title of a `get` or `search` result
+
+        Args:
+            res (dict): The formatted result
+        Returns:
+            int: The number of titles added or updated"""
+        if isinstance(res, dict) and "search" in res:
+            return sum(self.add(itm) for itm in res["search"] or ())
+        return int(self.add(res))
+
+    def remove(self, imdb_id: str) -> bool:
+        """Remove a title
+
+        Args:
+            imdb_id (str): The IMDB id of the title
+        Returns:
+            bool: `True` if the title was indexed"""
+        with self._lock:
+            current = self._docs.pop(imdb_id, None)
+            if current is None:
+                return False
+            self._unlink(imdb_id, current[0])
+        return True
+
+    def clear(self):
+        """Remove all titles"""
+        with self._lock:
+            self._docs.clear()
+            self._words.clear()
+            self._sorted_words.clear()
+            self._trigrams.clear()
+
+    def get(self, imdb_id: str) -> Optional[Dict]:
+        """Retrieve an indexed title by IMDB id
+
+        Args:
+            imdb_id (str): The IMDB id of the title
+        Returns:
+            dict: A copy of the indexed fields; `None` if not indexed"""
+        current = self._docs.get(imdb_id)
+        return None if current is None else dict(current[1])
+
+    def lookup(self, title: str, type: Optional[str] = None, year: Optional[Union[int, str]] = None) -> List[Dict]:
+        """Retrieve the titles matching exactly, ignoring case, accents, and punctuation
+
+        Args:
+            title (str): The title to lookup
+            type (str): Only titles of this type; `movie`, `series`, or `episode`
+            year (int): Only titles released, or running, in this year
+        Returns:
+            list: Copies of the matching titles, in IMDB id order"""
+        norm = normalize_title(title)
+        words = norm.split()
+        if not words:
+            return []
+        with self._lock:
+            ids = self._intersect([self._words.get(word, set()) for word in words])
+            matches = [self._docs[i][1] for i in sorted(ids) if self._docs[i][0] == norm]
+            return [dict(doc) for doc in matches if _matches(doc, type, year)]
+
+    def search(
+        self,
+        query: str,
+        type: Optional[str] = None,
+        year: Optional[Union[int, str]] = None,
+        fuzzy: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Search the titles; every word of the query must match a word of the title, the last as a prefix
+
+        Args:
+            query (str): The query, e.g., the text typed so far
+            type (str): Only titles of this type, ignoring case; `movie`, `series`, or `episode`
+            year (int): Only titles released, or running, in this year; nothing matches a year that is not a \
+            number
+            fuzzy (bool): `True` to also include titles similar to the query, e.g., misspelled, after the \
+            word matches
+            limit (int): The maximum number of titles to return; `None` for all
+        Returns:
+            list: Copies of the matching titles; exact matches first, then by the fewest extra words"""
+        norm = normalize_title(query)
+        words = norm.split()
+        if not words:
+            return []
+        with self._lock:
+            postings = [self._words.get(word, set()) for word in words[:-1]]
+            postings.append(self._prefixed(words[-1]))
+            ids = self._intersect(postings)
+            ranked = sorted(ids, key=lambda i: (self._docs[i][0] != norm, len(self._docs[i][0]), i))
+            if fuzzy:
+                ranked.extend(i for i in self._similar(norm) if i not in ids)
+            res: List[Dict] = []
+            for imdb_id in ranked:
+                doc = self._docs[imdb_id][1]
+                if _matches(doc, type, year):
+                    res.append(dict(doc))
+                    if limit is not None and len(res) >= limit:
+                        break
+            return res
+
+    def _prefixed(self, prefix: str) -> Set[str]:
+        """the ids of the titles with a word starting with the prefix"""
+        res: Set[str] = set()
+        for i in range(bisect_left(self._sorted_words, prefix), len(self._sorted_words)):
+            word = self._sorted_words[i]
+            if not word.startswith(prefix):
+                break
+            res |= self._words[word]
+        return res
+
+    def _similar(self, norm: str) -> List[str]:
+        """the ids of the titles with a trigram similarity of at least `min_similarity`, most similar first"""
+        grams = trigrams(norm)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for imdb_id in self._trigrams.get(gram, ()):
+                shared[imdb_id] = shared.get(imdb_id, 0) + 1
+        scored = []
+        for imdb_id, num in shared.items():
+            score = num / (len(grams) + self._docs[imdb_id][2] - num)
+            if score >= self._min_similarity:
+                scored.append((-score, imdb_id))
+        return [imdb_id for _, imdb_id in sorted(scored)]
+
+    @staticmethod
+    def _intersect(postings: List[Set[str]]) -> Set[str]:
+        """the ids in every posting list; smallest first"""
+        postings = sorted(postings, key=len)
+        res = set(postings[0])
+        for posting in postings[1:]:
+            if not res:
+                break
+            res &= posting
+        return res
+
+    def _unlink(self, imdb_id: str, norm: str):
+        """remove the title from the posting lists"""
+        for word in set(norm.split()):
+            posting = self._words[word]
+            posting.discard(imdb_id)
+            if not posting:
+                del self._words[word]
+                del self._sorted_words[bisect_left(self._sorted_words, word)]
+        for gram in trigrams(norm):
+            posting = self._trigrams[gram]
+            posting.discard(imdb_id)
+            if not posting:
+                del self._trigrams[gram]
+
+
+def _matches(doc: Dict, type: Optional[str], year: Optional[Union[int, str]]) -> bool:
+    """whether the indexed title passes the type, ignoring case, and year filters; a year that is not a number \
+    matches nothing"""
+    if type is not None and str(doc.get("type", "")).lower() != str(type).strip().lower():
+        return False
+    if year is None:
+        return True
+    years = year_range(doc.get("year", ""))
+    return years is not None and years[0] <= to_int(str(year).strip()) <= years[1]
+
+
+def index_results(index: TitleIndex, results: Iterable[Union[Dict, Result]]) -> int:
+    """Add the titles of many `get` or `search` results, e.g., those of a cache or an export
+
+    Args:
+        index (TitleIndex): The index to add to
+        results (iterable): The formatted results
+    Returns:
+        int: The number of titles added or updated"""
+    return sum(index.add_result(res) for res in results)
@@ -0,0 +1,263 @@
+"""Per request instrumentation events and aggregate metrics for the OMDB API wrappers"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def redact_params(params: Dict) -> Dict:
+    """Copy the request parameters with the `apikey` redacted
+
+    Args:
+        params (dict): The parameters of the API request
+    Returns:
+        dict: The parameters safe to log"""
+    return {k: ("***" if k == "apikey" else v) for k, v in params.items()}
+
+
+def request_kind(params: Dict) -> str:
+    """Determine the kind of request from the parameters: search, episode, season, or get
+
+    Args:
+        params (dict): The parameters of the API request
+    Returns:
+        str: The kind of request"""
+    if "s" in params:
+        return "search"
+    if "Episode" in params:
+        return "episode"
+    if "Season" in params:
+        return "season"
+    return "get"
+
+
+class RequestEvent:
+    """The details of a single request made through the OMDB client; passed to each registered hook
+
+    Args:
+        params (dict): The parameters of the API request; the `apikey` is redacted
+    Note:
+        Timings are in seconds; `network`, `decode`, and `format` are `0.0` when the request was not sent \
+        to the OMDB API (e.g., a cache hit or a coalesced request)"""
+
+    __slots__ = [
+        "params",
+        "kind",
+        "status",
+        "bytes",
+        "network",
+        "decode",
+        "format",
+        "total",
+        "cache",
+        "coalesced",
+        "error",
+    ]
+
+    def __init__(self, params: Dict):
+        """init"""
+        self.params: Dict = redact_params(params)
+        self.kind: str = request_kind(params)
+        self.status: Optional[int] = None  # the HTTP status code
+        self.bytes: int = 0  # the size of the response body
+        self.network: float = 0.0
+        self.decode: float = 0.0
+        self.format: float = 0.0
+        self.total: float = 0.0
+        self.cache: Optional[str] = None  # hit, miss, or None if no cache is used
+        self.coalesced: bool = False  # True if the result was shared from an identical in-flight request
+        self.error: Optional[str] = None  # the exception type name, if raised
+
+    def __repr__(self) -> str:
+        vals = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"RequestEvent({vals})"
+
+
+class Histogram:
+    """A thread-safe, fixed bucket, histogram
+
+    Args:
+        buckets (list): The upper bound of each bucket, in increasing order"""
+
+    __slots__ = ["_buckets", "_counts", "_count", "_sum", "_lock"]
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """init"""
+        self._buckets: Tuple[float, ...] = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self._buckets) + 1)  # the last is +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def buckets(self) -> Tuple[float, ...]:
+        """tuple: The upper bound of each bucket"""
+        return self._buckets
+
+    @property
+    def count(self) -> int:
+        """int: The number of observations"""
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """float: The sum of all observations"""
+        return self._sum
+
+    def observe(self, val: float):
+        """Add an observation to the histogram
+
+        Args:
+            val (float): The value to add"""
+        idx = bisect_left(self._buckets, val)
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum += val
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """The cumulative count of observations less than or equal to each bucket bound
+
+        Returns:
+            list: The bucket upper bound (the last is `inf`) and cumulative count"""
+        with self._lock:
+            counts = list(self._counts)
+        res, total = [], 0
+        for bound, num in zip((*self._buckets, float("inf")), counts):
+            total += num
+            res.append((bound, total))
+        return res
+
+    def quantile(self, q: float) -> float:
+        """Estimate the quantile as the upper bound of the bucket that holds it
+
+        Args:
+            q (float): The quantile, between 0 and 1
+        Returns:
+            float: The estimated quantile; 0.0 if there are no observations"""
+        cumulative = self.cumulative()
+        total = cumulative[-1][1]
+        if not total:
+            return 0.0
+        rank = q * total
+        for bound, num in cumulative:
+            if num >= rank:
+                return bound
+        return float("inf")  # pragma: no cover
+
+
+class ClientMetrics:
+    """Aggregate counters and latency histograms of requests; register using `OMDB.add_hook`
+
+    Args:
+        buckets (list): The upper bound, in seconds, of each latency histogram bucket"""
+
+    __slots__ = ["_requests", "_errors", "_cache", "_coalesced", "_bytes", "_latency", "_phases", "_lock"]
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """init"""
+        self._requests: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._cache: Dict[str, int] = {}
+        self._coalesced = 0
+        self._bytes = 0
+        self._latency: Dict[str, Histogram] = {}
+        self._phases = {name: Histogram(buckets) for name in ("network", "decode", "format")}
+        self._lock = threading.Lock()
+        for kind in ("search", "get", "season", "episode"):
+            self._latency[kind] = Histogram(buckets)
+
+    def __call__(self, event: RequestEvent):
+        """record the event"""
+        with self._lock:
+            self._requests[event.kind] = self._requests.get(event.kind, 0) + 1
+            self._bytes += event.bytes
+            if event.error:
+                self._errors[event.error] = self._errors.get(event.error, 0) + 1
+            if event.cache:
+                self._cache[event.cache] = self._cache.get(event.cache, 0) + 1
+            if event.coalesced:
+                self._coalesced += 1
+            hist = self._latency.get(event.kind)
+            if hist is None:
+                hist = self._latency[event.kind] = Histogram(self._phases["network"].buckets)
+        hist.observe(event.total)
+        if event.status is not None:  # the request went to the OMDB API
+            self._phases["network"].observe(event.network)
+            self._phases["decode"].observe(event.decode)
+            self._phases["format"].observe(event.format)
+
+    @property
+    def latency(self) -> Dict[str, Histogram]:
+        """dict: The total latency histogram of each kind of request"""
+        return self._latency
+
+    @property
+    def phases(self) -> Dict[str, Histogram]:
+        """dict: The network, decode, and format latency histograms of requests sent to the OMDB API"""
+        return self._phases
+
+    def snapshot(self) -> Dict:
+        """A point in time copy of the counters and latency quantiles
+
+        Returns:
+            dict: The metrics"""
+        with self._lock:
+            res = {
+                "requests": dict(self._requests),
+                "errors": dict(self._errors),
+                "cache": dict(self._cache),
+                "coalesced": self._coalesced,
+                "bytes": self._bytes,
+            }
+        res["latency"] = {kind: self._summary(hist) for kind, hist in self._latency.items() if hist.count}
+        res["phases"] = {name: self._summary(hist) for name, hist in self._phases.items() if hist.count}
+        return res
+
+    def prometheus(self, prefix: str = "omdb") -> str:
+        """Render the metrics using the Prometheus text exposition format
+
+        Args:
+            prefix (str): The prefix of each metric name
+        Returns:
+            str: The metrics"""
+        snap = self.snapshot()
+        lines = [f"# TYPE {prefix}_requests_total counter"]
+        lines.extend(f'{prefix}_requests_total{{kind="{k}"}} {v}' for k, v in sorted(snap["requests"].items()))
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        lines.extend(f'{prefix}_errors_total{{type="{k}"}} {v}' for k, v in sorted(snap["errors"].items()))
+        lines.append(f"# TYPE {prefix}_cache_total counter")
+        lines.extend(f'{prefix}_cache_total{{result="{k}"}} {v}' for k, v in sorted(snap["cache"].items()))
+        lines.append(f"# TYPE {prefix}_coalesced_total counter")
+        lines.append(f"{prefix}_coalesced_total {snap['coalesced']}")
+        lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+        lines.append(f"{prefix}_response_bytes_total {snap['bytes']}")
+        lines.extend(self._render_histograms(f"{prefix}_request_seconds", "kind", self._latency))
+        lines.extend(self._render_histograms(f"{prefix}_phase_seconds", "phase", self._phases))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _summary(hist: Histogram) -> Dict:
+        """summarize a histogram"""
+        return {
+            "count": hist.count,
+            "sum": hist.sum,
+            "p50": hist.quantile(0.5),
+            "p95": hist.quantile(0.95),
+            "p99": hist.quantile(0.99),
+        }
+
+    @staticmethod
+    def _render_histograms(name: str, label: str, hists: Dict[str, Histogram]) -> List[str]:
+        """render histograms using the Prometheus text exposition format"""
+        lines = [f"# TYPE {name} histogram"]
+        for key, hist in sorted(hists.items()):
+            for bound, num in hist.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{label}="{key}",le="{le}"}} {num}')
+            lines.append(f'{name}_sum{{{label}="{key}"}} {hist.sum}')
+            lines.append(f'{name}_count{{{label}="{key}"}} {hist.count}')
+        return lines
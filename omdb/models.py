@@ -0,0 +1,340 @@
+"""Compact, typed, result models for the OMDB API results"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from omdb.utilities import snake_case_key
+
+NOT_AVAILABLE = "N/A"
+_NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def parse_int(val: str) -> Optional[int]:
+    """Parse the first number in the string as an int: "1,234,567" -> 1234567, "142 min" -> 142, "$1,000" -> 1000
+
+    Args:
+        val (str): The string to parse
+    Returns:
+        int: The parsed value; `None` if there is no number"""
+    match = _NUMBER_RE.search(val)
+    return int(float(match.group().replace(",", ""))) if match else None
+
+
+def parse_float(val: str) -> Optional[float]:
+    """Parse the first number in the string as a float: "8.9" -> 8.9
+
+    Args:
+        val (str): The string to parse
+    Returns:
+        float: The parsed value; `None` if there is no number"""
+    match = _NUMBER_RE.search(val)
+    return float(match.group().replace(",", "")) if match else None
+
+
+def parse_date(val: str) -> Optional[date]:
+    """Parse an OMDB API date: "17 Jul 2009" -> date(2009, 7, 17)
+
+    Args:
+        val (str): The string to parse
+    Returns:
+        date: The parsed date; `None` if not a date"""
+    try:
+        return datetime.strptime(val.strip(), "%d %b %Y").date()
+    except ValueError:
+        return None
+
+
+def parse_score(val: str) -> Optional[float]:
+    """Parse a rating to a score between 0 and 1: "8.9/10" -> 0.89, "94%" -> 0.94, "76/100" -> 0.76
+
+    Args:
+        val (str): The string to parse
+    Returns:
+        float: The score; `None` if not a rating"""
+    try:
+        if val.endswith("%"):
+            return float(val[:-1]) / 100
+        num, _, den = val.partition("/")
+        return float(num) / float(den) if den else float(num)
+    except ValueError:
+        return None
+
+
+class LazyField:
+    """A descriptor that parses the raw string value on first access and caches the result
+
+    Args:
+        parser (callable): The function to parse the raw string value
+    Note:
+        The raw value is stored in the `_<name>` slot and the parsed value in the `_<name>_parsed` slot; \
+        "N/A" and missing values are `None`"""
+
+    __slots__ = ["_parser", "_raw", "_parsed"]
+
+    def __init__(self, parser: Callable[[str], Any]):
+        """init"""
+        self._parser = parser
+        self._raw = ""
+        self._parsed = ""
+
+    def __set_name__(self, owner, name: str):
+        self._raw = f"_{name}"
+        self._parsed = f"_{name}_parsed"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self._parsed)
+        except AttributeError:
+            pass
+        raw = getattr(obj, self._raw, None)
+        val = None if raw is None or raw == NOT_AVAILABLE else self._parser(raw)
+        setattr(obj, self._parsed, val)
+        return val
+
+
+def _slots(keys: Iterable[str], lazy: Iterable[str]) -> Tuple[str, ...]:
+    """the slots for the (snake case) keys; lazily parsed fields use a raw and a parsed slot"""
+    lazy = set(lazy)
+    res: List[str] = []
+    for key in keys:
+        if key in lazy:
+            res.extend((f"_{key}", f"_{key}_parsed"))
+        else:
+            res.append(key)
+    return tuple(res)
+
+
+class Result:
+    """The base of the result models; sub-classes define the OMDB API keys they hold
+
+    Note:
+        Keys not known to the model are kept, and returned by `to_dict`, but are not attributes"""
+
+    __slots__ = ["_extra"]
+
+    KEYS: Tuple[str, ...] = ()  # the OMDB API keys, formatted, in the order returned by `_format_results`
+    LAZY: Tuple[str, ...] = ()  # the keys that are parsed on first access
+
+    def __init__(self, **kwargs):
+        """init"""
+        self._extra: Optional[Dict[str, Any]] = None
+        known = self._known()
+        for key, val in kwargs.items():
+            slot = known.get(key)
+            if slot is None:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = val
+            else:
+                object.__setattr__(self, slot, self._convert(key, val))
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        """Build the model from a formatted result
+
+        Args:
+            data (dict): The formatted result as returned by `OMDB`
+        Returns:
+            Result: The model"""
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        """The formatted result this model was built from
+
+        Returns:
+            dict: The result as would be returned when not using models"""
+        res = {}
+        for key, slot in self._known().items():
+            try:
+                val = getattr(self, slot)
+            except AttributeError:
+                continue
+            res[key] = self._unconvert(key, val)
+        if self._extra:
+            res.update(self._extra)
+        return res
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Result):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        title = getattr(self, "title", None)
+        imdb_id = getattr(self, "imdb_id", None)
+        return f"{type(self).__name__}(title={title!r}, imdb_id={imdb_id!r})"
+
+    @classmethod
+    def _known(cls) -> Dict[str, str]:
+        """map each known key to the slot holding its (raw) value"""
+        known = cls.__dict__.get("_KNOWN")
+        if known is None:
+            lazy = set(cls.LAZY)
+            known = {key: (f"_{key}" if key in lazy else key) for key in cls.KEYS}
+            setattr(cls, "_KNOWN", known)  # noqa: B010
+        return known
+
+    @staticmethod
+    def _convert(key: str, val: Any) -> Any:
+        """convert nested values when building the model"""
+        if key == "ratings" and isinstance(val, list):
+            return [Rating.from_dict(itm) if isinstance(itm, dict) else itm for itm in val]
+        return val
+
+    @staticmethod
+    def _unconvert(key: str, val: Any) -> Any:
+        """convert nested values back when building the dictionary"""
+        if key == "ratings" and isinstance(val, list):
+            return [itm.to_dict() if isinstance(itm, Result) else itm for itm in val]
+        return val
+
+
+def _keys(*camel: str) -> Tuple[str, ...]:
+    """the formatted keys, in the order `_format_results` returns them"""
+    return tuple(snake_case_key(key) for key in sorted(camel))
+
+
+class Rating(Result):
+    """A single rating from a source
+
+    Attributes:
+        source (str): The source of the rating; e.g., Internet Movie Database
+        value (str): The rating as provided; e.g., 8.9/10
+        score (float): The rating as a value between 0 and 1"""
+
+    KEYS = _keys("Source", "Value")
+    __slots__ = (*_slots(KEYS, ()), "_score")
+
+    @property
+    def score(self) -> Optional[float]:
+        """float: The rating as a value between 0 and 1; parsed on first access"""
+        try:
+            return self._score
+        except AttributeError:
+            pass
+        val = getattr(self, "value", None)
+        self._score = None if val is None else parse_score(val)
+        return self._score
+
+    def __repr__(self) -> str:
+        return f"Rating(source={getattr(self, 'source', None)!r}, value={getattr(self, 'value', None)!r})"
+
+
+class SearchItem(Result):
+    """A single search result
+
+    Attributes:
+        title (str): The title
+        year (int): The (first) year; parsed on first access
+        imdb_id (str): The IMDB id
+        type (str): The type of result; movie, series, or episode
+        poster (str): The URL of the poster"""
+
+    KEYS = _keys("Poster", "Title", "Type", "Year", "imdbID")
+    LAZY = ("year",)
+    __slots__ = _slots(KEYS, LAZY)
+
+    year = LazyField(parse_int)
+
+
+_TITLE_KEYS = (
+    "Actors",
+    "Awards",
+    "BoxOffice",
+    "Country",
+    "DVD",
+    "Director",
+    "Genre",
+    "Language",
+    "Metascore",
+    "Plot",
+    "Poster",
+    "Production",
+    "Rated",
+    "Ratings",
+    "Released",
+    "Response",
+    "Runtime",
+    "Title",
+    "Type",
+    "Website",
+    "Writer",
+    "Year",
+    "imdbID",
+    "imdbRating",
+    "imdbVotes",
+)
+_TITLE_LAZY = ("box_office", "dvd", "metascore", "released", "runtime", "year", "imdb_rating", "imdb_votes")
+
+
+class Title(Result):
+    """The fields shared by movies, series, and episodes; numbers and dates are parsed on first access
+
+    Attributes:
+        box_office (int): The box office, in dollars
+        dvd (date): The DVD release date
+        metascore (int): The metascore
+        released (date): The release date
+        runtime (int): The runtime, in minutes
+        year (int): The (first) year
+        imdb_rating (float): The IMDB rating
+        imdb_votes (int): The number of IMDB votes
+        ratings (list): The `Rating` from each source
+    Note:
+        The remaining fields (title, plot, actors, etc.) are strings as returned by the OMDB API; \
+        "N/A" numbers and dates are `None`"""
+
+    __slots__ = ()
+
+    box_office = LazyField(parse_int)
+    dvd = LazyField(parse_date)
+    metascore = LazyField(parse_int)
+    released = LazyField(parse_date)
+    runtime = LazyField(parse_int)
+    year = LazyField(parse_int)
+    imdb_rating = LazyField(parse_float)
+    imdb_votes = LazyField(parse_int)
+
+
+class Movie(Title):
+    """A movie as returned by `OMDB.get_movie`; see `Title` for the parsed fields"""
+
+    KEYS = _keys(*_TITLE_KEYS)
+    LAZY = _TITLE_LAZY
+    __slots__ = _slots(KEYS, LAZY)
+
+
+class Series(Title):
+    """A TV series as returned by `OMDB.get_series`; see `Title` for the parsed fields
+
+    Attributes:
+        total_seasons (int): The number of seasons; parsed on first access
+        seasons (dict): The episodes of each season, keyed by season number, when pulled
+        season_errors (dict): The exception of each season that failed, when partial results are requested"""
+
+    KEYS = (*_keys(*_TITLE_KEYS, "totalSeasons"), "seasons", "season_errors")
+    LAZY = (*_TITLE_LAZY, "total_seasons")
+    __slots__ = _slots(KEYS, LAZY)
+
+    total_seasons = LazyField(parse_int)
+
+
+class Episode(Title):
+    """A TV series episode as returned by `OMDB.get_episode`; see `Title` for the parsed fields
+
+    Attributes:
+        season (int): The season number; parsed on first access
+        episode (int): The episode number; parsed on first access
+        series_id (str): The IMDB id of the series"""
+
+    KEYS = _keys(*_TITLE_KEYS, "Episode", "Season", "seriesID")
+    LAZY = (*_TITLE_LAZY, "season", "episode")
+    __slots__ = _slots(KEYS, LAZY)
+
+    season = LazyField(parse_int)
+    episode = LazyField(parse_int)
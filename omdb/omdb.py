@@ -1,15 +1,36 @@
 """OMDB API python wrapper library"""
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from math import ceil
-from typing import Any, Dict, Optional
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import requests
-
-from omdb.exceptions import OMDBException, OMDBInvalidAPIKey, OMDBLimitReached, OMDBNoResults, OMDBTooManyResults
-from omdb.utilities import camelcase_to_snake_case, clean_up_strings, range_inclusive, to_int
-
-
-class OMDB:
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter, Retry
+
+from omdb.aliases import TitleAliases
+from omdb.base import BaseOMDB
+from omdb.cache import BaseCache, cache_key
+from omdb.concurrency import ConcurrencyLimiter, is_overloaded
+from omdb.decoders import JSONDecoder
+from omdb.exceptions import OMDBException, OMDBLimitReached
+from omdb.hedging import HedgePolicy
+from omdb.http_cache import Revalidation, freshness_lifetime, is_cacheable, response_validators
+from omdb.index import TitleIndex
+from omdb.metrics import RequestEvent
+from omdb.models import Episode, Movie, Result, Series
+from omdb.prefetch import Prefetcher
+from omdb.rate_limiter import RateLimiter
+from omdb.singleflight import SingleFlight
+from omdb.utilities import imap_bounded, is_imdbid, range_inclusive, to_int, unique
+
+logger = logging.getLogger(__name__)
+
+
+class OMDB(BaseOMDB):
     """ The OMDB API wrapper instance
 
         Args:
@@ -17,65 +38,201 @@ class OMDB:
             timeout (float): The timeout, in seconds
             strict (bool): To use strict error checking or not; strict (True) \
             will throw errors if the API returns an error code, non-strict will not
+            max_workers (int): The maximum number of concurrent requests used when pulling multiple pages
+            cache (BaseCache): The cache to use for formatted results; `None` to disable caching
+            coalesce (bool): `True` to share a single request between concurrent identical requests
+            rate_limiter (RateLimiter): The rate limiter to throttle requests to the OMDB API; `None` to disable
+            pool_connections (int): The number of connection pools (one per host) to keep
+            pool_maxsize (int): The maximum number of connections to keep per host; defaults to the larger \
+            of 10 and `max_workers`, or the concurrency limiter `max_limit`
+            pool_block (bool): `True` to wait for a free connection when all `pool_maxsize` are in use rather \
+            than opening (and then discarding) an additional connection
+            max_retries (int or urllib3.util.Retry): The transport level retries for failed connections and \
+            5xx responses; an int uses exponential backoff
+            hooks (list): Callables passed a `RequestEvent` after each request; see `add_hook`
+            models (bool): `True` to return compact, typed, result objects (see `omdb.models`) from `get_movie`, \
+            `get_series`, `get_episode`, and the searches rather than dictionaries
+            decoder (JSONDecoder): The decoder of the raw response bodies; `None` to use the fastest available
+            index (TitleIndex): The local index every `search` and `get` result is added to, for \
+            `search_local`; `None` to disable
+            aliases (TitleAliases): The map of titles to IMDB ids, learned from every result, used to request \
+            known titles by IMDB id; `None` to disable
+            revalidate (bool): `True` to use the HTTP caching headers (`Cache-Control`, `Expires`, `ETag`, and \
+            `Last-Modified`) of the OMDB API for the lifetime of cached results, and to revalidate expired results \
+            using conditional requests; requires a `cache`
+            prefetch (Prefetcher): Retrieves the details of the top results of each `search` and `iter_search` \
+            into the `cache` in the background; requires a `cache`; `None` to disable
+            hedge (HedgePolicy): Sends one duplicate request when a response is slower than usual, using the \
+            first response; `None` to disable
+            concurrency (ConcurrencyLimiter): Adapts the number of requests in flight, shared by the paginated \
+            searches, `get_series(pull_episodes=True)`, and `get_many`, to the health of the OMDB API; up to \
+            twice its current `limit`, at most `max_limit`, threads are used rather than `max_workers`; `None` to \
+            disable
         Returns:
             OMDB: An OMDB API wrapper connection object
+        Note:
+            A single instance is safe to share between threads; each thread uses its own `requests.Session` \
+            while all threads share one connection pool
         Note:
             With `strict` disabled, it is up to the user to check for and handle errors """
 
-    __slots__ = ["_api_url", "_timeout", "_api_key", "_session", "_strict"]
-
-    def __init__(self, api_key: str, timeout: float = 5.0, strict: bool = True):
+    __slots__ = [
+        "_session",
+        "_singleflight",
+        "_rate_limiter",
+        "_adapter",
+        "_local",
+        "_hooks",
+        "_revalidate",
+        "_prefetch",
+        "_hedge",
+        "_concurrency",
+    ]
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 5.0,
+        strict: bool = True,
+        max_workers: int = 4,
+        cache: Optional[BaseCache] = None,
+        coalesce: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        max_retries: Union[int, Retry] = 0,
+        hooks: Optional[Iterable[Callable[[RequestEvent], Any]]] = None,
+        models: bool = False,
+        decoder: Optional[JSONDecoder] = None,
+        index: Optional[TitleIndex] = None,
+        aliases: Optional[TitleAliases] = None,
+        revalidate: bool = False,
+        prefetch: Optional[Prefetcher] = None,
+        hedge: Optional[HedgePolicy] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+    ):
         """the init object"""
-        self._api_url: str = "https://www.omdbapi.com/"
-        self._timeout: float = 5.0
-        self.timeout = timeout
-        self._api_key: str = ""
-        self.api_key = api_key
-        self._strict: bool = True
-        self.strict = strict
-        self._session: Optional[requests.Session] = requests.Session()
+        super().__init__(api_key, timeout, strict, max_workers, cache, coalesce, models, decoder, index, aliases)
+        if isinstance(max_retries, int) and max_retries > 0:
+            max_retries = Retry(
+                total=max_retries,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+        self._concurrency: Optional[ConcurrencyLimiter] = None
+        self.concurrency = concurrency
+        max_in_flight = self.max_workers if self._concurrency is None else self._concurrency.max_limit
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize if pool_maxsize else max(DEFAULT_POOLSIZE, max_in_flight),
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+        self._local = threading.local()
+        self._session: Optional[requests.Session] = self._new_session()
+        self._local.session = self._session
+        self._hooks: Tuple[Callable[[RequestEvent], Any], ...] = ()
+        for hook in hooks or ():
+            self.add_hook(hook)
+        self._singleflight = SingleFlight()
+        self._rate_limiter: Optional[RateLimiter] = None
+        self.rate_limiter = rate_limiter
+        self._revalidate = bool(revalidate)
+        self._prefetch: Optional[Prefetcher] = None
+        self.prefetch = prefetch
+        self._hedge: Optional[HedgePolicy] = None
+        self.hedge = hedge
 
-    def close(self):
-        """Close the requests connection if necessary"""
-        if self._session:
-            self._session.close()
-            self._session = None
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """RateLimiter: The rate limiter used to throttle requests; `None` if not rate limited"""
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, val: Optional[RateLimiter]):
+        """set the rate_limiter property"""
+        if val is not None and not isinstance(val, RateLimiter):
+            raise TypeError(f"OMDB rate_limiter must be a RateLimiter or None! {type(val)} provided")
+        self._rate_limiter = val
 
     @property
-    def api_key(self) -> str:
-        """str: The API Key to use to connect to the OMDB API"""
-        return self._api_key
-
-    @api_key.setter
-    def api_key(self, val: str):
-        """set the API Key"""
-        if isinstance(val, str):
-            self._api_key = val
-        else:
-            raise OMDBInvalidAPIKey(val)
+    def prefetch(self) -> Optional[Prefetcher]:
+        """Prefetcher: Retrieves the details of the top search results in the background; `None` if not used"""
+        return self._prefetch
+
+    @prefetch.setter
+    def prefetch(self, val: Optional[Prefetcher]):
+        """set the prefetch property"""
+        if val is not None and not isinstance(val, Prefetcher):
+            raise TypeError(f"OMDB prefetch must be a Prefetcher or None! {type(val)} provided")
+        self._prefetch = val
 
     @property
-    def timeout(self) -> float:
-        """float: The timeout parameter to pass to requests for how long to wait"""
-        return self._timeout
+    def hedge(self) -> Optional[HedgePolicy]:
+        """HedgePolicy: Sends a duplicate of slow requests; `None` if requests are not hedged"""
+        return self._hedge
 
-    @timeout.setter
-    def timeout(self, val: float):
-        """set the timeout property"""
-        try:
-            self._timeout = float(val)
-        except ValueError as exc:
-            raise ValueError(f"OMDB Timeout must be a float or convertable to float! {val} provided") from exc
+    @hedge.setter
+    def hedge(self, val: Optional[HedgePolicy]):
+        """set the hedge property"""
+        if val is not None and not isinstance(val, HedgePolicy):
+            raise TypeError(f"OMDB hedge must be a HedgePolicy or None! {type(val)} provided")
+        self._hedge = val
+
+    @property
+    def concurrency(self) -> Optional[ConcurrencyLimiter]:
+        """ConcurrencyLimiter: Adapts the number of requests in flight; `None` if `max_workers` is used"""
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, val: Optional[ConcurrencyLimiter]):
+        """set the concurrency property"""
+        if val is not None and not isinstance(val, ConcurrencyLimiter):
+            raise TypeError(f"OMDB concurrency must be a ConcurrencyLimiter or None! {type(val)} provided")
+        self._concurrency = val
 
     @property
-    def strict(self) -> bool:
-        """bool: Whether to throw or swallow errors; True will throw exceptions"""
-        return self._strict
+    def revalidate(self) -> bool:
+        """bool: Whether the HTTP caching headers determine the lifetime of cached results, and expired results \
+        are revalidated using conditional requests"""
+        return self._revalidate
+
+    @revalidate.setter
+    def revalidate(self, val: bool):
+        """set the revalidate property"""
+        self._revalidate = bool(val)
+
+    def add_hook(self, hook: Callable[[RequestEvent], Any]):
+        """Register a callable to be passed a `RequestEvent` after each request, including cache hits
+
+        Args:
+            hook (callable): The callable to register; e.g., a `ClientMetrics` instance
+        Note:
+            Hooks are called from the thread making the request; exceptions raised by hooks are logged \
+            and ignored. When no hooks are registered requests are not instrumented"""
+        if not callable(hook):
+            raise TypeError(f"OMDB hooks must be callable! {type(hook)} provided")
+        self._hooks = (*self._hooks, hook)
 
-    @strict.setter
-    def strict(self, val: bool):
-        """set the strict property"""
-        self._strict = bool(val)
+    def remove_hook(self, hook: Callable[[RequestEvent], Any]):
+        """Unregister a previously registered hook
+
+        Args:
+            hook (callable): The callable to unregister"""
+        self._hooks = tuple(h for h in self._hooks if h != hook)
+
+    def close(self):
+        """Close the requests connection if necessary; waits for any prefetches and hedges to complete"""
+        if self._prefetch is not None:
+            self._prefetch.close()
+        if self._hedge is not None:
+            self._hedge.close()
+        if self._session:
+            self._session.close()
+            self._session = None
+            self._adapter.close()
 
     def search(self, title: str, pull_all_results: bool = True, page: int = 1, **kwargs) -> Dict:
         """Perform a search based on title
@@ -88,34 +245,76 @@ class OMDB:
         Returns:
             dict: A dictionary of all the results
         Note:
-            If `pull_all_results` is `True` then page is ignored"""
-        params = {
-            "s": title,
-            "page": 1,
-            "apikey": self.api_key,
-        }  # set to the default...
-
-        if not pull_all_results:
-            params["page"] = page  # we are going to set it so that we can pull everything!
-
-        params.update(kwargs)
-
-        results = self._get_response(params)
+            If `pull_all_results` is `True` then page is ignored; when using `models`, each search result is \
+            a `SearchItem`"""
+        params = self._search_params(title, pull_all_results, page, kwargs)
+        results = self._query(params)
+        self._prefetch_details(results)
 
         total_results = int(results.get("total_results", 0))
         if not pull_all_results or total_results <= 10:  # 10 is the max that it will ever return
-            return results
+            return self._to_search_models(results)
 
         if "search" not in results:
             results["search"] = []  # defensive
 
         max_i = ceil(total_results / 10)
-        for i in range_inclusive(2, max_i):
-            params.update({"page": i})
-            data = self._get_response(params)
+        for data in self._get_pages(params, range_inclusive(2, max_i)):
             results["search"].extend(data.get("search", []))
 
-        return results
+        return self._to_search_models(results)
+
+    def search_local(
+        self, title: str, fuzzy: bool = False, fallback: bool = True, limit: Optional[int] = None, **kwargs
+    ) -> Dict:
+        """Search the local `index` of the titles already retrieved; every word must match, the last as a prefix
+
+        Args:
+            title (str): The query string to lookup, e.g., the text typed so far
+            fuzzy (bool): `True` to also include similar titles, e.g., misspelled, after the word matches
+            fallback (bool): `True` to `search` the OMDB API, adding the results to the index, when no titles match
+            limit (int): The maximum number of results from the index; `None` for all
+            kwargs (dict): the kwargs to add additional parameters to the API request; `type` and `y` also \
+            filter the index
+        Returns:
+            dict: A dictionary of all the results, the same as `search`
+        Raises:
+            OMDBException: When no `index` is used"""
+        res = self._search_index(title, fuzzy, limit, kwargs)
+        if res["search"] or not fallback:
+            return res
+        return self.search(title, **kwargs)
+
+    def iter_search(self, title: str, max_results: Optional[int] = None, **kwargs) -> Iterator[Dict]:
+        """Lazily perform a search based on title, yielding each result
+
+        Args:
+            title (str): The query string to lookup
+            max_results (int): The maximum number of results to yield; `None` for all results
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Yields:
+            dict: The next search result; a `SearchItem` when using `models`
+        Note:
+            The next page is only requested once all results from the current page are consumed"""
+        if max_results is not None and max_results <= 0:
+            return
+
+        params = self._search_params(title, False, 1, kwargs)
+        num_yielded = 0
+        page = 1
+        max_page = 1
+        while page <= max_page:
+            results = self._query({**params, "page": page})
+            if page == 1:
+                max_page = ceil(int(results.get("total_results", 0)) / 10)
+                self._prefetch_details(results)
+
+            for itm in self._to_search_models(results).get("search", []):
+                yield itm
+                num_yielded += 1
+                if max_results is not None and num_yielded >= max_results:
+                    return
+            page += 1
 
     def get(self, *, title: Optional[str] = None, imdbid: Optional[str] = None, **kwargs) -> Dict:
         """Retrieve a specific movie, series, or episode
@@ -130,17 +329,47 @@ class OMDB:
             OMDBException: Raised when both title or imdbid is not provided
         Note:
             Either `title` or `imdbid` is required"""
-        params = {"apikey": self.api_key}
-        if imdbid:
-            params["i"] = imdbid
-        elif title:
-            params["t"] = title
-        else:
-            raise OMDBException("Either title or imdbid is required!")
+        params = self._get_params(title, imdbid, kwargs)
+        return self._query(params)
 
-        params.update(kwargs)
+    def iter_many(
+        self, keys: Iterable[str], ordered: bool = False, deduplicate: bool = True, **kwargs
+    ) -> Iterator[Tuple[str, Union[Dict, Exception]]]:
+        """Retrieve many movies, series, or episodes concurrently using up to `max_workers` threads
+
+        Args:
+            keys (iterable): The IMDB ids or titles to retrieve; IMDB ids are detected automatically
+            ordered (bool): `True` to yield the results in the order of `keys`; otherwise in completion order
+            deduplicate (bool): `True` to only retrieve each key once
+            kwargs (dict): the kwargs to add additional parameters to the API requests
+        Yields:
+            tuple: The key and either the result or the exception raised while retrieving it
+        Note:
+            Only `max_workers` lookups are in flight at a time so `keys` may be an unbounded iterator; \
+            when deduplicating, the keys already seen are retained
+        Note:
+            Exceptions are yielded rather than raised; with `strict` disabled the error results are yielded"""
+
+        def lookup(key: str) -> Dict:
+            if is_imdbid(key):
+                return self.get(imdbid=key.strip(), **kwargs)
+            return self.get(title=key, **kwargs)
+
+        if deduplicate:
+            keys = unique(keys)
+
+        yield from self._imap_bounded(lookup, keys, ordered)
 
-        return self._get_response(params)
+    def get_many(self, keys: Iterable[str], deduplicate: bool = True, **kwargs) -> Dict[str, Union[Dict, Exception]]:
+        """Retrieve many movies, series, or episodes concurrently using up to `max_workers` threads
+
+        Args:
+            keys (iterable): The IMDB ids or titles to retrieve; IMDB ids are detected automatically
+            deduplicate (bool): `True` to only retrieve each key once
+            kwargs (dict): the kwargs to add additional parameters to the API requests
+        Returns:
+            dict: The result, or the exception raised while retrieving it, keyed by the key in input order"""
+        return dict(self.iter_many(keys, ordered=True, deduplicate=deduplicate, **kwargs))
 
     def search_movie(self, title: str, pull_all_results: bool = True, page: int = 1, **kwargs):
         """Search for a movie by title
@@ -170,7 +399,7 @@ class OMDB:
         params.update(kwargs)
         return self.search(title, pull_all_results, page, **params)
 
-    def get_movie(self, *, title: Optional[str] = None, imdbid: Optional[str] = None, **kwargs) -> Dict:
+    def get_movie(self, *, title: Optional[str] = None, imdbid: Optional[str] = None, **kwargs) -> Union[Dict, Movie]:
         """Retrieve a movie by title or IMDB id
 
         Args:
@@ -178,12 +407,12 @@ class OMDB:
             imdbid (str): The IMDB id of the movie to retrieve
             kwargs (dict): the kwargs to add additional parameters to the API request
         Returns:
-            dict: A dictionary of all the results
+            dict: A dictionary of all the results; a `Movie` when using `models`
         Note:
             Either `title` or `imdbid` is required"""
         params = {"type": "movie"}
         params.update(kwargs)
-        return self.get(title=title, imdbid=imdbid, **params)
+        return self._to_model(Movie, self.get(title=title, imdbid=imdbid, **params))
 
     def get_series(
         self,
@@ -191,33 +420,86 @@ class OMDB:
         title: Optional[str] = None,
         imdbid: Optional[str] = None,
         pull_episodes: bool = False,
+        partial_results: bool = False,
         **kwargs,
-    ) -> Dict:
+    ) -> Union[Dict, Series]:
         """Retrieve a TV series information by title or IMDB id
 
         Args:
             title (str): The name of the TV series to retrieve
             imdbid (str): The IMDB id of the TV series to retrieve
-            pull_episodes (bool): `True` to pull the episodes
+            pull_episodes (bool): `True` to pull the episodes; seasons are pulled concurrently
+            partial_results (bool): `True` to record seasons that fail to be pulled in `season_errors` \
+            rather than raising the exception
             kwargs (dict): the kwargs to add additional parameters to the API request
         Returns:
-            dict: A dictionary of all the results
+            dict: A dictionary of all the results; a `Series` when using `models`
         Note:
             Either `title` or `imdbid` is required"""
         params = {"type": "series"}
         params.update(kwargs)
         res = self.get(title=title, imdbid=imdbid, **params)
-        num_seasons = 0
-        if pull_episodes:
-            num_seasons = to_int(res.get("total_seasons", 0))
-            res["seasons"] = {}
+        if not pull_episodes:
+            return self._to_model(Series, res)
 
-        for i in range(num_seasons):
-            season_num = i + 1
-            season = self.get_episodes(title=title, imdbid=imdbid, season=season_num)
-            res["seasons"][season_num] = season
+        def pull_season(season_num: int) -> Dict:
+            return self.get_episodes(title=title, imdbid=imdbid, season=season_num)
 
-        return res
+        season_nums = list(range_inclusive(1, to_int(res.get("total_seasons", 0))))
+        seasons = self._map_concurrent(pull_season, season_nums, return_exceptions=partial_results)
+
+        res["seasons"] = {}
+        if partial_results:
+            res["season_errors"] = {}
+        for season_num, season in zip(season_nums, seasons):
+            if isinstance(season, Exception):
+                res["season_errors"][season_num] = season
+            else:
+                res["seasons"][season_num] = season
+
+        return self._to_model(Series, res)
+
+    def refresh_series(
+        self,
+        previous: Union[Dict, Series],
+        *,
+        title: Optional[str] = None,
+        imdbid: Optional[str] = None,
+        partial_results: bool = False,
+        **kwargs,
+    ) -> Tuple[Union[Dict, Series], Dict]:
+        """Incrementally refresh a TV series previously retrieved using `get_series(pull_episodes=True)`; only \
+        the newest previously pulled season and any new seasons are pulled
+
+        Args:
+            previous (dict): The previous `get_series` result; season numbers may be strings, e.g., when \
+            loaded from JSON
+            title (str): The name of the TV series to refresh; defaults to the IMDB id of `previous`
+            imdbid (str): The IMDB id of the TV series to refresh; defaults to the IMDB id of `previous`
+            partial_results (bool): `True` to record seasons that fail to be pulled in `season_errors` \
+            rather than raising the exception
+            kwargs (dict): the kwargs to add additional parameters to the API request
+        Returns:
+            tuple: The refreshed series, a dictionary or a `Series` when using `models`, with the previous and \
+            pulled seasons merged; and the episodes `added` and `changed`, each keyed by season number
+        Note:
+            Episodes are matched by their episode number; changes to seasons before the newest previously \
+            pulled season are not detected"""
+        if isinstance(previous, Result):
+            previous = previous.to_dict()
+        by_key = self._refresh_params(previous, title, imdbid)
+        params = {"type": "series"}
+        params.update(kwargs)
+        res = self.get(**by_key, **params)
+
+        def pull_season(season_num: int) -> Dict:
+            return self.get_episodes(**by_key, season=season_num)
+
+        previous_seasons = {to_int(k): v for k, v in (previous.get("seasons") or {}).items()}
+        season_nums = self._seasons_to_refresh(previous_seasons, to_int(res.get("total_seasons", 0)))
+        seasons = self._map_concurrent(pull_season, season_nums, return_exceptions=partial_results)
+        diff = self._merge_seasons(res, previous_seasons, season_nums, seasons, partial_results)
+        return self._to_model(Series, res), diff
 
     def get_episode(
         self,
@@ -227,7 +509,7 @@ class OMDB:
         season: int = 1,
         episode: Optional[int] = 1,
         **kwargs,
-    ) -> Dict:
+    ) -> Union[Dict, Episode]:
         """Retrieve a TV series episode by title or IMDB id and season and episode number
 
         Args:
@@ -237,16 +519,12 @@ class OMDB:
             episode (int): The episode number (based on season) of the episode to retrieve
             kwargs (dict): the kwargs to add additional parameters to the API request
         Returns:
-            dict: A dictionary of all the results
+            dict: A dictionary of all the results; a `Episode` when using `models`
         Note:
             Either `title` or `imdbid` is required"""
-        params: Dict[str, Any] = {"type": "episode"}
-        if season:
-            params["Season"] = season
-        if episode:
-            params["Episode"] = episode
-        params.update(kwargs)
-        return self.get(title=title, imdbid=imdbid, **params)
+        params = self._episode_params(season, episode, kwargs)
+        res = self.get(title=title, imdbid=imdbid, **params)
+        return self._to_model(Episode, res) if episode else res
 
     def get_episodes(
         self, *, title: Optional[str] = None, imdbid: Optional[str] = None, season: int = 1, **kwargs
@@ -264,54 +542,276 @@ class OMDB:
             Either `title` or `imdbid` is required"""
         return self.get_episode(title=title, imdbid=imdbid, season=season, episode=None, **kwargs)
 
-    def _get_response(self, kwargs):
-        """wrapper for the `requests` library call"""
-        response = self._session.get(self._api_url, params=kwargs, timeout=self._timeout).json()
-        return self._format_results(response, kwargs)
-
-    def _format_results(self, res, params):
-        """format the results into non-camelcase dictionaries"""
-        if not isinstance(res, dict):
-            raise TypeError(f"Expecting dict type, recieved {type(res)}")
-
-        keys = sorted(list(res.keys()))
-        for key in keys:
-            val = res.pop(key)
-            if isinstance(val, dict):
-                val = self._format_results(val, params)
-            if isinstance(val, list):
-                tmp = []
-                for _, itm in enumerate(val):
-                    if isinstance(itm, dict):
-                        tmp.append(self._format_results(itm, params))
-                    else:
-                        tmp.append(itm)
-                val = tmp
-            if isinstance(val, str):
-                val = clean_up_strings(val)
-
-            # convert camel case to lowercase
-            res[camelcase_to_snake_case(key)] = val
-
-        # NOTE: I dislike having to use string comparisons to check for specific error conditions
-        if self.strict and "response" in res and res["response"] == "False":
-            err = res.get("error", "").lower()
-            if err == "too many results.":
-                raise OMDBTooManyResults(res["error"], params)
-            if err in {
-                "movie not found!",
-                "series or season not found!",
-                "series not found!",
-                "series or episode not found!",
-                "incorrect imdb id.",
-            }:
-                raise OMDBNoResults(res["error"], params)
-            if err == "request limit reached!":
-                raise OMDBLimitReached(self.api_key)
-            if err == "invalid api key!":
-                raise OMDBInvalidAPIKey(self.api_key)
-            # known reasons:
-            # Error getting data.
-            raise OMDBException(f"An unknown exception was returned: {err}")
+    def _get_pages(self, params: Dict, pages) -> List[Dict]:
+        """pull the requested pages concurrently; results are returned in page order"""
+        return self._map_concurrent(self._query, [{**params, "page": i} for i in pages])
+
+    def _map_concurrent(self, func: Callable, items: List, return_exceptions: bool = False) -> List:
+        """call `func` for each item using up to `max_workers` threads, or twice the concurrency limiter `limit`; \
+        results are returned in order
+
+        When `return_exceptions` is `True`, exceptions are returned in place of the result"""
+
+        def call(item):
+            try:
+                return func(item)
+            except Exception as exc:
+                if return_exceptions:
+                    return exc
+                raise
+
+        workers = self._workers()
+        if workers == 1 or len(items) <= 1:
+            return [call(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+            return list(pool.map(call, items))
+
+    def _imap_bounded(self, func: Callable, items: Iterable, ordered: bool = False) -> Iterator[Tuple[Any, Any]]:
+        """lazily call `func` for each item with at most `max_workers`, or twice the concurrency limiter `limit`, \
+        calls in flight
+
+        Yields the item and either the result or the exception raised"""
+        yield from imap_bounded(func, items, self._workers(), ordered)
+
+    def _workers(self) -> int:
+        """the number of threads used to fan out; the concurrency limiter, if any, bounds the requests in flight"""
+        if self._concurrency is not None:  # room for the limit to grow during the fan out
+            return min(self._concurrency.max_limit, 2 * self._concurrency.limit)
+        return self.max_workers
+
+    def _query(self, params: Dict) -> Dict:
+        """serve the request from the cache, if possible, otherwise from the OMDB API"""
+        query = self._resolve(params)
+        if self._prefetch is not None:
+            self._prefetch.used(cache_key(self._untyped(query)))
+        if not self._hooks:
+            return self._learn(params, self._cached_query(query, None))
+
+        event = RequestEvent(query)
+        self._local.event = event
+        start = perf_counter()
+        try:
+            return self._learn(params, self._cached_query(query, event))
+        except Exception as exc:
+            event.error = type(exc).__name__
+            raise
+        finally:
+            event.total = perf_counter() - start
+            self._local.event = None
+            self._emit(event)
+
+    def _cached_query(self, params: Dict, event: Optional[RequestEvent]) -> Dict:
+        """serve the request from the cache, if possible, otherwise from the OMDB API"""
+        if self._cache is not None:
+            res = self._cache.get(params)
+            if event is not None:
+                event.cache = "miss" if res is None else "hit"
+            if res is not None:
+                return res
+
+        if not self._coalesce:
+            return self._fetch_and_cache(params)
+
+        res, shared = self._singleflight.do(cache_key(params), lambda: self._fetch_and_cache(params))
+        if event is not None:
+            event.coalesced = shared
+        return res
+
+    def _fetch_and_cache(self, params: Dict, acquired: bool = False) -> Dict:
+        """request from the OMDB API and add the result to the cache; `acquired` if the rate limiter budget \
+        is already consumed"""
+        if self._revalidate and self._cache is not None:
+            return self._fetch_and_revalidate(params, self._cache, acquired)
+        res = self._fetch(params, acquired)
+        if self._cache is not None and res.get("response") != "False":  # do not cache errors when not `strict`
+            self._cache.set(self._cache_params(params, res), res)
+        return res
+
+    def _fetch_and_revalidate(self, params: Dict, cache: BaseCache, acquired: bool = False) -> Dict:
+        """request from the OMDB API, conditionally if an expired result is cached, and cache the result for as \
+        long as the HTTP caching headers permit"""
+        entry = cache.get_entry(params)
+        if entry is not None and entry.fresh:  # cached by another thread or process since the lookup
+            return entry.value
 
+        revalidation = Revalidation(None if entry is None else entry.validators)
+        self._local.revalidation = revalidation
+        try:
+            res = self._fetch(params, acquired)
+        finally:
+            self._local.revalidation = None
+        lifetime = freshness_lifetime(revalidation.headers)
+        if entry is not None and revalidation.not_modified:
+            cache.refresh(params, lifetime, response_validators(revalidation.headers))
+            event = getattr(self._local, "event", None)
+            if event is not None:
+                event.cache = "revalidated"
+            return entry.value
+
+        if res.get("response") != "False" and is_cacheable(revalidation.headers):
+            cache.set(self._cache_params(params, res), res, lifetime, response_validators(revalidation.headers))
+        return res
+
+    def _prefetch_details(self, results: Dict):
+        """start retrieving the details of the top search results in the background, if enabled"""
+        prefetch, cache = self._prefetch, self._cache
+        if prefetch is None or cache is None or self._session is None:
+            return
+        admit = None if self._rate_limiter is None else self._rate_limiter.try_acquire
+        for itm in (results.get("search") or [])[: prefetch.top_n]:
+            if not itm.get("imdb_id"):
+                continue
+            # the parameters of `get(imdbid=...)`; those of `get_movie(imdbid=...)` and `get_series(imdbid=...)` \
+            # also include the type
+            params = self._resolve(self._get_params(None, itm["imdb_id"], {}))
+            typed = {**params, "type": itm["type"]} if itm.get("type") in ("movie", "series") else None
+            if self._is_cached(cache, params) and (typed is None or self._is_cached(cache, typed)):
+                continue
+            prefetch.submit(cache_key(params), partial(self._prefetch_one, params, typed), admit)
+
+    def _prefetch_one(self, params: Dict, typed: Optional[Dict] = None) -> Dict:
+        """request and cache a result in the background, also caching it as the `typed` lookup of the same IMDB \
+        id; the rate limiter budget is already consumed"""
+        if typed is None or not self._coalesce:
+            return self._prefetch_aliased(params, typed)
+        # follow up requests of either lookup share the prefetch in progress
+        res, _ = self._singleflight.do(cache_key(typed), lambda: self._prefetch_aliased(params, typed))
         return res
+
+    def _prefetch_aliased(self, params: Dict, typed: Optional[Dict]) -> Dict:
+        """request and cache the IMDB id lookup, then cache the result as the `typed` lookup as well"""
+        cache = self._cache
+        entry = cache.get_entry(params) if cache is not None else None
+        if entry is not None and entry.fresh:  # requested since the prefetch was submitted
+            res = entry.value
+        elif not self._coalesce:
+            res = self._fetch_and_cache(params, True)
+        else:
+            res, _ = self._singleflight.do(cache_key(params), lambda: self._fetch_and_cache(params, True))
+        # the lifetime of revalidated results is set by the HTTP caching headers of each request
+        if typed is None or cache is None or self._revalidate or res.get("type") != typed["type"]:
+            return res
+        if res.get("response") != "False" and not self._is_cached(cache, typed):
+            cache.set(typed, res)
+        return res
+
+    @staticmethod
+    def _is_cached(cache: BaseCache, params: Dict) -> bool:
+        """whether a fresh result of the request is cached"""
+        entry = cache.get_entry(params)
+        return entry is not None and entry.fresh
+
+    @staticmethod
+    def _untyped(params: Dict) -> Dict:
+        """the parameters of an IMDB id lookup without the type; the key of the prefetched result"""
+        if "i" not in params or "type" not in params or "Season" in params or "Episode" in params:
+            return params
+        return {k: v for k, v in params.items() if k != "type"}
+
+    def _emit(self, event: RequestEvent):
+        """pass the event to each hook"""
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("OMDB hook %r raised an exception", hook)
+
+    def _fetch(self, params: Dict, acquired: bool = False) -> Dict:
+        """request from the OMDB API once the rate limiter, if any, permits; `acquired` if the budget is \
+        already consumed"""
+        if self._rate_limiter is None:
+            return self._get_limited(params)
+
+        if not acquired:
+            self._rate_limiter.acquire()
+        try:
+            res = self._get_limited(params)
+        except OMDBLimitReached:
+            self._rate_limiter.limit_reached()
+            raise
+        if res.get("error", "").lower() == "request limit reached!":  # when not `strict`
+            self._rate_limiter.limit_reached()
+        return res
+
+    def _get_limited(self, params: Dict) -> Dict:
+        """request within the concurrency limit, if any, reporting the response time and any overload"""
+        limiter = self._concurrency
+        if limiter is None:
+            return self._get_response(params)
+
+        start = limiter.acquire()
+        try:
+            res = self._get_response(params)
+        except Exception as exc:
+            limiter.release(start, is_overloaded(exc))
+            raise
+        limiter.release(start, is_overloaded(res.get("error")))  # when not `strict`
+        return res
+
+    def _new_session(self) -> requests.Session:
+        """build a session that uses the shared connection pool"""
+        session = requests.Session()
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        """the session for the calling thread; `requests.Session` is not guaranteed to be thread-safe"""
+        if self._session is None:
+            raise OMDBException("The OMDB connection has been closed")
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._new_session()
+            self._local.session = session
+        return session
+
+    def _get_response(self, kwargs):
+        """request, decode, and format the results; timing each step when instrumented
+
+        When revalidating, the response is recorded and an empty result is returned if not modified"""
+        revalidation: Optional[Revalidation] = getattr(self._local, "revalidation", None)
+        event = getattr(self._local, "event", None) if self._hooks else None
+        if event is None:
+            response = self._request(kwargs, revalidation)
+            if revalidation is not None and revalidation.not_modified:
+                return {}
+            return self._decode_results(response.content, kwargs)
+
+        start = perf_counter()
+        response = self._request(kwargs, revalidation)
+        event.network = perf_counter() - start
+        event.status = response.status_code
+        event.bytes = len(response.content)
+        if revalidation is not None and revalidation.not_modified:
+            return {}
+
+        start = perf_counter()
+        data = self._decoder.decode(response.content)
+        event.decode = perf_counter() - start
+
+        start = perf_counter()
+        try:
+            return self._format_results(data, kwargs, self._decoder.formats_keys)
+        finally:
+            event.format = perf_counter() - start
+
+    def _request(self, kwargs, revalidation: Optional[Revalidation]) -> requests.Response:
+        """send the request; conditionally, and recording the response, when revalidating; hedged if enabled"""
+        if revalidation is None:
+            send = partial(self._send, kwargs)
+        else:
+            send = partial(self._send, kwargs, revalidation.request_headers())
+        if self._hedge is None:
+            response = send()
+        else:
+            admit = None if self._rate_limiter is None else self._rate_limiter.try_acquire
+            response = self._hedge.run(send, admit)
+        if revalidation is None:
+            return response
+        revalidation.record(response.status_code, response.headers)
+        return response
+
+    def _send(self, kwargs, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """wrapper for the `requests` library call"""
+        return self._get_session().get(self._api_url, params=kwargs, headers=headers, timeout=self._timeout)
@@ -0,0 +1,188 @@
+"""Speculatively retrieve the details of the top search results in the background"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Retrieve the details of the top `top_n` results of each search in the background, adding them to the \
+    cache so the follow up `get_movie(imdbid=...)`, or `get_series` or `get`, is served without waiting
+
+    Args:
+        top_n (int): The number of search results, from the first page, to retrieve the details of
+        max_in_flight (int): The maximum number of background requests; further prefetches are skipped
+        max_tracked (int): The maximum number of prefetched results waiting to be used; the oldest is \
+        counted as wasted when exceeded
+    Note:
+        Prefetches are skipped, not delayed, when the rate limiter budget does not permit a request right now \
+        or `max_in_flight` requests are in progress; results already cached are not prefetched again
+    Note:
+        Use `hits`, `wasted`, and `hit_ratio` to tune `top_n`"""
+
+    __slots__ = [
+        "_top_n",
+        "_max_in_flight",
+        "_max_tracked",
+        "_pool",
+        "_slots",
+        "_tracked",
+        "_lock",
+        "_issued",
+        "_hits",
+        "_wasted",
+        "_skipped",
+        "_failed",
+    ]
+
+    def __init__(self, top_n: int = 3, max_in_flight: int = 2, max_tracked: int = 1024):
+        """init"""
+        if int(top_n) < 1:
+            raise ValueError(f"Prefetcher top_n must be at least 1! {top_n} provided")
+        if int(max_in_flight) < 1:
+            raise ValueError(f"Prefetcher max_in_flight must be at least 1! {max_in_flight} provided")
+        self._top_n = int(top_n)
+        self._max_in_flight = int(max_in_flight)
+        self._max_tracked = max(1, int(max_tracked))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self._max_in_flight)
+        self._tracked: OrderedDict[str, None] = OrderedDict()  # the prefetched results not yet used
+        self._lock = threading.Lock()
+        self._issued: int = 0
+        self._hits: int = 0
+        self._wasted: int = 0
+        self._skipped: int = 0
+        self._failed: int = 0
+
+    @property
+    def top_n(self) -> int:
+        """int: The number of search results to retrieve the details of"""
+        return self._top_n
+
+    @property
+    def max_in_flight(self) -> int:
+        """int: The maximum number of background requests"""
+        return self._max_in_flight
+
+    @property
+    def issued(self) -> int:
+        """int: The number of prefetch requests sent"""
+        return self._issued
+
+    @property
+    def hits(self) -> int:
+        """int: The number of prefetched results that were later requested"""
+        return self._hits
+
+    @property
+    def wasted(self) -> int:
+        """int: The number of prefetched results no longer tracked that were never requested"""
+        return self._wasted
+
+    @property
+    def skipped(self) -> int:
+        """int: The number of prefetches skipped by the rate limiter budget or `max_in_flight`"""
+        return self._skipped
+
+    @property
+    def failed(self) -> int:
+        """int: The number of prefetch requests that raised an exception"""
+        return self._failed
+
+    @property
+    def pending(self) -> int:
+        """int: The number of prefetched results not yet requested"""
+        return len(self._tracked)
+
+    @property
+    def hit_ratio(self) -> float:
+        """float: The fraction of the prefetch requests whose result was later requested"""
+        return self._hits / self._issued if self._issued else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """The counters and the hit ratio
+
+        Returns:
+            dict: The `issued`, `hits`, `wasted`, `pending`, `skipped`, and `failed` counters and the `hit_ratio`"""
+        with self._lock:
+            return {
+                "issued": self._issued,
+                "hits": self._hits,
+                "wasted": self._wasted,
+                "pending": len(self._tracked),
+                "skipped": self._skipped,
+                "failed": self._failed,
+                "hit_ratio": self._hits / self._issued if self._issued else 0.0,
+            }
+
+    def submit(self, key: str, fetch: Callable[[], object], admit: Optional[Callable[[], bool]] = None) -> bool:
+        """Run `fetch` in the background if a request is permitted
+
+        Args:
+            key (str): The cache key of the result being prefetched
+            fetch (callable): Requests, and caches, the result
+            admit (callable): Returns `True` if the rate limiter budget permits the request now
+        Returns:
+            bool: `True` if the prefetch was started"""
+        if not self._slots.acquire(blocking=False):
+            self._skip()
+            return False
+        if admit is not None and not admit():
+            self._slots.release()
+            self._skip()
+            return False
+        with self._lock:
+            self._issued += 1
+            self._tracked[key] = None
+            self._tracked.move_to_end(key)
+            while len(self._tracked) > self._max_tracked:
+                self._tracked.popitem(last=False)
+                self._wasted += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix="omdb-prefetch")
+            pool = self._pool
+        pool.submit(self._run, key, fetch)
+        return True
+
+    def used(self, key: str) -> bool:
+        """Record that a result was requested; a hit if it was prefetched and not yet used
+
+        Args:
+            key (str): The cache key of the result requested
+        Returns:
+            bool: `True` if the result was prefetched"""
+        if key not in self._tracked:  # the common case; avoid the lock
+            return False
+        with self._lock:
+            if self._tracked.pop(key, False) is False:
+                return False
+            self._hits += 1
+        return True
+
+    def close(self):
+        """Wait for the background requests to complete; the prefetcher may still be used afterwards"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _skip(self):
+        """count a skipped prefetch"""
+        with self._lock:
+            self._skipped += 1
+
+    def _run(self, key: str, fetch: Callable[[], object]):
+        """run the prefetch, releasing the slot when complete"""
+        try:
+            fetch()
+        except Exception as exc:
+            logger.debug("prefetch of %s failed: %r", key, exc)
+            with self._lock:
+                self._failed += 1
+                self._tracked.pop(key, None)
+        finally:
+            self._slots.release()
@@ -0,0 +1,164 @@
+"""Client side rate limiting for the OMDB API wrappers"""
+
+import threading
+import time
+from typing import List, Optional
+
+from omdb.exceptions import OMDBRateLimited
+
+SECONDS_PER_DAY = 86400.0
+
+
+class TokenBucket:
+    """A token bucket; tokens are added at a constant rate up to the capacity of the bucket
+
+    Args:
+        rate (float): The number of tokens added per second
+        capacity (float): The maximum number of tokens the bucket holds
+    Note:
+        Not thread-safe on its own; see `RateLimiter`"""
+
+    __slots__ = ["_rate", "_capacity", "_tokens", "_updated"]
+
+    def __init__(self, rate: float, capacity: float):
+        """init"""
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"TokenBucket requires a positive rate and a capacity of at least 1! {rate}, {capacity}")
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """float: The number of tokens added per second"""
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        """float: The maximum number of tokens the bucket holds"""
+        return self._capacity
+
+    @property
+    def tokens(self) -> float:
+        """float: The number of tokens currently available"""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self) -> float:
+        """The number of seconds until a token is available
+
+        Returns:
+            float: The number of seconds to wait; 0 if a token is available"""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def consume(self):
+        """Remove a token from the bucket"""
+        self._tokens -= 1
+
+    def drain(self):
+        """Remove all tokens from the bucket"""
+        self._refill()
+        self._tokens = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """A thread-safe rate limiter using token buckets for per second and per day budgets
+
+    Args:
+        per_second (float): The number of requests permitted per second; `None` for no limit
+        per_day (int): The number of requests permitted per day; `None` for no limit
+        burst (int): The number of requests that may be made at once; defaults to `per_second`
+        block (bool): `True` to wait for the budget to permit the request; `False` to raise `OMDBRateLimited`
+        max_wait (float): The maximum number of seconds to wait when blocking before raising `OMDBRateLimited`; \
+        `None` to wait as long as is needed
+    Note:
+        The per day budget is refilled continuously (`per_day` / 86400 requests each second); when the OMDB API \
+        reports that the limit is reached the per day budget is emptied"""
+
+    __slots__ = ["_buckets", "_second", "_day", "_block", "_max_wait", "_lock"]
+
+    def __init__(
+        self,
+        per_second: Optional[float] = None,
+        per_day: Optional[int] = None,
+        burst: Optional[int] = None,
+        block: bool = True,
+        max_wait: Optional[float] = None,
+    ):
+        """init"""
+        self._second: Optional[TokenBucket] = None
+        self._day: Optional[TokenBucket] = None
+        if per_second:
+            self._second = TokenBucket(per_second, burst if burst else max(1.0, per_second))
+        if per_day:
+            self._day = TokenBucket(per_day / SECONDS_PER_DAY, per_day)
+        self._buckets: List[TokenBucket] = [b for b in (self._second, self._day) if b is not None]
+        self._block = bool(block)
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+
+    @property
+    def block(self) -> bool:
+        """bool: Whether to wait for the budget to permit the request or raise `OMDBRateLimited`"""
+        return self._block
+
+    @property
+    def per_second(self) -> Optional[float]:
+        """float: The number of requests permitted per second"""
+        return self._second.rate if self._second else None
+
+    @property
+    def per_day(self) -> Optional[int]:
+        """int: The number of requests permitted per day"""
+        return int(self._day.capacity) if self._day else None
+
+    @property
+    def remaining_today(self) -> Optional[int]:
+        """int: The number of requests remaining in the per day budget"""
+        with self._lock:
+            return int(self._day.tokens) if self._day else None
+
+    def acquire(self, block: Optional[bool] = None):
+        """Wait until the budget permits a request and then consume from the budget
+
+        Args:
+            block (bool): Override if this call should wait for the budget
+        Raises:
+            OMDBRateLimited: When not blocking and the request is not permitted, or the wait exceeds `max_wait`"""
+        block = self._block if block is None else block
+        while True:
+            with self._lock:
+                wait = max((b.wait_time() for b in self._buckets), default=0.0)
+                if wait <= 0:
+                    for bucket in self._buckets:
+                        bucket.consume()
+                    return
+            if not block or (self._max_wait is not None and wait > self._max_wait):
+                raise OMDBRateLimited(wait)
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Consume from the budget only if a request is permitted right now
+
+        Returns:
+            bool: `True` if the request is permitted"""
+        try:
+            self.acquire(block=False)
+        except OMDBRateLimited:
+            return False
+        return True
+
+    def limit_reached(self):
+        """Empty the per day budget; used when the OMDB API reports the request limit was reached"""
+        with self._lock:
+            if self._day:
+                self._day.drain()
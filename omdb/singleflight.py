@@ -0,0 +1,117 @@
+"""Coalesce concurrent identical requests so only one is sent to the OMDB API"""
+
+import asyncio
+import threading
+from copy import deepcopy
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """an in-flight call shared by the caller that started it and those waiting on it"""
+
+    __slots__ = ["done", "result", "error", "waiters"]
+
+    def __init__(self, done):
+        self.done = done
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe de-duplication of concurrent calls with the same key
+
+    Note:
+        Every caller receives its own (deep) copy of the result, or the same exception; the result is not \
+        copied when there were no waiting callers"""
+
+    __slots__ = ["_calls", "_lock"]
+
+    def __init__(self):
+        """init"""
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Call `func` unless a call with the same key is in flight, in which case wait for its result
+
+        Args:
+            key (str): The key identifying identical calls
+            func (callable): The function to call
+        Returns:
+            tuple: The result and `True` if the result was shared from another caller's call"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(threading.Event())
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.result), True
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]  # no more callers can wait on this call
+            call.done.set()
+        # the waiters copy the original result so the caller may modify theirs
+        return (deepcopy(call.result) if call.waiters else call.result), False
+
+
+class AsyncSingleFlight:
+    """De-duplication of concurrent coroutine calls, on a single event loop, with the same key
+
+    Note:
+        Every caller receives its own (deep) copy of the result, or the same exception; the result is not \
+        copied when there were no waiting callers"""
+
+    __slots__ = ["_calls"]
+
+    def __init__(self):
+        """init"""
+        self._calls: Dict[str, _Call] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await `func` unless a call with the same key is in flight, in which case wait for its result
+
+        Args:
+            key (str): The key identifying identical calls
+            func (callable): The coroutine function to call
+        Returns:
+            tuple: The result and `True` if the result was shared from another caller's call
+        Note:
+            The call runs as its own task; cancelling the caller that started it only cancels the call when \
+            no other caller is waiting on it"""
+        call = self._calls.get(key)
+        if call is not None:
+            call.waiters += 1
+            return deepcopy(await asyncio.shield(call.done)), True
+
+        task = asyncio.ensure_future(func())
+        call = self._calls[key] = _Call(task)
+        task.add_done_callback(lambda _: self._finish(key, call))
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not call.waiters:  # nobody else needs the result
+                self._finish(key, call)
+                task.cancel()
+            raise
+        # the waiters copy the original result so the caller may modify theirs
+        return (deepcopy(result) if call.waiters else result), False
+
+    def _finish(self, key: str, call: _Call):
+        """stop sharing the call; no more callers can wait on it"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.done.done() and not call.done.cancelled():
+            call.done.exception()  # mark as retrieved when there are no waiters
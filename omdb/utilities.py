@@ -1,5 +1,50 @@
 """A utilities suite"""
 
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+IMDB_ID_RE = re.compile(r"^tt\d+$")
+TITLE_TOKEN_RE = re.compile(r"[^\W_]+")
+APOSTROPHES_TABLE = {ord("'"): None, ord("\u2019"): None}
+
+HYPHENS = [
+    "\u002d",
+    "\u007e",
+    "\u00ad",
+    "\u058a",
+    "\u05be",
+    "\u1400",
+    "\u1806",
+    "\u2010",
+    "\u2011",
+    "\u2012",
+    "\u2013",
+    "\u2014",
+    "\u2015",
+    "\u2053",
+    "\u207b",
+    "\u208b",
+    "\u2212",
+    "\u2e17",
+    "\u2e3a",
+    "\u2e3b",
+    "\u301c",
+    "\u3030",
+    "\u30a0",
+    "\ufe31",
+    "\ufe32",
+    "\ufe58",
+    "\ufe63",
+    "\uff0d",
+]
+HYPHENS_TABLE = {ord(c): "-" for c in HYPHENS}
+
 
 def camelcase_to_snake_case(_input: str) -> str:
     """Convert a camel case string to a snake case string: CamelCase -> camel_case
@@ -7,16 +52,66 @@ def camelcase_to_snake_case(_input: str) -> str:
     Args:
         _input (str): The string to convert"""
     # https://codereview.stackexchange.com/a/185974
-    res = _input[0].lower()
-    for i, letter in enumerate(_input[1:], 1):
-        if letter.isupper():
-            try:
-                if _input[i - 1].islower() or _input[i + 1].islower():
-                    res += "_"
-            except IndexError:
-                pass
-        res += letter.lower()
-    return res
+    res = [_input[0].lower()]
+    last = len(_input) - 1
+    for i in range(1, len(_input)):
+        letter = _input[i]
+        if letter.isupper() and (_input[i - 1].islower() or (i < last and _input[i + 1].islower())):
+            res.append("_")
+        res.append(letter.lower())
+    return "".join(res)
+
+
+# the OMDB API uses a small, fixed, set of keys so the conversions are memoized
+snake_case_key = lru_cache(maxsize=1024)(camelcase_to_snake_case)
+
+
+def format_keys(res: Dict) -> Dict:
+    """Build a new dictionary using snake case keys (in sorted order of the original keys) and \
+    standardized hyphens in string values; nested dictionaries, and dictionaries in lists, are also formatted
+
+    Args:
+        res (dict): The dictionary, as returned from the OMDB API, to format
+    Returns:
+        dict: The formatted dictionary"""
+    out = {}
+    for key in sorted(res):
+        val = res[key]
+        if isinstance(val, str):
+            val = clean_up_strings(val)
+        elif isinstance(val, dict):
+            val = format_keys(val)
+        elif isinstance(val, list):
+            val = [format_keys(itm) if isinstance(itm, dict) else itm for itm in val]
+        out[snake_case_key(key)] = val
+    return out
+
+
+def format_pairs(pairs: List[Tuple[str, Any]]) -> Dict:
+    """Build a dictionary, formatted the same as `format_keys`, from the key value pairs of a decoded JSON \
+    object; use as the `object_pairs_hook` to format while decoding
+
+    Args:
+        pairs (list): The key value pairs of the JSON object; nested objects are already formatted
+    Returns:
+        dict: The formatted dictionary"""
+    pairs.sort(key=itemgetter(0))  # stable; the last duplicate key wins, as with `dict`
+    out = {}
+    for key, val in pairs:
+        if isinstance(val, str):
+            val = clean_up_strings(val)
+        out[snake_case_key(key)] = val
+    return out
+
+
+def is_imdbid(val: str) -> bool:
+    """Determine if the passed in string is an IMDB id (e.g., tt0112384)
+
+    Args:
+        val (str): The string to check
+    Returns:
+        bool: True if the string is an IMDB id"""
+    return bool(IMDB_ID_RE.match(val.strip()))
 
 
 def range_inclusive(start: int, end: int, step: int = 1):
@@ -32,6 +127,58 @@ def range_inclusive(start: int, end: int, step: int = 1):
     yield from range(start, end + 1, step)
 
 
+def unique(vals: Iterable[Hashable]) -> Iterator:
+    """Lazily yield each value once, in the order first seen
+
+    Args:
+        vals (iterable): The values to de-duplicate
+    Yields:
+        The next value not already seen"""
+    seen = set()
+    for val in vals:
+        if val not in seen:
+            seen.add(val)
+            yield val
+
+
+def imap_bounded(func: Callable, items: Iterable, max_workers: int, ordered: bool = False) -> Iterator[Tuple[Any, Any]]:
+    """Lazily call `func` for each item using a pool of threads, with at most `max_workers` calls in flight
+
+    Args:
+        func (callable): The function to call with each item
+        items (iterable): The items; may be an unbounded iterator
+        max_workers (int): The maximum number of calls in flight
+        ordered (bool): `True` to yield in the order of `items`; otherwise in completion order
+    Yields:
+        tuple: The item and either the result or the exception raised"""
+    items = iter(items)
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: Deque = deque()
+        for item in islice(items, max_workers):
+            pending.append((item, pool.submit(call, item)))
+
+        while pending:
+            if ordered:
+                item, future = pending.popleft()
+            else:
+                wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                idx = next(i for i, (_, f) in enumerate(pending) if f.done())
+                item, future = pending[idx]
+                del pending[idx]
+
+            res = future.result()
+            for nxt in islice(items, 1):
+                pending.append((nxt, pool.submit(call, nxt)))
+            yield item, res
+
+
 def to_int(val: str) -> int:
     """Turn the passed in variable into an int; returns 0 if errors
 
@@ -47,35 +194,36 @@ def to_int(val: str) -> int:
 
 
 def clean_up_strings(val: str) -> str:
-    hypens = [
-        "\u002d",
-        "\u007e",
-        "\u00ad",
-        "\u058a",
-        "\u05be",
-        "\u1400",
-        "\u1806",
-        "\u2010",
-        "\u2011",
-        "\u2012",
-        "\u2013",
-        "\u2014",
-        "\u2015",
-        "\u2053",
-        "\u207b",
-        "\u208b",
-        "\u2212",
-        "\u2e17",
-        "\u2e3a",
-        "\u2e3b",
-        "\u301c",
-        "\u3030",
-        "\u30a0",
-        "\ufe31",
-        "\ufe32",
-        "\ufe58",
-        "\ufe63",
-        "\uff0d",
-    ]
-    hypens_dd = {ord(c): "-" for c in hypens}
-    return val.translate(hypens_dd)
+    """Replace the many different unicode hyphens with a standard hyphen
+
+    Args:
+        val (str): The string to clean up
+    Returns:
+        str: The string using only standard hyphens"""
+    if val.isascii():  # the tilde is the only ASCII character to replace; skip the translation
+        return val.replace("~", "-") if "~" in val else val
+    return val.translate(HYPHENS_TABLE)
+
+
+def title_tokens(val: str) -> List[str]:
+    """Split a title into lowercase words with the accents and apostrophes removed; hyphens, as standardized \
+    by `clean_up_strings`, and other punctuation separate words
+
+    Args:
+        val (str): The title to split
+    Returns:
+        list: The words of the title"""
+    val = clean_up_strings(val).translate(APOSTROPHES_TABLE).casefold()
+    if not val.isascii():
+        val = "".join(c for c in unicodedata.normalize("NFKD", val) if not unicodedata.combining(c))
+    return TITLE_TOKEN_RE.findall(val)
+
+
+def normalize_title(val: str) -> str:
+    """Normalize a title for matching: Spider-Man: Far From Home -> spider man far from home
+
+    Args:
+        val (str): The title to normalize
+    Returns:
+        str: The words of the title, see `title_tokens`, separated by single spaces"""
+    return " ".join(title_tokens(val))
@@ -0,0 +1,95 @@
+"""
+Shared helpers for the unittests
+"""
+
+import threading
+import time
+import unittest
+from typing import Dict, Iterable, List, Optional, Type
+
+from benchmarks.server import LocalServer
+from omdb import OMDB
+from omdb.exceptions import error_of
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """Run a `server_class` server for each test; `build` a client using it"""
+
+    server_class: Type[LocalServer] = LocalServer
+
+    def setUp(self):
+        self.server = self.server_class().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def build(self, **kwargs) -> OMDB:
+        """an OMDB client pointed at the local server"""
+        omdb = OMDB(api_key="local", **kwargs)
+        omdb._api_url = self.server.url
+        return omdb
+
+
+class FakeOMDB(OMDB):
+    """An `OMDB` client answering from canned, formatted, results rather than the OMDB API
+
+    Args:
+        results (list): The results of IMDB id and title lookups, matched by `imdb_id` or `title` (ignoring \
+        case); searches return every result
+        errors (dict): The error returned, or raised when `strict`, for an IMDB id or title
+        delay (float): The number of seconds each request takes
+    Note:
+        The parameters of each request, without the `apikey`, are recorded in `requests` and the most requests \
+        in flight at once in `peak`; clear `release` to hold the lookups, not searches, until it is set"""
+
+    def __init__(
+        self,
+        *args,
+        results: Iterable[Dict] = (),
+        errors: Optional[Dict[str, str]] = None,
+        delay: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.results: List[Dict] = list(results)
+        self.errors = dict(errors or {})
+        self.delay = delay
+        self.requests: List[Dict] = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def _get_response(self, kwargs):
+        with self.lock:
+            self.requests.append({k: v for k, v in kwargs.items() if k != "apikey"})
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if "s" not in kwargs:
+                self.release.wait(5)
+            if self.delay:
+                time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+        error = self.errors.get(kwargs.get("i", kwargs.get("t")))
+        res = {"response": "False", "error": error} if error else self.respond(kwargs)
+        exc = error_of(res, kwargs, self.api_key) if self.strict else None
+        if exc is not None:
+            raise exc
+        return res
+
+    def respond(self, kwargs: Dict) -> Dict:
+        """the canned result of the request"""
+        if "s" in kwargs:
+            items = [dict(itm) for itm in self.results]
+            return {"search": items, "total_results": str(len(items)), "response": "True"}
+        for itm in self.results:
+            if "i" in kwargs and itm.get("imdb_id") == kwargs["i"]:
+                return {**itm, "response": "True"}
+            if "t" in kwargs and itm.get("title", "").lower() == kwargs["t"].lower():
+                return {**itm, "response": "True"}
+        return {"response": "False", "error": "Movie not found!"}
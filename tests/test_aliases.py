@@ -0,0 +1,132 @@
+"""
+Unittest class for resolving titles to IMDB ids
+"""
+
+import unittest
+
+from omdb import LRUCache, Movie, TitleAliases
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY
+
+APOLLO_13 = {"title": "Apollo 13", "year": "1995", "imdb_id": "tt0112384", "type": "movie", "response": "True"}
+BSG_1978 = {"title": "Battlestar Galactica", "year": "1978", "imdb_id": "tt0076984", "type": "movie"}
+
+
+def build(**kwargs) -> FakeOMDB:
+    """a client that only knows Apollo 13"""
+    return FakeOMDB(api_key=API_KEY, results=[APOLLO_13], **kwargs)
+
+
+class TestTitleAliases(unittest.TestCase):
+    def test_key(self):
+        self.assertEqual(TitleAliases.key("Spider‐Man: Far From Home"), ("spider man far from home", "", ""))
+        self.assertEqual(TitleAliases.key(" SPIDER-MAN ", 2002, "Movie"), ("spider man", "2002", "movie"))
+
+    def test_get_set(self):
+        aliases = TitleAliases()
+        self.assertIsNone(aliases.get("Apollo 13"))
+        aliases.set("Apollo 13", "tt0112384")
+        self.assertEqual(aliases.get("apollo  13"), "tt0112384")
+        self.assertIsNone(aliases.get("Apollo 13", year=1995))
+        self.assertEqual((aliases.hits, aliases.misses), (1, 2))
+        aliases.set("", "tt0000000")  # titles without words are ignored
+        self.assertEqual(len(aliases), 1)
+        aliases.clear()
+        self.assertEqual(len(aliases), 0)
+
+    def test_eviction(self):
+        aliases = TitleAliases(max_entries=2)
+        self.assertEqual(aliases.max_entries, 2)
+        aliases.set("a", "tt1")
+        aliases.set("b", "tt2")
+        aliases.get("a")
+        aliases.set("c", "tt3")
+        self.assertEqual(len(aliases), 2)
+        self.assertIsNone(aliases.get("b"))  # least recently used
+        self.assertEqual(aliases.get("a"), "tt1")
+        self.assertRaises(ValueError, lambda: TitleAliases(max_entries=0))
+
+    def test_resolve(self):
+        aliases = TitleAliases()
+        aliases.set("Apollo 13", "tt0112384", type="movie")
+        params = {"apikey": "x", "t": "APOLLO 13", "type": "movie", "plot": "full"}
+        self.assertEqual(aliases.resolve(params), {"apikey": "x", "type": "movie", "plot": "full", "i": "tt0112384"})
+        untyped = {"t": "Apollo 13"}
+        self.assertIs(aliases.resolve(untyped), untyped)
+
+        unknown = {"t": "Apollo 18", "type": "movie"}
+        self.assertIs(aliases.resolve(unknown), unknown)
+        episode = {"t": "Apollo 13", "type": "movie", "Season": 1}
+        self.assertIs(aliases.resolve(episode), episode)
+
+    def test_learn(self):
+        aliases = TitleAliases()
+        aliases.learn({"t": "apollo 13"}, APOLLO_13)
+        self.assertEqual(aliases.get("Apollo 13"), "tt0112384")  # the title lookup
+        self.assertEqual(aliases.get("Apollo 13", 1995, "movie"), "tt0112384")  # the result
+        self.assertIsNone(aliases.get("Apollo 13", type="movie"))
+
+        # results of id lookups and searches only learn the fully specified alias; an unspecified title is
+        # resolved by the OMDB API, e.g., Battlestar Galactica is the 2004 series, not the 1978 movie
+        aliases.learn({"s": "battlestar"}, {"search": [BSG_1978], "response": "True"})
+        self.assertEqual(aliases.get("Battlestar Galactica", "1978", "movie"), "tt0076984")
+        self.assertIsNone(aliases.get("Battlestar Galactica"))
+
+        aliases.learn({"t": "Psych", "Season": 1, "Episode": 1}, {**APOLLO_13, "title": "Pilot", "type": "episode"})
+        self.assertIsNone(aliases.get("Psych"))
+        aliases.learn({"t": "Apollo 18"}, {"response": "False", "error": "Movie not found!"})
+        self.assertIsNone(aliases.get("Apollo 18"))
+        aliases.learn({"i": "tt0112384"}, Movie.from_dict({**APOLLO_13, "title": "Apollo XIII"}))
+        self.assertEqual(aliases.get("apollo xiii", "1995", "movie"), "tt0112384")
+
+
+class TestOMDBAliases(unittest.TestCase):
+    def test_title_lookups_use_id_entry(self):
+        cache = LRUCache()
+        aliases = TitleAliases()
+        omdb = build(cache=cache, aliases=aliases)
+        self.assertIs(omdb.aliases, aliases)
+
+        omdb.get(imdbid="tt0112384")
+        omdb.get(title="Apollo 13")  # unknown title; requested by title
+        self.assertEqual(omdb.get(title="apollo-13"), APOLLO_13)  # resolved to the id keyed entry
+        self.assertEqual(omdb.get(title="APOLLO 13"), APOLLO_13)
+        self.assertEqual(omdb.requests, [{"i": "tt0112384"}, {"t": "Apollo 13"}])
+        self.assertEqual(aliases.hits, 2)
+
+    def test_title_lookup_cached_by_id(self):
+        cache = LRUCache()
+        omdb = build(cache=cache, aliases=TitleAliases())
+        omdb.get(title="Apollo 13")
+        self.assertEqual(omdb.get(title="Apollo 13"), APOLLO_13)  # resolved to the entry of the first lookup
+        self.assertEqual(omdb.get(imdbid="tt0112384"), APOLLO_13)
+        self.assertEqual(omdb.requests, [{"t": "Apollo 13"}])
+        self.assertEqual(len(cache), 1)
+
+    def test_without_cache(self):
+        omdb = build(aliases=TitleAliases(), strict=False)
+        omdb.get(title="Apollo 13", y="1995")
+        omdb.get(title="Apollo 13", y="1995", plot="full")
+        omdb.get(title="Apollo 18")
+        omdb.get(title="Apollo 18")
+        self.assertEqual(
+            omdb.requests,
+            [
+                {"t": "Apollo 13", "y": "1995"},
+                {"i": "tt0112384", "plot": "full"},
+                {"t": "Apollo 18"},
+                {"t": "Apollo 18"},
+            ],
+        )
+
+    def test_disabled(self):
+        omdb = build()
+        self.assertIsNone(omdb.aliases)
+        omdb.get(title="Apollo 13")
+        omdb.get(title="Apollo 13")
+        self.assertEqual(len(omdb.requests), 2)
+        self.assertRaises(TypeError, lambda: setattr(omdb, "aliases", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
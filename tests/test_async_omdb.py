@@ -0,0 +1,93 @@
+"""
+Unittest class for the asyncio client
+"""
+
+import asyncio
+import unittest
+
+from vcr import VCR  # type: ignore
+
+from omdb import AsyncOMDB, Movie, SearchItem
+from omdb.exceptions import OMDBNoResults
+from tests.test_omdb import API_KEY, RECORD_MODE, OMDBOverloaded
+
+
+class AsyncOMDBOverloaded(AsyncOMDB):
+    def __init__(self, api_key, timeout=5, strict=True, max_workers=4, **kwargs):
+        super().__init__(api_key, timeout, strict, max_workers, **kwargs)
+
+        self.vcr = VCR(
+            decode_compressed_response=True,
+            record_mode=RECORD_MODE,
+            filter_query_parameters=[("apikey", "supersecret"), "api_key"],
+            filter_post_data_parameters=[("apikey", "supersecret"), "api_key"],
+            path_transformer=VCR.ensure_suffix(".yaml"),
+        )
+        # VCR patches the http connection globally; serialize cassette usage between tasks
+        self.vcr_lock = asyncio.Lock()
+
+    _build_path = OMDBOverloaded._build_path
+
+    async def _send(self, kwargs):
+        async with self.vcr_lock:
+            with self.vcr.use_cassette(path=f"./tests/cassettes/{self._build_path(kwargs)}.yaml"):
+                return await super()._send(kwargs)
+
+
+class TestAsyncOMDB(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.omdb = AsyncOMDBOverloaded(api_key=API_KEY)
+
+    async def asyncTearDown(self):
+        await self.omdb.close()
+        self.assertIsNone(self.omdb._session)
+
+    async def test_get_movie(self):
+        mov = await self.omdb.get_movie(title="Apollo 13")
+        self.assertEqual(mov["year"], "1995")
+        self.assertEqual(mov["imdb_id"], "tt0112384")
+
+    async def test_get_movie_model(self):
+        self.omdb.models = True
+        mov = await self.omdb.get_movie(title="Apollo 13")
+        self.assertIsInstance(mov, Movie)
+        self.assertEqual(mov.year, 1995)
+
+        res = await self.omdb.search("Band of Brothers")
+        self.assertTrue(all(isinstance(itm, SearchItem) for itm in res["search"]))
+
+    async def test_search_all_pages(self):
+        res = await self.omdb.search_movie("malcolm")
+        self.assertEqual(res["total_results"], "88")
+        self.assertEqual(len(res["search"]), 88)
+
+        expected = OMDBOverloaded(api_key=API_KEY).search_movie("malcolm")
+        self.assertEqual(res["search"], expected["search"])
+
+    async def test_iter_search(self):
+        titles = [itm["title"] async for itm in self.omdb.iter_search("malcolm", max_results=15, type="movie")]
+        expected = OMDBOverloaded(api_key=API_KEY).search_movie("malcolm")
+        self.assertEqual(titles, [itm["title"] for itm in expected["search"][:15]])
+
+    async def test_get_series_pull_episodes(self):
+        bsg = await self.omdb.get_series(title="Battlestar Galactica", pull_episodes=True)
+        self.assertEqual(bsg["total_seasons"], "4")
+        self.assertEqual(sorted(bsg["seasons"]), [1, 2, 3, 4])
+        for i in range(1, 5):
+            self.assertEqual(bsg["seasons"][i]["episodes"][0]["episode"], "1")
+
+    async def test_refresh_series(self):
+        bsg = await self.omdb.get_series(title="Battlestar Galactica", pull_episodes=True)
+        previous = {**bsg, "seasons": {i: bsg["seasons"][i] for i in (1, 2)}, "total_seasons": "2"}
+        res, diff = await self.omdb.refresh_series(previous, title="Battlestar Galactica")
+        self.assertEqual(res, bsg)
+        self.assertEqual(sorted(diff["added"]), [3, 4])
+        self.assertEqual(diff["changed"], {})
+
+    async def test_get_episode(self):
+        res = await self.omdb.get_episode(title="Psych", season=3, episode=10)
+        self.assertEqual(res["title"], "Six Feet Under the Sea")
+
+    async def test_no_results(self):
+        with self.assertRaises(OMDBNoResults):
+            await self.omdb.get(title="Random Movie Title")
@@ -0,0 +1,41 @@
+"""
+Unittest class for the benchmark harness
+"""
+
+import unittest
+
+from benchmarks.bench_client import SCENARIO_OPTIONS, SCENARIOS, build_client, percentile, run_scenario
+from benchmarks.server import CassetteServer
+from omdb.exceptions import OMDBNoResults
+
+
+class TestCassetteServer(unittest.TestCase):
+    def test_serves_cassettes(self):
+        with CassetteServer() as server:
+            omdb = build_client(server, max_workers=4)
+            self.assertEqual(omdb.get_movie(title="Apollo 13")["imdb_id"], "tt0112384")
+            self.assertEqual(len(omdb.search_movie("malcolm")["search"]), 88)
+            self.assertRaises(OMDBNoResults, lambda: omdb.get(title="Not Recorded"))
+            self.assertEqual(server.reset_counts()[0], 11)
+            omdb.close()
+
+    def test_run_scenario(self):
+        with CassetteServer() as server:
+            res = run_scenario(server, SCENARIOS["get"], concurrency=2, duration=0.05)
+        self.assertGreater(res["ops"], 0)
+        self.assertGreater(res["requests_per_second"], 0)
+        self.assertLessEqual(res["p50"], res["p99"])
+        self.assertEqual(res["requests"], res["ops"])  # not coalesced
+
+    def test_coalesced_scenario(self):
+        with CassetteServer(latency=0.01) as server:
+            self.assertFalse(build_client(server, max_workers=1).coalesce)
+            name = "get (coalesced)"
+            res = run_scenario(server, SCENARIOS[name], concurrency=4, duration=0.1, **SCENARIO_OPTIONS[name])
+        self.assertLess(res["requests"], res["ops"])
+
+    def test_percentile(self):
+        vals = list(range(1, 101))
+        self.assertEqual(percentile(vals, 50), 50)
+        self.assertEqual(percentile(vals, 99), 99)
+        self.assertEqual(percentile([], 99), 0.0)
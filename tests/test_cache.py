@@ -0,0 +1,209 @@
+"""
+Unittest class for the response caches
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import closing
+
+from omdb import LRUCache, SQLiteCache
+from omdb.cache import cache_key
+from omdb.exceptions import OMDBNoResults
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class CountingOMDB(OMDBOverloaded):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def _get_response(self, kwargs):
+        self.calls += 1
+        return super()._get_response(kwargs)
+
+
+class TestCacheKey(unittest.TestCase):
+    def test_canonical(self):
+        self.assertEqual(
+            cache_key({"apikey": "abc", "t": "Apollo 13", "type": "movie"}),
+            cache_key({"type": "movie", "t": "Apollo 13", "apikey": "xyz"}),
+        )
+        self.assertEqual(cache_key({"s": "a", "page": 2}), cache_key({"s": "a", "page": "2"}))
+        self.assertNotEqual(cache_key({"i": "tt1"}), cache_key({"t": "tt1"}))
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = LRUCache(max_entries=2)
+        cache.set({"i": "tt1"}, {"title": "one"})
+        cache.set({"i": "tt2"}, {"title": "two"})
+        self.assertEqual(cache.get({"i": "tt1"}), {"title": "one"})  # tt1 is now most recent
+        cache.set({"i": "tt3"}, {"title": "three"})
+        self.assertIsNone(cache.get({"i": "tt2"}))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 1))
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=0.01)
+        cache.set({"i": "tt1"}, {"title": "one"})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get({"i": "tt1"}))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_copies(self):
+        cache = LRUCache()
+        val = {"title": "one", "ratings": []}
+        cache.set({"i": "tt1"}, val)
+        val["ratings"].append(1)
+        cache.get({"i": "tt1"})["ratings"].append(2)
+        self.assertEqual(cache.get({"i": "tt1"}), {"title": "one", "ratings": []})
+
+    def test_invalidate(self):
+        cache = LRUCache()
+        cache.set({"i": "tt1", "apikey": "abc"}, {"title": "one"})
+        self.assertTrue(cache.invalidate({"i": "tt1"}))
+        self.assertFalse(cache.invalidate({"i": "tt1"}))
+        self.assertIsNone(cache.get({"i": "tt1"}))
+        cache.set({"i": "tt1"}, {"title": "one"})
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_bad_max_entries(self):
+        self.assertRaises(ValueError, lambda: LRUCache(max_entries=0))
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "omdb.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_persistent(self):
+        cache = SQLiteCache(self.path)
+        cache.set({"i": "tt1", "apikey": "abc"}, {"title": "one", "ratings": [{"source": "x"}]})
+        cache.close()
+
+        other = SQLiteCache(self.path)  # i.e., a new process sharing the same file
+        self.assertEqual(other.get({"i": "tt1"}), {"title": "one", "ratings": [{"source": "x"}]})
+        self.assertIsNone(other.get({"i": "tt2"}))
+        self.assertEqual((other.hits, other.misses), (1, 1))
+        self.assertTrue(other.invalidate({"i": "tt1"}))
+        self.assertEqual(len(other), 0)
+
+    def test_per_entry_ttl(self):
+        cache = SQLiteCache(self.path, ttl=60)
+        cache.set({"i": "tt1"}, {"title": "one"}, ttl=0.01)
+        cache.set({"i": "tt2"}, {"title": "two"})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get({"i": "tt1"}))
+        self.assertEqual(cache.get({"i": "tt2"}), {"title": "two"})
+        self.assertEqual(cache.evictions, 1)
+
+    def test_size_bounded(self):
+        cache = SQLiteCache(self.path, max_entries=5, prune_interval=1)
+        for i in range(10):
+            cache.set({"i": f"tt{i}"}, {"title": str(i)})
+        self.assertEqual(len(cache), 5)
+        self.assertEqual(cache.evictions, 5)
+        self.assertIsNone(cache.get({"i": "tt0"}))
+        self.assertEqual(cache.get({"i": "tt9"}), {"title": "9"})
+
+    def test_threads(self):
+        cache = SQLiteCache(self.path)
+
+        def worker(num):
+            for i in range(20):
+                cache.set({"i": f"tt{num}-{i}"}, {"title": str(i)})
+                cache.get({"i": f"tt{num}-{i}"})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(cache), 80)
+        self.assertEqual(cache.hits, 80)
+
+    def test_reads_touch_occasionally(self):
+        def accessed():
+            with closing(sqlite3.connect(self.path)) as conn:
+                return conn.execute("SELECT accessed FROM omdb_cache").fetchone()[0]
+
+        cache = SQLiteCache(self.path)
+        cache.set({"i": "tt1"}, {"title": "one"})
+        first = accessed()
+        time.sleep(0.01)
+        cache.get({"i": "tt1"})
+        self.assertEqual(accessed(), first)  # within the touch interval; nothing written
+
+        cache = SQLiteCache(self.path, touch_interval=0)
+        cache.get({"i": "tt1"})
+        self.assertGreater(accessed(), first)
+
+    def test_close_every_thread(self):
+        cache = SQLiteCache(self.path)
+        threads = [threading.Thread(target=cache.get, args=({"i": "tt1"},)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        conns = list(cache._conns.values())
+        self.assertGreaterEqual(len(conns), 2)  # those of exited threads are closed as new threads connect
+        cache.close()
+        for conn in conns:
+            self.assertRaises(sqlite3.ProgrammingError, lambda: conn.execute("SELECT 1"))
+        cache.set({"i": "tt1"}, {"title": "one"})  # reconnects
+        self.assertEqual(cache.get({"i": "tt1"}), {"title": "one"})
+
+    def test_omdb_get(self):
+        omdb = CountingOMDB(api_key=API_KEY, cache=SQLiteCache(self.path))
+        first = omdb.get_movie(imdbid="tt0190332")
+        omdb.cache.close()
+
+        omdb = CountingOMDB(api_key=API_KEY, cache=SQLiteCache(self.path))
+        self.assertEqual(omdb.get_movie(imdbid="tt0190332"), first)
+        self.assertEqual(omdb.calls, 0)
+
+
+class TestOMDBCache(unittest.TestCase):
+    def test_get_cached(self):
+        omdb = CountingOMDB(api_key=API_KEY, cache=LRUCache())
+        first = omdb.get_movie(title="Apollo 13")
+        second = omdb.get_movie(title="Apollo 13")
+        self.assertEqual(first, second)
+        self.assertEqual(omdb.calls, 1)
+        self.assertEqual((omdb.cache.hits, omdb.cache.misses), (1, 1))
+
+    def test_search_pages_cached(self):
+        omdb = CountingOMDB(api_key=API_KEY, cache=LRUCache())
+        first = omdb.search_movie("malcolm")
+        second = omdb.search_movie("malcolm")
+        self.assertEqual(len(second["search"]), 88)
+        self.assertEqual(first, second)
+        self.assertEqual(omdb.calls, 9)
+
+    def test_pull_episodes_does_not_pollute(self):
+        omdb = CountingOMDB(api_key=API_KEY, cache=LRUCache())
+        omdb.get_series(title="Battlestar Galactica", pull_episodes=True)
+        bsg = omdb.get_series(title="Battlestar Galactica")
+        self.assertNotIn("seasons", bsg)
+
+    def test_errors_not_cached(self):
+        omdb = CountingOMDB(api_key=API_KEY, strict=False, cache=LRUCache())
+        omdb.get(title="Random Movie Title")
+        omdb.get(title="Random Movie Title")
+        self.assertEqual(omdb.calls, 2)
+        self.assertEqual(len(omdb.cache), 0)
+
+        omdb.strict = True
+        self.assertRaises(OMDBNoResults, lambda: omdb.get(title="Random Movie Title"))
+        self.assertEqual(len(omdb.cache), 0)
+
+    def test_bad_cache(self):
+        self.assertRaises(TypeError, lambda: OMDBOverloaded(api_key=API_KEY, cache={}))
@@ -0,0 +1,118 @@
+"""
+Unittest class for the command line tool
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from omdb.cli import build_parser, format_summary, main, read_keys, request_params, run
+from omdb.metrics import ClientMetrics
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class GetOMDB(OMDBOverloaded):
+    def _build_path(self, kwargs):
+        if kwargs.get("t") == "Random Movie Title":
+            return super()._build_path(kwargs)
+        return f"get/{kwargs.get('t', kwargs.get('i'))}"
+
+
+class SeriesOMDB(FakeOMDB):
+    """every title is a series of four seasons; each request takes 10ms"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, delay=0.01, **kwargs)
+        CLIENTS.append(self)
+
+    def respond(self, kwargs):
+        if "Season" in kwargs:
+            return {"title": kwargs["t"], "season": kwargs["Season"], "episodes": [], "response": "True"}
+        return {"title": kwargs["t"], "type": "series", "total_seasons": "4", "response": "True"}
+
+
+# the clients built by `main`
+CLIENTS = []
+
+
+class TestCLI(unittest.TestCase):
+    def test_read_keys(self):
+        keys = read_keys(io.StringIO("tt0112384\n\n  Apollo 13  \n"))
+        self.assertEqual(list(keys), ["tt0112384", "Apollo 13"])
+
+    def test_request_params(self):
+        args = build_parser().parse_args(["--type", "movie", "--plot", "full", "--year", "1995"])
+        self.assertEqual(request_params(args), {"type": "movie", "plot": "full", "y": "1995"})
+        self.assertEqual(request_params(build_parser().parse_args([])), {})
+
+    def test_run_get(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        metrics = ClientMetrics()
+        omdb.add_hook(metrics)
+        out = io.StringIO()
+        stats = run(omdb, ["tt0190332", "Apollo 13"], out, ordered=True, type="movie")
+        self.assertEqual((stats["keys"], stats["results"], stats["errors"]), (2, 2, 0))
+        self.assertEqual(stats["latency"].count, 2)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["imdb_id"] for line in lines], ["tt0190332", "tt0112384"])
+
+        summary = format_summary(stats, metrics)
+        self.assertIn("2 keys: 2 results, 0 errors", summary)
+        self.assertIn("2 requests", summary)
+
+    def test_run_series(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        out = io.StringIO()
+        stats = run(omdb, ["Battlestar Galactica"], out, mode="series", pull_episodes=True)
+        self.assertEqual(stats["results"], 1)
+        self.assertEqual(sorted(json.loads(out.getvalue())["seasons"]), ["1", "2", "3", "4"])
+
+    def test_run_search(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        out = io.StringIO()
+        stats = run(omdb, ["Band of Brothers"], out, mode="search")
+        self.assertEqual((stats["keys"], stats["results"]), (1, 11))
+        self.assertRaises(ValueError, run, omdb, [], out, mode="episodes")
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "keys.txt")
+            with open(path, "w", encoding="utf-8") as fobj:
+                fobj.write("tt1323594\nRandom Movie Title\n")
+
+            out, err = io.StringIO(), io.StringIO()
+            cache = os.path.join(tmp, "cache.db")
+            with mock.patch("omdb.cli.OMDB", GetOMDB), redirect_stdout(out), redirect_stderr(err):
+                code = main([path, "--api-key", API_KEY, "--cache", cache, "--rate-limit", "100", "--concurrency", "2"])
+
+        self.assertEqual(code, 1)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            sorted(line.get("title", line.get("key")) for line in lines), ["Despicable Me", "Random Movie Title"]
+        )
+        self.assertIn("2 keys: 1 results, 1 errors", err.getvalue())
+        self.assertIn("1 OMDBNoResults", err.getvalue())
+
+    def test_main_concurrency(self):
+        out, keys = io.StringIO(), io.StringIO("A\nB\nC\nD\n")
+        with mock.patch("omdb.cli.OMDB", SeriesOMDB), mock.patch("sys.stdin", keys), redirect_stdout(out):
+            with redirect_stderr(io.StringIO()):
+                code = main(["--api-key", API_KEY, "--mode", "series", "--pull-episodes", "--concurrency", "2"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+        self.assertEqual(CLIENTS[-1].peak, 2)  # the seasons of each series do not fan out
+
+    def test_main_requires_api_key(self):
+        with mock.patch.dict(os.environ, {"OMDB_API_KEY": ""}), redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main, ["-"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unittest class for adaptive concurrency limiting
+"""
+
+import random
+import threading
+import time
+import unittest
+
+import requests
+
+from omdb import OMDB, ConcurrencyLimiter, OMDBException, OMDBLimitReached, OMDBNoResults
+from omdb.concurrency import is_overloaded
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY
+
+
+def cycle(limiter: ConcurrencyLimiter, latency: float = 0.01, overloaded: bool = False):
+    """fill every slot then release them all after the latency"""
+    starts = [limiter.acquire() for _ in range(limiter.limit)]
+    time.sleep(latency)
+    for start in starts:
+        limiter.release(start, overloaded)
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    def test_settings(self):
+        limiter = ConcurrencyLimiter(initial=2, min_limit=1, max_limit=8)
+        self.assertEqual((limiter.limit, limiter.min_limit, limiter.max_limit), (2, 1, 8))
+        self.assertRaises(ValueError, lambda: ConcurrencyLimiter(initial=10, max_limit=8))
+        self.assertRaises(ValueError, lambda: ConcurrencyLimiter(min_limit=0))
+        self.assertRaises(ValueError, lambda: ConcurrencyLimiter(backoff=1.0))
+        self.assertRaises(ValueError, lambda: ConcurrencyLimiter(tolerance=1.0))
+        self.assertRaises(TypeError, lambda: OMDB(api_key=API_KEY, concurrency=4))
+
+    def test_grows_while_healthy(self):
+        limiter = ConcurrencyLimiter(initial=2, max_limit=6)
+        for _ in range(40):
+            cycle(limiter)
+        self.assertEqual(limiter.limit, 6)
+        self.assertEqual(limiter.increases, 4)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertAlmostEqual(limiter.baseline, 0.01, places=2)
+
+    def test_not_grown_when_unused(self):
+        limiter = ConcurrencyLimiter(initial=4)
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+        self.assertEqual(limiter.limit, 4)
+
+    def test_backoff(self):
+        limiter = ConcurrencyLimiter(initial=8)
+        cycle(limiter, overloaded=True)  # reduced once for the requests in flight
+        self.assertEqual(limiter.limit, 4)
+        cycle(limiter, overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+        for _ in range(3):
+            cycle(limiter, overloaded=True)
+        self.assertEqual(
+            limiter.stats(), {"limit": 1, "in_flight": 0, "increases": 0, "decreases": 3, "baseline": None}
+        )
+
+    def test_latency_degradation(self):
+        limiter = ConcurrencyLimiter(initial=8, max_limit=8, window=64)
+        for _ in range(8):
+            cycle(limiter, latency=0.01)
+        self.assertEqual(limiter.limit, 8)
+        cycle(limiter, latency=0.05)  # a few slow responses do not change the median
+        self.assertEqual(limiter.limit, 8)
+        for _ in range(3):
+            cycle(limiter, latency=0.05)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.decreases, 1)
+
+    def test_long_tailed_latency(self):
+        # a healthy OMDB API with a median response time of 150ms and a 99th percentile over 2s
+        rng = random.Random(13)
+        limiter = ConcurrencyLimiter(initial=8)
+        for _ in range(300):
+            starts = [limiter.acquire() for _ in range(limiter.limit)]
+            for start in starts:
+                limiter.release(start - rng.lognormvariate(-1.9, 1.1))
+        self.assertEqual(limiter.decreases, 0)
+        self.assertGreater(limiter.limit, 8)
+        self.assertAlmostEqual(limiter.baseline, 0.15, delta=0.03)
+
+    def test_blocks_at_limit(self):
+        limiter = ConcurrencyLimiter(initial=1, max_limit=1)
+        start = limiter.acquire()
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()), daemon=True)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(start)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_is_overloaded(self):
+        self.assertTrue(is_overloaded(OMDBException("An unknown exception was returned: Error getting data.")))
+        self.assertTrue(is_overloaded(OMDBLimitReached(API_KEY)))
+        self.assertTrue(is_overloaded(requests.ConnectionError()))
+        self.assertTrue(is_overloaded("Request limit reached!"))
+        self.assertFalse(is_overloaded(OMDBNoResults("Movie not found!", {})))
+        self.assertFalse(is_overloaded(ValueError("Error getting data.")))
+        self.assertFalse(is_overloaded(None))
+
+
+class TestOMDBConcurrency(unittest.TestCase):
+    IDS = [f"tt{i:07d}" for i in range(60)]
+
+    def build(self, **kwargs) -> FakeOMDB:
+        """a client whose requests take 10ms"""
+        results = [{"title": key, "imdb_id": key} for key in self.IDS]
+        return FakeOMDB(api_key=API_KEY, results=results, delay=0.01, **kwargs)
+
+    def test_get_many(self):
+        omdb = self.build(concurrency=ConcurrencyLimiter(initial=2, max_limit=8, tolerance=10))
+        self.assertIsInstance(omdb.concurrency, ConcurrencyLimiter)
+        res = omdb.get_many(self.IDS)
+        self.assertEqual(list(res), self.IDS)
+        self.assertGreater(omdb.concurrency.limit, 2)
+        self.assertGreater(omdb.peak, 2)
+        self.assertLessEqual(omdb.peak, 8)
+        self.assertEqual(omdb.concurrency.in_flight, 0)
+        omdb.close()
+
+    def test_backs_off(self):
+        limiter = ConcurrencyLimiter(initial=8, max_limit=8)
+        errors = dict.fromkeys(self.IDS, "Error getting data.")
+        omdb = self.build(concurrency=limiter, strict=False, errors=errors)
+        res = omdb.get_many(self.IDS[:20])
+        self.assertTrue(all(itm["error"] == "Error getting data." for itm in res.values()))
+        self.assertLess(limiter.limit, 8)
+        self.assertGreater(limiter.decreases, 0)
+        omdb.close()
+
+        limiter = ConcurrencyLimiter(initial=8, max_limit=8)
+        omdb = self.build(concurrency=limiter, errors=errors)
+        self.assertRaises(OMDBException, lambda: omdb.get(imdbid="tt0000001"))
+        self.assertEqual(limiter.limit, 4)
+        omdb.close()
+
+    def test_disabled(self):
+        omdb = self.build(concurrency=ConcurrencyLimiter())
+        omdb.concurrency = None
+        self.assertIsNone(omdb.concurrency)
+        omdb.get_many(self.IDS[:8])
+        self.assertLessEqual(omdb.peak, omdb.max_workers)
+        omdb.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Unittest class for connection pooling and sharing a client between threads
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from omdb.exceptions import OMDBException
+from tests.helpers import LocalServerTestCase
+
+
+class TestConnectionPool(LocalServerTestCase):
+    def test_shared_between_threads(self):
+        omdb = self.build(pool_maxsize=4, pool_block=True)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            res = list(pool.map(lambda _: omdb.get(imdbid="tt0112384"), range(200)))
+        self.assertTrue(all(r["imdb_id"] == "tt0112384" for r in res))
+        # connections are re-used across threads rather than one (or more) per thread
+        self.assertLessEqual(len(self.server.clients), 4)
+        omdb.close()
+
+    def test_session_per_thread(self):
+        omdb = self.build()
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(omdb._get_session())) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sessions.append(omdb._get_session())
+        self.assertIs(sessions[-1], omdb._session)
+        self.assertEqual(len({id(s) for s in sessions}), 4)
+        self.assertEqual(len({id(s.get_adapter("https://www.omdbapi.com/")) for s in sessions}), 1)
+
+    def test_pool_settings(self):
+        omdb = self.build(max_workers=32, max_retries=3)
+        self.assertEqual(omdb._adapter._pool_maxsize, 32)
+        self.assertEqual(omdb._adapter.max_retries.total, 3)
+        self.assertEqual(self.build()._adapter._pool_maxsize, 10)
+
+    def test_closed(self):
+        omdb = self.build()
+        omdb.close()
+        self.assertRaises(OMDBException, lambda: omdb.get(imdbid="tt0112384"))
@@ -0,0 +1,162 @@
+"""
+Unittest class for the checkpointed crawler
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from omdb.crawler import Crawler, read_checkpoint, shard_of
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+# the keys that fail and how
+ERRORS = {
+    "Random Movie Title": "Movie not found!",
+    "Flaky Title": "Error getting data.",
+    "Limit Title": "Request limit reached!",
+}
+# the request limit has reset
+RESET_ERRORS = {key: err for key, err in ERRORS.items() if key != "Limit Title"}
+
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.keys_path = os.path.join(self.tmp.name, "keys.txt")
+        self.output_dir = os.path.join(self.tmp.name, "out")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_keys(self, keys):
+        with open(self.keys_path, "w", encoding="utf-8") as fobj:
+            fobj.write("\n".join(keys) + "\n")
+        self.results = [{"title": key, "imdb_id": key} for key in keys if key]
+
+    def crawler(self, shards=1, strict=True, **kwargs):
+        client_kwargs = {"api_key": API_KEY, "max_workers": 1, "strict": strict}
+        client_kwargs.update(results=self.results, errors=ERRORS)
+        return Crawler(
+            self.keys_path,
+            self.output_dir,
+            shards=shards,
+            client_factory=FakeOMDB,
+            client_kwargs=client_kwargs,
+            **kwargs,
+        )
+
+    def test_shard_of(self):
+        self.assertEqual(shard_of("tt0112384", 8), shard_of("tt0112384", 8))
+        shards = {shard_of(f"tt{i:07d}", 4) for i in range(100)}
+        self.assertEqual(shards, {0, 1, 2, 3})
+
+    def test_run_shard(self):
+        self.write_keys(["tt0000001", "tt0000002", "", "Random Movie Title", "Flaky Title", "tt0000001"])
+        crawler = self.crawler(request_kwargs={"type": "movie"})
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["written"], stats["errors"], stats["failed"], stats["paused"]), (2, 1, 1, False))
+
+        records = list(crawler.iter_results())
+        self.assertEqual([r["key"] for r in records], ["tt0000001", "tt0000002", "Random Movie Title"])
+        self.assertEqual(records[0]["result"], {"title": "tt0000001", "imdb_id": "tt0000001", "response": "True"})
+        self.assertIn("error", records[2])
+
+        # resume; only the transient failure is retried
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["skipped"], stats["written"], stats["failed"]), (4, 0, 1))
+        self.assertEqual(len(list(crawler.iter_results())), 3)
+
+    def test_pause_on_limit_reached(self):
+        self.write_keys(["tt0000001", "Limit Title", "tt0000002"])
+        crawler = self.crawler()
+        stop = threading.Event()
+        stats = crawler.run_shard(0, stop)
+        self.assertTrue(stats["paused"])
+        self.assertTrue(stop.is_set())
+        self.assertEqual([r["key"] for r in crawler.iter_results()], ["tt0000001"])
+
+        crawler._client_kwargs["errors"] = RESET_ERRORS
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["skipped"], stats["written"], stats["paused"]), (1, 2, False))
+        self.assertEqual([r["key"] for r in crawler.iter_results()], ["tt0000001", "Limit Title", "tt0000002"])
+
+    def test_non_strict_client(self):
+        self.write_keys(["tt0000001", "Flaky Title", "Limit Title", "tt0000002"])
+        crawler = self.crawler(strict=False)
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["written"], stats["failed"], stats["paused"]), (1, 1, True))
+        self.assertEqual([r["key"] for r in crawler.iter_results()], ["tt0000001"])
+
+        crawler._client_kwargs["errors"] = RESET_ERRORS
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["skipped"], stats["written"], stats["failed"], stats["paused"]), (1, 2, 1, False))
+        self.assertEqual([r["key"] for r in crawler.iter_results()], ["tt0000001", "Limit Title", "tt0000002"])
+
+    def test_stopped_by_another_shard(self):
+        self.write_keys(["tt0000001"])
+        stop = threading.Event()
+        stop.set()
+        stats = self.crawler().run_shard(0, stop)
+        self.assertEqual((stats["written"], stats["paused"]), (0, True))
+
+    def test_partial_line_truncated(self):
+        self.write_keys(["tt0000001", "tt0000002"])
+        crawler = self.crawler()
+        crawler.run_shard(0)
+        path = crawler.shard_path(0)
+        with open(path, "rb") as fobj:
+            lines = fobj.read().splitlines(keepends=True)
+        with open(path, "wb") as fobj:
+            fobj.write(lines[0] + lines[1][:10])  # crashed while writing the second result
+
+        self.assertEqual(read_checkpoint(path), {"tt0000001"})
+        with open(path, "rb") as fobj:
+            self.assertEqual(fobj.read(), lines[0])
+
+        stats = crawler.run_shard(0)
+        self.assertEqual((stats["skipped"], stats["written"]), (1, 1))
+        self.assertEqual([r["key"] for r in crawler.iter_results()], ["tt0000001", "tt0000002"])
+
+    def test_run_processes(self):
+        keys = [f"tt{i:07d}" for i in range(50)]
+        self.write_keys(keys)
+        crawler = self.crawler(shards=3)
+        stats = crawler.run()
+        self.assertEqual([s["shard"] for s in stats], [0, 1, 2])
+        self.assertEqual(sum(s["written"] for s in stats), 50)
+        self.assertEqual(sorted(r["key"] for r in crawler.iter_results()), keys)
+        for shard in range(3):
+            with open(crawler.shard_path(shard), encoding="utf-8") as fobj:
+                self.assertTrue(all(shard_of(json.loads(line)["key"], 3) == shard for line in fobj))
+
+        stats = crawler.run(processes=2)
+        self.assertEqual(sum(s["skipped"] for s in stats), 50)
+        self.assertEqual(sum(s["written"] for s in stats), 0)
+
+    def test_omdb_client(self):
+        self.write_keys(["tt0190332", "Apollo 13"])
+        crawler = Crawler(
+            self.keys_path,
+            self.output_dir,
+            shards=1,
+            client_factory=OMDBOverloaded,
+            client_kwargs={"api_key": API_KEY, "max_workers": 2},
+            request_kwargs={"type": "movie"},
+        )
+        stats = crawler.run_shard(0)
+        self.assertEqual(stats["written"], 2)
+        ids = sorted(r["result"]["imdb_id"] for r in crawler.iter_results())
+        self.assertEqual(ids, ["tt0112384", "tt0190332"])
+
+    def test_shards_must_not_change(self):
+        self.write_keys(["tt0000001"])
+        self.crawler(shards=2).run_shard(0)
+        self.assertRaises(ValueError, self.crawler, shards=3)
+        self.assertRaises(ValueError, self.crawler, shards=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
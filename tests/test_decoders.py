@@ -0,0 +1,101 @@
+"""
+Unittest class for the response body decoders
+"""
+
+import json
+import unittest
+
+import requests
+
+from benchmarks.cassettes import load_bodies
+from benchmarks.server import LocalServer
+from omdb.concurrency import is_overloaded
+from omdb.decoders import JSONDecoder, OrjsonDecoder, default_decoder
+from omdb.utilities import format_keys, format_pairs
+from tests.helpers import LocalServerTestCase
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class CountingDecoder(JSONDecoder):
+    __slots__ = ["calls"]
+
+    def __init__(self):
+        super().__init__(format_keys=True)
+        self.calls = 0
+
+    def decode(self, content):
+        self.calls += 1
+        return super().decode(content)
+
+
+class UnavailableServer(LocalServer):
+    """respond with an HTML error page"""
+
+    def respond(self, handler):
+        return 503, {"Content-Type": "text/html"}, b"<html><body>503 Service Unavailable</body></html>"
+
+
+class TestDecoders(unittest.TestCase):
+    def test_decoders_match_format_keys(self):
+        bodies = [json.dumps(body).encode("utf-8") for body in load_bodies()]
+        expected = [format_keys(json.loads(body)) for body in bodies]
+
+        self.assertEqual([JSONDecoder(format_keys=True).decode(body) for body in bodies], expected)
+        self.assertEqual([format_keys(JSONDecoder().decode(body)) for body in bodies], expected)
+        self.assertEqual([format_keys(OrjsonDecoder().decode(body)) for body in bodies], expected)
+
+    def test_format_pairs(self):
+        body = '{"Title": "Band of Brothers", "Year": "2001–", "Ratings": [{"Value": "9.4/10"}], "imdbID": "tt0185906"}'
+        res = JSONDecoder(format_keys=True).decode(body.encode("utf-8"))
+        self.assertEqual(list(res), ["ratings", "title", "year", "imdb_id"])
+        self.assertEqual(res["year"], "2001-")
+        self.assertEqual(res["ratings"], [{"value": "9.4/10"}])
+
+        # duplicate keys; the last wins
+        self.assertEqual(format_pairs([("Title", "a"), ("Year", "~"), ("Title", "b")]), {"title": "b", "year": "-"})
+
+    def test_formats_keys(self):
+        self.assertFalse(JSONDecoder().formats_keys)
+        self.assertTrue(JSONDecoder(format_keys=True).formats_keys)
+        self.assertFalse(OrjsonDecoder().formats_keys)
+        self.assertIsInstance(default_decoder(), OrjsonDecoder)
+
+
+class TestOMDBDecoder(unittest.TestCase):
+    def test_custom_decoder(self):
+        decoder = CountingDecoder()
+        omdb = OMDBOverloaded(api_key=API_KEY, decoder=decoder)
+        self.assertIs(omdb.decoder, decoder)
+        res = omdb.get_movie(title="Apollo 13")
+        self.assertEqual(decoder.calls, 1)
+        self.assertEqual(res, OMDBOverloaded(api_key=API_KEY, decoder=JSONDecoder()).get_movie(title="Apollo 13"))
+
+    def test_decoder_property(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertIsInstance(omdb.decoder, JSONDecoder)
+        omdb.decoder = JSONDecoder()
+        self.assertFalse(omdb.decoder.formats_keys)
+        omdb.decoder = None
+        self.assertIsInstance(omdb.decoder, OrjsonDecoder)
+
+        def bad_decoder():
+            omdb.decoder = json.loads
+
+        self.assertRaises(TypeError, bad_decoder)
+
+
+class TestInvalidBody(LocalServerTestCase):
+    server_class = UnavailableServer
+
+    def test_not_json(self):
+        for decoder in (JSONDecoder(), JSONDecoder(format_keys=True), OrjsonDecoder()):
+            omdb = self.build(decoder=decoder, max_retries=0)
+            with self.assertRaises(requests.exceptions.JSONDecodeError) as ctx:
+                omdb.get(imdbid="tt0112384")
+            self.assertTrue(is_overloaded(ctx.exception))
+            self.assertIn("503 Service Unavailable", ctx.exception.doc)
+            omdb.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
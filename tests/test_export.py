@@ -0,0 +1,126 @@
+"""
+Unittest class for the streaming exports
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from omdb.exceptions import OMDBNoResults
+from omdb.export import CSV_COLUMNS, CSVWriter, JSONLinesWriter, export_many, export_search, flatten_result
+from omdb.models import Movie
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+APOLLO = {
+    "title": "Apollo 13",
+    "imdb_id": "tt0112384",
+    "ratings": [
+        {"source": "Internet Movie Database", "value": "7.7/10"},
+        {"source": "Rotten Tomatoes", "value": "96%"},
+        {"source": "Some Other Site", "value": "5/5"},
+    ],
+}
+
+
+class TestWriters(unittest.TestCase):
+    def test_flatten_result(self):
+        res = flatten_result(APOLLO)
+        self.assertNotIn("ratings", res)
+        self.assertEqual(res["rating_imdb"], "7.7/10")
+        self.assertEqual(res["rating_rotten_tomatoes"], "96%")
+        self.assertEqual(res["rating_some_other_site"], "5/5")
+        self.assertIn("ratings", APOLLO)  # not modified
+
+    def test_jsonl_writer(self):
+        out = io.StringIO()
+        with JSONLinesWriter(out) as writer:
+            writer.write(APOLLO, "Apollo 13")
+            writer.write(Movie.from_dict(APOLLO))
+            writer.write(OMDBNoResults("Movie not found!", {}), "Random Movie Title")
+        self.assertEqual((writer.written, writer.errors), (2, 1))
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(lines[:2], [APOLLO, APOLLO])
+        self.assertEqual(lines[2]["key"], "Random Movie Title")
+        self.assertIn("Movie not found!", lines[2]["error"])
+
+    def test_csv_writer(self):
+        out = io.StringIO()
+        with CSVWriter(out) as writer:
+            writer.write(APOLLO, "tt0112384")
+            writer.write({"title": "Band of Brothers", "total_seasons": "1"})
+            writer.write(ValueError("bad"), "key")
+        self.assertEqual(writer.columns, CSV_COLUMNS)
+
+        out.seek(0)
+        rows = list(csv.reader(out))
+        self.assertEqual(rows[0], list(CSV_COLUMNS))
+        self.assertTrue(all(len(row) == len(CSV_COLUMNS) for row in rows))
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual((row["key"], row["title"], row["rating_imdb"]), ("tt0112384", "Apollo 13", "7.7/10"))
+        self.assertEqual(dict(zip(rows[0], rows[2]))["total_seasons"], "1")
+        self.assertEqual(dict(zip(rows[0], rows[3]))["error"], "bad")
+
+    def test_write_to_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.jsonl")
+            with JSONLinesWriter(path, buffer_size=1024) as writer:
+                writer.write(APOLLO)
+            with open(path, encoding="utf-8") as fobj:
+                self.assertEqual(json.loads(fobj.read()), APOLLO)
+
+
+class TestExport(unittest.TestCase):
+    def test_export_many(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        out = io.StringIO()
+        keys = iter(["tt0190332", "Apollo 13", "tt0190332"])
+        stats = export_many(omdb, keys, out, ordered=True, type="movie")
+        self.assertEqual(stats, {"written": 2, "errors": 0})
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["imdb_id"] for line in lines], ["tt0190332", "tt0112384"])
+        self.assertEqual(lines[1], omdb.get_movie(title="Apollo 13"))
+
+    def test_export_many_errors(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        out = io.StringIO()
+        stats = export_many(omdb, ["Random Movie Title"], out)
+        self.assertEqual(stats, {"written": 0, "errors": 1})
+        self.assertEqual(json.loads(out.getvalue())["key"], "Random Movie Title")
+
+    def test_non_strict_errors(self):
+        omdb = FakeOMDB(api_key=API_KEY, strict=False, results=[APOLLO])
+        out = io.StringIO()
+        stats = export_many(omdb, ["Apollo 13", "Random Movie Title"], out)
+        self.assertEqual(stats, {"written": 1, "errors": 1})
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(lines[1]["key"], "Random Movie Title")
+        self.assertIn("Movie not found!", lines[1]["error"])
+
+    def test_export_many_csv(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        out = io.StringIO()
+        columns = ["key", "title", "rating_imdb"]
+        stats = export_many(omdb, ["Apollo 13"], out, fmt="csv", writer_kwargs={"columns": columns}, type="movie")
+        self.assertEqual(stats, {"written": 1, "errors": 0})
+        self.assertEqual(out.getvalue().splitlines(), ["key,title,rating_imdb", "Apollo 13,Apollo 13,7.7/10"])
+
+    def test_export_search(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, models=True)
+        out = io.StringIO()
+        stats = export_search(omdb, "Band of Brothers", out, max_results=3)
+        self.assertEqual(stats, {"written": 3, "errors": 0})
+        self.assertEqual(json.loads(out.getvalue().splitlines()[0])["title"], "Band of Brothers")
+
+    def test_unknown_format(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertRaises(ValueError, export_many, omdb, [], io.StringIO(), fmt="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
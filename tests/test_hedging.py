@@ -0,0 +1,185 @@
+"""
+Unittest class for hedging slow requests
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from benchmarks.server import LocalServer, Response
+from omdb import OMDB, HedgePolicy, RateLimiter
+from tests.helpers import LocalServerTestCase
+from tests.test_omdb import API_KEY
+
+
+class SlowFirstServer(LocalServer):
+    """the first request is slow, the remaining respond immediately"""
+
+    def __init__(self, port: int = 0):
+        super().__init__(port)
+        self.requests = 0
+
+    def respond(self, handler) -> Response:
+        with self.lock:
+            self.requests += 1
+            slow = self.requests == 1
+        if slow:
+            time.sleep(1.0)
+        return super().respond(handler)
+
+
+def seeded(**kwargs) -> HedgePolicy:
+    """a policy with enough response times observed to hedge"""
+    policy = HedgePolicy(**kwargs)
+    for _ in range(20):
+        policy.observe(0.01)
+    return policy
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_settings(self):
+        self.assertRaises(ValueError, lambda: HedgePolicy(quantile=1.5))
+        self.assertRaises(ValueError, lambda: HedgePolicy(max_ratio=0))
+        self.assertRaises(ValueError, lambda: HedgePolicy(min_delay=3, max_delay=2))
+        self.assertRaises(TypeError, lambda: OMDB(api_key=API_KEY, hedge=0.95))
+
+    def test_delay(self):
+        policy = HedgePolicy(quantile=0.5, min_delay=0.1, max_delay=1.0, min_samples=4)
+        for latency in (0.2, 0.3, 0.4):
+            policy.observe(latency)
+        self.assertIsNone(policy.delay)
+        policy.observe(0.5)
+        self.assertEqual(policy.delay, 0.4)
+
+        policy = HedgePolicy(min_delay=0.1, max_delay=1.0, min_samples=1)
+        policy.observe(5.0)
+        self.assertEqual(policy.delay, 1.0)
+        policy = HedgePolicy(min_delay=0.1, max_delay=1.0, min_samples=1)
+        policy.observe(0.001)
+        self.assertEqual(policy.delay, 0.1)
+
+    def test_not_hedged_until_observed(self):
+        policy = HedgePolicy()
+        self.assertEqual(policy.run(lambda: "done"), "done")
+        self.assertEqual(policy.stats()["hedged"], 0)
+        policy.close()
+
+    def test_hedge_wins(self):
+        release = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                release.wait(5)
+                return "primary"
+            return "backup"
+
+        policy = seeded()
+        self.assertEqual(policy.run(send), "backup")
+        release.set()
+        policy.close()
+        self.assertEqual(policy.stats()["hedged"], 1)
+        self.assertEqual((policy.wins, policy.win_ratio), (1, 1.0))
+
+    def test_failures(self):
+        def send():
+            raise ValueError("no response")
+
+        policy = seeded()
+        self.assertRaises(ValueError, lambda: policy.run(send))
+
+        release = threading.Event()
+        calls = []
+
+        def fail_fast():
+            calls.append(None)
+            if len(calls) == 1:
+                release.wait(5)
+                return "primary"
+            raise ValueError("no response")
+
+        # a failed hedge falls back to the original request
+        self.assertEqual(policy.run(fail_fast, admit=lambda: release.set() or True), "primary")
+        policy.close()
+        self.assertEqual(policy.wins, 0)
+
+    def test_not_capped_by_threads(self):
+        lock = threading.Lock()
+        counts = {"active": 0, "peak": 0}
+
+        def send():
+            with lock:
+                counts["active"] += 1
+                counts["peak"] = max(counts["peak"], counts["active"])
+            time.sleep(0.1)
+            with lock:
+                counts["active"] -= 1
+            return "done"
+
+        for policy in (HedgePolicy(max_threads=2), seeded(max_threads=2)):
+            counts["peak"] = 0
+            threads = [threading.Thread(target=policy.run, args=(send, lambda: False)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            policy.close()
+            self.assertEqual(counts["peak"], 8)
+
+    def test_latency_from_send(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.0)
+        policy.run(lambda: time.sleep(0.01))
+        self.assertLess(policy.delay, 0.05)
+
+    def test_capped(self):
+        release = threading.Event()
+
+        def send():
+            release.wait(0.2)
+            return "done"
+
+        policy = seeded(max_ratio=0.5)
+        self.assertEqual(policy.run(send, admit=lambda: False), "done")
+        self.assertEqual((policy.hedged, policy.capped), (0, 1))
+
+        policy.run(send)  # one of two requests may be hedged
+        release.set()
+        policy.run(send)
+        self.assertEqual((policy.requests, policy.hedged, policy.capped), (3, 1, 1))
+        policy.close()
+
+
+class TestOMDBHedging(LocalServerTestCase):
+    server_class = SlowFirstServer
+
+    def test_slow_request_hedged(self):
+        omdb = self.build(hedge=seeded())
+        start = time.perf_counter()
+        self.assertEqual(omdb.get(imdbid="tt0112384")["title"], "Apollo 13")
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual((omdb.hedge.hedged, omdb.hedge.wins), (1, 1))
+        omdb.close()
+        self.assertEqual(self.server.requests, 2)
+
+    def test_sessions_reused(self):
+        omdb = self.build(hedge=seeded(max_delay=1.0, min_delay=1.0))
+        omdb.get(imdbid="tt0112384")  # builds the session of the sending thread
+        with mock.patch.object(OMDB, "_new_session", autospec=True, side_effect=OMDB._new_session) as new_session:
+            for _ in range(20):
+                omdb.get(imdbid="tt0112384")
+        omdb.close()
+        self.assertEqual(new_session.call_count, 0)  # sent by the thread of the first request
+        self.assertEqual(omdb.hedge.requests, 21)
+
+    def test_rate_limited(self):
+        omdb = self.build(hedge=seeded(), rate_limiter=RateLimiter(per_second=0.01, burst=1))
+        self.assertEqual(omdb.get(imdbid="tt0112384")["title"], "Apollo 13")
+        self.assertEqual((omdb.hedge.hedged, omdb.hedge.capped), (0, 1))
+        omdb.close()
+        self.assertEqual(self.server.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Unittest class for HTTP caching header support and revalidation of cached results
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+
+from benchmarks.server import LocalServer
+from omdb.cache import LRUCache, SQLiteCache, cache_key
+from omdb.http_cache import (
+    Revalidation,
+    cache_control,
+    freshness_lifetime,
+    is_cacheable,
+    response_validators,
+)
+from omdb.metrics import ClientMetrics
+from tests.helpers import LocalServerTestCase
+
+ETAG = '"apollo-13-v1"'
+
+
+class CachingServer(LocalServer):
+    """respond with the `cache_control` header and an ETag; not modified when the ETag matches"""
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {200: 0, 304: 0}
+        self.cache_control = "public, max-age=60"
+
+    def respond(self, handler):
+        headers = {"ETag": ETAG, "Cache-Control": self.cache_control}
+        if handler.headers.get("If-None-Match") == ETAG:
+            self.counts[304] += 1
+            return 304, headers, b""
+        self.counts[200] += 1
+        status, default_headers, body = super().respond(handler)
+        return status, {**default_headers, **headers}, body
+
+
+class TestHeaders(unittest.TestCase):
+    def test_cache_control(self):
+        res = cache_control({"Cache-Control": 'public, Max-Age=60, no-cache="Set-Cookie"'})
+        self.assertEqual(res, {"public": None, "max-age": "60", "no-cache": "Set-Cookie"})
+        self.assertEqual(cache_control({}), {})
+
+    def test_is_cacheable(self):
+        self.assertTrue(is_cacheable({"Cache-Control": "public, max-age=60"}))
+        self.assertTrue(is_cacheable({}))
+        self.assertFalse(is_cacheable({"Cache-Control": "no-store"}))
+        self.assertFalse(is_cacheable({"Cache-Control": "private, max-age=60"}))
+
+    def test_freshness_lifetime(self):
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=60"}), 60.0)
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=60, s-maxage=120"}), 120.0)
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=60", "Age": "15"}), 45.0)
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=60", "Age": "90"}), 0.0)
+        self.assertEqual(freshness_lifetime({"Cache-Control": "no-cache, max-age=60"}), 0.0)
+        self.assertIsNone(freshness_lifetime({}))
+
+    def test_freshness_lifetime_expires(self):
+        now = time.time()
+        headers = {"Date": formatdate(now, usegmt=True), "Expires": formatdate(now + 300, usegmt=True)}
+        self.assertAlmostEqual(freshness_lifetime(headers), 300.0, delta=1)
+        self.assertAlmostEqual(freshness_lifetime({"Expires": formatdate(now + 300, usegmt=True)}, now), 300, delta=1)
+        self.assertEqual(freshness_lifetime({"Expires": "0"}), 0.0)
+        # max-age takes precedence over expires
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=5", **headers}), 5.0)
+
+    def test_validators(self):
+        self.assertEqual(
+            response_validators({"ETag": ETAG, "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+            {"etag": ETAG, "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+        self.assertIsNone(response_validators({}))
+
+    def test_revalidation(self):
+        rev = Revalidation({"etag": ETAG, "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(
+            rev.request_headers(),
+            {"If-None-Match": ETAG, "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+        self.assertFalse(rev.not_modified)
+        rev.record(304, {})
+        self.assertTrue(rev.not_modified)
+
+        rev = Revalidation()
+        self.assertEqual(rev.request_headers(), {})
+        rev.record(304, {})
+        self.assertFalse(rev.not_modified)  # nothing cached to use
+
+
+class TestCacheEntries(unittest.TestCase):
+    def check_entries(self, cache):
+        params = {"i": "tt0112384"}
+        cache.set(params, {"title": "Apollo 13"}, ttl=0, validators={"etag": ETAG})
+        self.assertIsNone(cache.get(params))  # expired results are not served
+        entry = cache.get_entry(params)
+        self.assertFalse(entry.fresh)
+        self.assertEqual(entry.value, {"title": "Apollo 13"})
+        self.assertEqual(entry.validators, {"etag": ETAG})
+
+        self.assertTrue(cache.refresh(params, 60))
+        self.assertEqual(cache.get(params), {"title": "Apollo 13"})
+        entry = cache.get_entry(params)
+        self.assertTrue(entry.fresh)
+        self.assertEqual(entry.validators, {"etag": ETAG})  # kept when not provided
+        self.assertFalse(cache.refresh({"i": "tt0000000"}, 60))
+
+        # expired results without validators cannot be revalidated
+        cache.set({"i": "tt0190332"}, {"title": "Crouching Tiger, Hidden Dragon"}, ttl=0)
+        self.assertIsNone(cache.get_entry({"i": "tt0190332"}))
+
+    def test_lru_cache(self):
+        self.check_entries(LRUCache())
+
+    def test_sqlite_cache(self):
+        cache = SQLiteCache(":memory:")
+        self.check_entries(cache)
+        cache.close()
+
+    def test_sqlite_migration(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            conn = sqlite3.connect(path)
+            conn.execute(  # the schema before validators were stored
+                "CREATE TABLE omdb_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            row = (cache_key({"i": "tt0112384"}), '{"title": "Apollo 13"}', 0.0, time.time())
+            conn.execute("INSERT INTO omdb_cache VALUES (?, ?, ?, ?)", row)
+            conn.commit()
+            conn.close()
+
+            cache = SQLiteCache(path)
+            self.assertEqual(cache.get({"i": "tt0112384"}), {"title": "Apollo 13"})
+            self.assertIsNone(cache.get_entry({"i": "tt0112384"}).validators)
+            self.check_entries(cache)
+            cache.close()
+
+
+class TestRevalidation(LocalServerTestCase):
+    server_class = CachingServer
+
+    def test_fresh(self):
+        cache = LRUCache(ttl=0)  # the headers, not the cache default, set the lifetime
+        events = []
+        omdb = self.build(cache=cache, revalidate=True, hooks=[events.append])
+        self.assertTrue(omdb.revalidate)
+        for _ in range(3):
+            self.assertEqual(omdb.get(imdbid="tt0112384")["title"], "Apollo 13")
+        self.assertEqual(self.server.counts, {200: 1, 304: 0})
+        self.assertEqual([e.cache for e in events], ["miss", "hit", "hit"])
+        self.assertEqual(cache.get_entry(events[0].params).validators, {"etag": ETAG})
+        omdb.close()
+
+    def test_stale_not_modified(self):
+        self.server.cache_control = "no-cache"
+        cache = SQLiteCache(":memory:")
+        metrics = ClientMetrics()
+        omdb = self.build(cache=cache, revalidate=True, hooks=[metrics])
+        for _ in range(3):
+            self.assertEqual(omdb.get(imdbid="tt0112384")["title"], "Apollo 13")
+        self.assertEqual(self.server.counts, {200: 1, 304: 2})
+        self.assertEqual(metrics.snapshot()["cache"].get("revalidated"), 2)
+
+        # once the headers permit, the revalidated result is served from the cache
+        self.server.cache_control = "max-age=60"
+        omdb.get(imdbid="tt0112384")
+        omdb.get(imdbid="tt0112384")
+        self.assertEqual(self.server.counts, {200: 1, 304: 3})
+        omdb.close()
+        cache.close()
+
+    def test_no_store(self):
+        self.server.cache_control = "no-store"
+        cache = LRUCache()
+        omdb = self.build(cache=cache, revalidate=True)
+        omdb.get(imdbid="tt0112384")
+        omdb.get(imdbid="tt0112384")
+        self.assertEqual(self.server.counts, {200: 2, 304: 0})
+        self.assertEqual(len(cache), 0)
+        omdb.close()
+
+    def test_disabled(self):
+        self.server.cache_control = "no-store"
+        cache = LRUCache()
+        omdb = self.build(cache=cache)
+        self.assertFalse(omdb.revalidate)
+        omdb.get(imdbid="tt0112384")
+        omdb.get(imdbid="tt0112384")
+        self.assertEqual(self.server.counts, {200: 1, 304: 0})
+        omdb.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unittest class for the local title index
+"""
+
+import unittest
+
+from omdb import Movie, SearchItem, TitleIndex
+from omdb.exceptions import OMDBException
+from omdb.index import index_results, trigrams, year_range
+from omdb.utilities import normalize_title
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+TITLES = [
+    {"title": "Apollo 13", "year": "1995", "imdb_id": "tt0112384", "type": "movie", "poster": "N/A"},
+    {"title": "Apollo 18", "year": "2011", "imdb_id": "tt1772240", "type": "movie", "poster": "N/A"},
+    {"title": "Spider-Man: Far from Home", "year": "2019", "imdb_id": "tt6320628", "type": "movie"},
+    {"title": "Spider-Man", "year": "2002", "imdb_id": "tt0145487", "type": "movie"},
+    {"title": "Battlestar Galactica", "year": "2004–2009", "imdb_id": "tt0407362", "type": "series"},
+    {"title": "Battlestar Galactica", "year": "1978", "imdb_id": "tt0076984", "type": "movie"},
+    {"title": "Amélie", "year": "2001", "imdb_id": "tt0211915", "type": "movie"},
+    {"title": "The Simpsons", "year": "1989–", "imdb_id": "tt0096697", "type": "series"},
+]
+
+
+class TestTitleIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TitleIndex()
+        self.assertEqual(index_results(self.index, [{"search": TITLES}]), len(TITLES))
+
+    def ids(self, res):
+        return [itm["imdb_id"] for itm in res]
+
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title("Spider‐Man:  Far From Home"), "spider man far from home")
+        self.assertEqual(normalize_title("Schindler's List"), "schindlers list")
+        self.assertEqual(normalize_title("Amélie"), "amelie")
+        self.assertEqual(normalize_title("  "), "")
+
+    def test_helpers(self):
+        self.assertIn("  a", trigrams("ab"))
+        self.assertEqual(year_range("1995"), (1995, 1995))
+        self.assertEqual(year_range("2004-2009"), (2004, 2009))
+        self.assertEqual(year_range("1989-"), (1989, float("inf")))
+        self.assertIsNone(year_range("N/A"))
+
+    def test_lookup(self):
+        self.assertEqual(self.ids(self.index.lookup("battlestar galactica")), ["tt0076984", "tt0407362"])
+        self.assertEqual(self.ids(self.index.lookup("Battlestar Galactica", type="series")), ["tt0407362"])
+        self.assertEqual(self.ids(self.index.lookup("SPIDER-MAN")), ["tt0145487"])
+        self.assertEqual(self.index.lookup("Spider"), [])
+        self.assertEqual(self.ids(self.index.lookup("amelie")), ["tt0211915"])
+
+    def test_search_prefix(self):
+        self.assertEqual(self.ids(self.index.search("apol")), ["tt0112384", "tt1772240"])
+        self.assertEqual(self.ids(self.index.search("apollo 1")), ["tt0112384", "tt1772240"])
+        self.assertEqual(self.ids(self.index.search("spider man")), ["tt0145487", "tt6320628"])  # exact first
+        self.assertEqual(self.ids(self.index.search("far spider")), ["tt6320628"])  # any word order
+        self.assertEqual(self.ids(self.index.search("apollo", limit=1)), ["tt0112384"])
+        self.assertEqual(self.index.search("apollo 2"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_search_filters(self):
+        self.assertEqual(self.ids(self.index.search("apollo", year=2011)), ["tt1772240"])
+        self.assertEqual(self.ids(self.index.search("battlestar", type="series")), ["tt0407362"])
+        self.assertEqual(self.ids(self.index.search("battlestar", year="2006")), ["tt0407362"])
+        self.assertEqual(self.ids(self.index.search("simpsons", year=2020)), ["tt0096697"])
+        self.assertEqual(self.index.search("simpsons", type="movie"), [])
+        self.assertEqual(self.ids(self.index.search("battlestar", type="Series")), ["tt0407362"])
+        self.assertEqual(self.index.search("apollo", year="2011a"), [])
+        self.assertEqual(self.index.search("apollo", year=""), [])
+
+    def test_search_fuzzy(self):
+        self.assertEqual(self.index.search("batlestar galactca"), [])
+        res = self.index.search("batlestar galactca", fuzzy=True)
+        self.assertEqual(sorted(self.ids(res)), ["tt0076984", "tt0407362"])
+        # word matches come before similar titles
+        self.assertEqual(self.ids(self.index.search("apollo 13", fuzzy=True))[:2], ["tt0112384", "tt1772240"])
+
+    def test_update_and_remove(self):
+        self.assertFalse(self.index.add({"title": "No Id"}))
+        self.assertFalse(self.index.add({"response": "False", "error": "Movie not found!"}))
+        self.assertTrue(self.index.add({"title": "Apollo 13", "imdb_id": "tt0112384", "rated": "PG"}))
+        self.assertEqual(self.index.get("tt0112384")["year"], "1995")  # updated, not replaced
+        self.assertNotIn("rated", self.index.get("tt0112384"))
+
+        self.index.add({"title": "Apollo Thirteen", "imdb_id": "tt0112384"})  # retitled
+        self.assertEqual(self.ids(self.index.search("apollo 1")), ["tt1772240"])
+        self.assertEqual(self.ids(self.index.search("thirteen")), ["tt0112384"])
+
+        self.assertTrue(self.index.remove("tt0112384"))
+        self.assertFalse(self.index.remove("tt0112384"))
+        self.assertNotIn("tt0112384", self.index)
+        self.assertEqual(self.index.search("thirteen"), [])
+        self.assertEqual(len(self.index), len(TITLES) - 1)
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.search("apollo", fuzzy=True), [])
+
+    def test_models(self):
+        index = TitleIndex()
+        index.add(Movie.from_dict(TITLES[0]))
+        self.assertEqual(self.ids(index.search("apollo")), ["tt0112384"])
+
+    def test_min_similarity(self):
+        self.assertRaises(ValueError, lambda: TitleIndex(min_similarity=0))
+        self.assertEqual(TitleIndex(min_similarity=0.5).min_similarity, 0.5)
+
+
+class TestOMDBIndex(unittest.TestCase):
+    def test_populated(self):
+        index = TitleIndex()
+        omdb = OMDBOverloaded(api_key=API_KEY, index=index)
+        self.assertIs(omdb.index, index)
+        res = omdb.search("Band of Brothers")
+        omdb.get_movie(title="Apollo 13")
+        self.assertEqual(len(index), len(res["search"]) + 1)
+        self.assertEqual(index.get("tt0112384")["title"], "Apollo 13")
+
+    def test_search_local(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, index=TitleIndex())
+        self.assertEqual(omdb.search_local("band of", fallback=False)["response"], "False")
+
+        # a miss falls back to the OMDB API, adding the results to the index
+        res = omdb.search_local("Band of Brothers")
+        self.assertEqual(res, omdb.search("Band of Brothers"))
+
+        local = omdb.search_local("band of bro", type="series", fallback=False)
+        self.assertEqual(local["response"], "True")
+        self.assertEqual(local["search"][0]["title"], "Band of Brothers")  # the exact match first
+        self.assertTrue(all(itm["type"] == "series" for itm in local["search"]))
+        self.assertEqual(int(local["total_results"]), len(local["search"]))
+
+        omdb.models = True
+        local = omdb.search_local("band of bro", type="series", limit=1)
+        self.assertEqual(len(local["search"]), 1)
+        self.assertIsInstance(local["search"][0], SearchItem)
+
+        local = omdb.search_local("band of bro", y="2001a", fallback=False)  # not a year; nothing matches
+        self.assertEqual(local["response"], "False")
+
+    def test_no_index(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertIsNone(omdb.index)
+        self.assertRaises(OMDBException, lambda: omdb.search_local("apollo"))
+        self.assertRaises(TypeError, lambda: setattr(omdb, "index", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unittest class for the instrumentation hooks and metrics
+"""
+
+import unittest
+
+from omdb import ClientMetrics, LRUCache
+from omdb.exceptions import OMDBNoResults
+from omdb.metrics import Histogram, request_kind
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class TestHooks(unittest.TestCase):
+    def test_events(self):
+        events = []
+        omdb = OMDBOverloaded(api_key=API_KEY, hooks=[events.append])
+        omdb.get_movie(title="Apollo 13")
+
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertEqual(event.params, {"apikey": "***", "t": "Apollo 13", "type": "movie"})
+        self.assertEqual(event.kind, "get")
+        self.assertEqual(event.status, 200)
+        self.assertGreater(event.bytes, 500)
+        self.assertGreater(event.network, 0)
+        self.assertGreater(event.decode, 0)
+        self.assertGreater(event.format, 0)
+        self.assertGreaterEqual(event.total, event.network + event.decode + event.format)
+        self.assertIsNone(event.cache)
+        self.assertIsNone(event.error)
+
+    def test_cache_and_errors(self):
+        events = []
+        omdb = OMDBOverloaded(api_key=API_KEY, cache=LRUCache())
+        omdb.add_hook(events.append)
+        omdb.get_movie(title="Apollo 13")
+        omdb.get_movie(title="Apollo 13")
+        self.assertRaises(OMDBNoResults, lambda: omdb.get(title="Random Movie Title"))
+
+        self.assertEqual([e.cache for e in events], ["miss", "hit", "miss"])
+        self.assertEqual(events[1].status, None)
+        self.assertEqual(events[2].error, "OMDBNoResults")
+
+    def test_remove_and_bad_hooks(self):
+        events = []
+
+        def bad_hook(event):
+            raise ValueError("bad hook")
+
+        omdb = OMDBOverloaded(api_key=API_KEY, hooks=[bad_hook, events.append])
+        with self.assertLogs("omdb.omdb", level="ERROR"):
+            omdb.get_movie(title="Apollo 13")
+        self.assertEqual(len(events), 1)
+
+        omdb.remove_hook(bad_hook)
+        omdb.remove_hook(events.append)
+        omdb.get_movie(title="Apollo 13")
+        self.assertEqual(len(events), 1)
+        self.assertRaises(TypeError, lambda: omdb.add_hook("not callable"))
+
+
+class TestClientMetrics(unittest.TestCase):
+    def test_metrics(self):
+        metrics = ClientMetrics()
+        omdb = OMDBOverloaded(api_key=API_KEY, hooks=[metrics])
+        omdb.get_series(title="Battlestar Galactica", pull_episodes=True)
+        self.assertRaises(OMDBNoResults, lambda: omdb.get(title="Random Movie Title"))
+
+        snap = metrics.snapshot()
+        self.assertEqual(snap["requests"], {"get": 2, "season": 4})
+        self.assertEqual(snap["errors"], {"OMDBNoResults": 1})
+        self.assertGreater(snap["bytes"], 0)
+        self.assertEqual(snap["latency"]["season"]["count"], 4)
+        self.assertEqual(snap["phases"]["network"]["count"], 6)
+
+        text = metrics.prometheus()
+        self.assertIn('omdb_requests_total{kind="season"} 4', text)
+        self.assertIn('omdb_request_seconds_count{kind="get"} 2', text)
+        self.assertIn('omdb_phase_seconds_bucket{phase="format",le="+Inf"} 6', text)
+
+    def test_histogram(self):
+        hist = Histogram(buckets=(0.1, 1.0))
+        for val in (0.05, 0.05, 0.5, 5.0):
+            hist.observe(val)
+        self.assertEqual(hist.cumulative(), [(0.1, 2), (1.0, 3), (float("inf"), 4)])
+        self.assertEqual(hist.quantile(0.5), 0.1)
+        self.assertEqual(hist.quantile(0.75), 1.0)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+    def test_request_kind(self):
+        self.assertEqual(request_kind({"s": "a"}), "search")
+        self.assertEqual(request_kind({"t": "a", "Season": 1}), "season")
+        self.assertEqual(request_kind({"t": "a", "Season": 1, "Episode": 2}), "episode")
+        self.assertEqual(request_kind({"i": "tt1"}), "get")
@@ -0,0 +1,128 @@
+"""
+Unittest class for the typed result models
+"""
+
+import unittest
+from datetime import date
+
+from omdb.models import Episode, Movie, Rating, SearchItem, Series, parse_date, parse_float, parse_int, parse_score
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class TestParsers(unittest.TestCase):
+    def test_parse_int(self):
+        self.assertEqual(parse_int("321,557"), 321557)
+        self.assertEqual(parse_int("140 min"), 140)
+        self.assertEqual(parse_int("$173,837,933"), 173837933)
+        self.assertEqual(parse_int("2011-2019"), 2011)
+        self.assertIsNone(parse_int("unknown"))
+
+    def test_parse_float(self):
+        self.assertEqual(parse_float("7.7"), 7.7)
+        self.assertIsNone(parse_float(""))
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date("30 Jun 1995"), date(1995, 6, 30))
+        self.assertIsNone(parse_date("1995"))
+
+    def test_parse_score(self):
+        self.assertAlmostEqual(parse_score("7.7/10"), 0.77)
+        self.assertAlmostEqual(parse_score("96%"), 0.96)
+        self.assertAlmostEqual(parse_score("77/100"), 0.77)
+        self.assertIsNone(parse_score("N/A"))
+
+
+class TestModels(unittest.TestCase):
+    def test_lazy_parsing(self):
+        mov = Movie.from_dict({"title": "Apollo 13", "imdb_votes": "321,557", "dvd": "N/A", "year": "1995"})
+        self.assertEqual(mov.title, "Apollo 13")
+        self.assertEqual(mov._imdb_votes, "321,557")
+        self.assertFalse(hasattr(mov, "_imdb_votes_parsed"))
+        self.assertEqual(mov.imdb_votes, 321557)
+        self.assertEqual(mov._imdb_votes_parsed, 321557)
+        self.assertIsNone(mov.dvd)
+        self.assertIsNone(mov.runtime)  # missing
+        self.assertEqual(mov.to_dict(), {"title": "Apollo 13", "imdb_votes": "321,557", "dvd": "N/A", "year": "1995"})
+
+    def test_unknown_keys(self):
+        data = {"title": "Apollo 13", "something_new": "value"}
+        mov = Movie.from_dict(data)
+        self.assertFalse(hasattr(mov, "something_new"))
+        self.assertEqual(mov.to_dict(), data)
+
+    def test_slots(self):
+        mov = Movie.from_dict({"title": "Apollo 13"})
+        self.assertFalse(hasattr(mov, "__dict__"))
+        self.assertRaises(AttributeError, setattr, mov, "not_a_field", 1)
+
+    def test_rating(self):
+        rating = Rating.from_dict({"source": "Rotten Tomatoes", "value": "96%"})
+        self.assertEqual(rating.source, "Rotten Tomatoes")
+        self.assertAlmostEqual(rating.score, 0.96)
+
+    def test_equality(self):
+        self.assertEqual(SearchItem(title="Malcolm", year="1986"), SearchItem(title="Malcolm", year="1986"))
+        self.assertNotEqual(SearchItem(title="Malcolm", year="1986"), Movie(title="Malcolm", year="1986"))
+
+
+class TestOMDBModels(unittest.TestCase):
+    def test_disabled_by_default(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertFalse(omdb.models)
+        self.assertIsInstance(omdb.get_movie(title="Apollo 13"), dict)
+
+    def test_get_movie(self):
+        mov = OMDBOverloaded(api_key=API_KEY, models=True).get_movie(title="Apollo 13")
+        self.assertIsInstance(mov, Movie)
+        self.assertEqual(mov.year, 1995)
+        self.assertEqual(mov.runtime, 140)
+        self.assertEqual(mov.imdb_rating, 7.7)
+        self.assertEqual(mov.released, date(1995, 6, 30))
+        self.assertEqual(mov.director, "Ron Howard")
+        self.assertEqual([r.source for r in mov.ratings][0], "Internet Movie Database")
+
+        expected = OMDBOverloaded(api_key=API_KEY).get_movie(title="Apollo 13")
+        self.assertEqual(mov.to_dict(), expected)
+        self.assertEqual(list(mov.to_dict()), list(expected))
+
+    def test_get_series(self):
+        bsg = OMDBOverloaded(api_key=API_KEY, models=True).get_series(title="Battlestar Galactica", pull_episodes=True)
+        self.assertIsInstance(bsg, Series)
+        self.assertEqual(bsg.total_seasons, 4)
+        self.assertEqual(sorted(bsg.seasons), [1, 2, 3, 4])
+
+        expected = OMDBOverloaded(api_key=API_KEY).get_series(title="Battlestar Galactica", pull_episodes=True)
+        self.assertEqual(bsg.to_dict(), expected)
+
+    def test_get_episode(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, models=True)
+        epi = omdb.get_episode(title="Psych", season=3, episode=10)
+        self.assertIsInstance(epi, Episode)
+        self.assertEqual((epi.season, epi.episode), (3, 10))
+        self.assertEqual(epi.title, "Six Feet Under the Sea")
+
+        # a whole season is not an episode
+        self.assertIsInstance(omdb.get_episodes(title="Psych", season=3), dict)
+
+    def test_search(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, models=True)
+        res = omdb.search("Band of Brothers")
+        self.assertEqual(res["total_results"], "11")
+        self.assertEqual(len(res["search"]), 11)
+        self.assertTrue(all(isinstance(itm, SearchItem) for itm in res["search"]))
+        self.assertEqual(res["search"][0].year, 2001)
+
+        expected = OMDBOverloaded(api_key=API_KEY).search("Band of Brothers")
+        self.assertEqual([itm.to_dict() for itm in res["search"]], expected["search"])
+
+        self.assertTrue(all(isinstance(itm, SearchItem) for itm in omdb.iter_search("Band of Brothers")))
+
+    def test_non_strict_errors_not_converted(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, strict=False, models=True)
+        res = omdb.get_series(title="Random Movie Title")
+        self.assertIsInstance(res, dict)
+        self.assertEqual(res["response"], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
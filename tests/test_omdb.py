@@ -2,8 +2,11 @@
 Unittest class
 """
 
+import json
 import os
+import threading
 import unittest
+from itertools import islice
 
 import requests
 from dotenv import load_dotenv
@@ -18,10 +21,13 @@ BUILD_TEST_DATA = False
 API_KEY = "superscret" if not BUILD_TEST_DATA else os.getenv("OMDB_API_KEY", "supersecret")
 RECORD_MODE = "new_episodes" if BUILD_TEST_DATA else "none"
 
+# VCR patches the http connection globally; serialize cassette usage when pulling pages concurrently
+VCR_LOCK = threading.Lock()
+
 
 class OMDBOverloaded(OMDB):
-    def __init__(self, api_key, timeout=5, strict=True):
-        super().__init__(api_key, timeout, strict)
+    def __init__(self, api_key, timeout=5, strict=True, max_workers=4, **kwargs):
+        super().__init__(api_key, timeout, strict, max_workers, **kwargs)
 
         self.vcr = VCR(
             decode_compressed_response=True,
@@ -55,10 +61,9 @@ class OMDBOverloaded(OMDB):
 
         return str(kwargs)
 
-    def _get_response(self, kwargs):
-        with self.vcr.use_cassette(path=f"./tests/cassettes/{self._build_path(kwargs)}.yaml"):
-            response = requests.get(self._api_url, params=kwargs, timeout=self._timeout).json()
-        return self._format_results(response, kwargs)
+    def _send(self, kwargs):
+        with VCR_LOCK, self.vcr.use_cassette(path=f"./tests/cassettes/{self._build_path(kwargs)}.yaml"):
+            return requests.get(self._api_url, params=kwargs, timeout=self._timeout)
 
 
 class TestOMDBSetup(unittest.TestCase):
@@ -72,6 +77,14 @@ class TestOMDBSetup(unittest.TestCase):
         omdb.close()
         self.assertIsNone(omdb._session)
 
+    def test_max_workers(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertEqual(omdb.max_workers, 4)
+        omdb.max_workers = "8"
+        self.assertEqual(omdb.max_workers, 8)
+        self.assertRaises(ValueError, lambda: OMDBOverloaded(api_key=API_KEY, max_workers=0))
+        self.assertRaises(ValueError, lambda: OMDBOverloaded(api_key=API_KEY, max_workers="test"))
+
 
 class TestOMDBExceptions(unittest.TestCase):
     def test_api_key_fail(self):
@@ -233,6 +246,46 @@ class TestOMDBGet(unittest.TestCase):
         self.assertEqual(res["rated"], "PG")
 
 
+class TestOMDBGetMany(unittest.TestCase):
+    def test_get_many(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        keys = ["tt0190332", "Apollo 13", "tt0190332"]
+        res = omdb.get_many(keys, type="movie")
+        self.assertEqual(list(res), ["tt0190332", "Apollo 13"])
+        self.assertEqual(res["tt0190332"]["title"], "Crouching Tiger, Hidden Dragon")
+        self.assertEqual(res["Apollo 13"]["imdb_id"], "tt0112384")
+
+    def test_get_many_strict(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        res = omdb.get_many(["Random Movie Title"])
+        self.assertIsInstance(res["Random Movie Title"], OMDBNoResults)
+
+    def test_get_many_not_strict(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, strict=False)
+        res = omdb.get_many(["Random Movie Title"])
+        self.assertEqual(res["Random Movie Title"]["error"], "Movie not found!")
+
+    def test_iter_many_completion_order(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, max_workers=2)
+        keys = ["tt0190332", "Apollo 13", "tt0190332"]
+        res = list(omdb.iter_many(iter(keys), deduplicate=False, type="movie"))
+        self.assertEqual(sorted(k for k, _ in res), sorted(keys))
+
+    def test_iter_many_bounded(self):
+        in_flight = []
+
+        def keys():
+            for _ in range(20):
+                in_flight.append(1)
+                yield "tt0190332"
+
+        omdb = OMDBOverloaded(api_key=API_KEY, max_workers=3)
+        for _ in omdb.iter_many(keys(), ordered=True, deduplicate=False, type="movie"):
+            # the item being consumed plus those in flight
+            self.assertLessEqual(len(in_flight), 4)
+            in_flight.pop()
+
+
 class TestOMDBSearch(unittest.TestCase):
     def test_search(self):
         omdb = OMDBOverloaded(api_key=API_KEY)
@@ -279,6 +332,35 @@ class TestOMDBSearch(unittest.TestCase):
         self.assertTrue(movie)
         self.assertEqual(movie["imdb_id"], "tt0091464")
 
+    def test_iter_search(self):
+        pages = []
+
+        class PageCounter(OMDBOverloaded):
+            def _get_response(self, kwargs):
+                pages.append(kwargs["page"])
+                return super()._get_response(kwargs)
+
+        omdb = PageCounter(api_key=API_KEY)
+        res = omdb.iter_search("malcolm", type="movie")
+        first = next(res)
+        self.assertEqual(first["title"], omdb.search_movie("malcolm", pull_all_results=False)["search"][0]["title"])
+        pages.clear()
+
+        self.assertEqual(len(list(islice(res, 9))), 9)
+        self.assertEqual(pages, [])  # still on the first page
+        next(res)
+        self.assertEqual(pages, [2])
+
+        self.assertEqual(len(list(omdb.iter_search("malcolm", type="movie"))), 88)
+        self.assertEqual(len(list(omdb.iter_search("malcolm", max_results=15, type="movie"))), 15)
+        self.assertEqual(list(omdb.iter_search("malcolm", max_results=0, type="movie")), [])
+
+    def test_search_concurrent_page_order(self):
+        serial = OMDBOverloaded(api_key=API_KEY, max_workers=1).search_movie("malcolm")
+        concurrent = OMDBOverloaded(api_key=API_KEY, max_workers=8).search_movie("malcolm")
+        self.assertEqual(len(concurrent["search"]), 88)
+        self.assertEqual(serial["search"], concurrent["search"])
+
 
 class TestOMDBSeries(unittest.TestCase):
     def test_series(self):
@@ -305,6 +387,51 @@ class TestOMDBSeries(unittest.TestCase):
             season = bsg["seasons"][i]
             self.assertEqual(season["episodes"][0]["episode"], "1")
 
+    def test_get_series_pull_episodes_partial_results(self):
+        class MissingSeason(OMDBOverloaded):
+            def _get_response(self, kwargs):
+                if kwargs.get("Season") == 3:
+                    raise OMDBNoResults("Series or season not found!", kwargs)
+                return super()._get_response(kwargs)
+
+        omdb = MissingSeason(api_key=API_KEY)
+        self.assertRaises(OMDBNoResults, lambda: omdb.get_series(title="Battlestar Galactica", pull_episodes=True))
+
+        bsg = omdb.get_series(title="Battlestar Galactica", pull_episodes=True, partial_results=True)
+        self.assertEqual(sorted(bsg["seasons"]), [1, 2, 4])
+        self.assertEqual(list(bsg["season_errors"]), [3])
+        self.assertIsInstance(bsg["season_errors"][3], OMDBNoResults)
+
+    def test_refresh_series(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        bsg = omdb.get_series(title="Battlestar Galactica", pull_episodes=True)
+
+        # the stored result was pulled before season 4 aired and season 3 was complete
+        previous = json.loads(json.dumps(bsg))  # season numbers become strings
+        del previous["seasons"]["4"]
+        removed = previous["seasons"]["3"]["episodes"].pop()
+        previous["seasons"]["3"]["episodes"][0]["title"] = "Occupation (Working Title)"
+        previous["total_seasons"] = "3"
+
+        events = []
+        omdb.add_hook(events.append)
+        res, diff = omdb.refresh_series(previous, title="Battlestar Galactica")
+        self.assertEqual([e.params.get("Season") for e in events], [None, 3, 4])  # the series, seasons 3 and 4
+        self.assertEqual(res, bsg)
+        self.assertEqual(sorted(diff["added"]), [3, 4])
+        self.assertEqual(diff["added"][3], [removed])
+        self.assertEqual(diff["added"][4], bsg["seasons"][4]["episodes"])
+        self.assertEqual(diff["changed"], {3: [bsg["seasons"][3]["episodes"][0]]})
+
+        # nothing has changed since the refresh
+        res, diff = omdb.refresh_series(res, title="Battlestar Galactica")
+        self.assertEqual(res, bsg)
+        self.assertEqual(diff, {"added": {}, "changed": {}})
+
+    def test_refresh_series_requires_key(self):
+        omdb = OMDBOverloaded(api_key=API_KEY)
+        self.assertRaises(OMDBException, lambda: omdb.refresh_series({"title": "Battlestar Galactica"}))
+
 
 class TestOMDBEpisodes(unittest.TestCase):
     def test_episodes(self):
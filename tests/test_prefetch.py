@@ -0,0 +1,142 @@
+"""
+Unittest class for speculatively prefetching the details of search results
+"""
+
+import threading
+import unittest
+
+from omdb import OMDB, LRUCache, Prefetcher, RateLimiter
+from omdb.cache import cache_key
+from tests.helpers import FakeOMDB
+from tests.test_omdb import API_KEY
+
+RESULTS = [
+    {"title": "Apollo 13", "year": "1995", "imdb_id": "tt0112384", "type": "movie", "plot": "..."},
+    {"title": "Apollo 18", "year": "2011", "imdb_id": "tt1772240", "type": "movie", "plot": "..."},
+    {"title": "Apollo 13: To the Edge and Back", "year": "1994", "imdb_id": "tt0149000", "type": "movie"},
+]
+
+
+class TestPrefetcher(unittest.TestCase):
+    def test_settings(self):
+        prefetch = Prefetcher(top_n=5, max_in_flight=3)
+        self.assertEqual((prefetch.top_n, prefetch.max_in_flight), (5, 3))
+        self.assertRaises(ValueError, lambda: Prefetcher(top_n=0))
+        self.assertRaises(ValueError, lambda: Prefetcher(max_in_flight=0))
+        self.assertRaises(TypeError, lambda: OMDB(api_key=API_KEY, prefetch=3))
+
+    def test_counters(self):
+        prefetch = Prefetcher(max_in_flight=1, max_tracked=2)
+        for key in ("a", "b", "c"):
+            self.assertTrue(prefetch.submit(key, lambda: None))
+            prefetch.close()
+        self.assertFalse(prefetch.submit("d", lambda: None, admit=lambda: False))
+        self.assertTrue(prefetch.used("c"))
+        self.assertFalse(prefetch.used("c"))
+        self.assertFalse(prefetch.used("a"))  # no longer tracked
+        self.assertEqual(
+            prefetch.stats(),
+            {"issued": 3, "hits": 1, "wasted": 1, "pending": 1, "skipped": 1, "failed": 0, "hit_ratio": 1 / 3},
+        )
+
+    def test_max_in_flight(self):
+        release = threading.Event()
+        prefetch = Prefetcher(max_in_flight=1)
+        self.assertTrue(prefetch.submit("a", release.wait))
+        self.assertFalse(prefetch.submit("b", release.wait))
+        release.set()
+        prefetch.close()
+        self.assertEqual((prefetch.issued, prefetch.skipped), (1, 1))
+
+
+class TestOMDBPrefetch(unittest.TestCase):
+    def build(self, **kwargs):
+        kwargs.setdefault("cache", LRUCache())
+        errors = {"tt0149000": "Error getting data."}
+        return FakeOMDB(api_key=API_KEY, results=RESULTS, errors=errors, prefetch=Prefetcher(top_n=2), **kwargs)
+
+    def test_search(self):
+        omdb = self.build()
+        self.assertIsInstance(omdb.prefetch, Prefetcher)
+        omdb.search_movie("apollo")
+        omdb.prefetch.close()
+        self.assertEqual(omdb.requests[1:], [{"i": "tt0112384"}, {"i": "tt1772240"}])
+
+        self.assertEqual(omdb.get_movie(imdbid="tt0112384")["plot"], "...")  # served from the cache
+        self.assertEqual(len(omdb.requests), 3)
+        self.assertEqual(omdb.prefetch.stats()["hits"], 1)
+        self.assertEqual(omdb.prefetch.hit_ratio, 0.5)
+
+        omdb.search_movie("apollo", pull_all_results=False)  # already cached; not prefetched again
+        omdb.close()
+        self.assertEqual(len(omdb.requests), 3)
+        self.assertEqual(omdb.prefetch.issued, 2)
+
+    def test_get(self):
+        omdb = self.build()
+        omdb.search_movie("apollo")
+        omdb.prefetch.close()
+        self.assertEqual(omdb.get(imdbid="tt0112384")["plot"], "...")  # served from the cache
+        self.assertEqual(omdb.get_movie(imdbid="tt1772240")["plot"], "...")
+        self.assertEqual(len(omdb.requests), 3)
+        self.assertEqual(omdb.prefetch.hits, 2)
+        omdb.close()
+
+    def test_in_flight(self):
+        omdb = self.build()
+        omdb.release.clear()
+        omdb.search_movie("apollo")
+
+        # the follow up request shares the prefetch in progress
+        threads = [
+            threading.Thread(target=omdb.get_movie, kwargs={"imdbid": "tt0112384"}),
+            threading.Thread(target=omdb.get, kwargs={"imdbid": "tt1772240"}),
+        ]
+        for thread in threads:
+            thread.start()
+        omdb.release.set()
+        for thread in threads:
+            thread.join()
+        omdb.close()
+        self.assertEqual(len(omdb.requests), 3)
+        self.assertEqual(omdb.prefetch.hits, 2)
+
+    def test_iter_search_and_failures(self):
+        omdb = self.build()
+        omdb.prefetch = Prefetcher(top_n=3, max_in_flight=3)
+        self.assertEqual(len(list(omdb.iter_search("apollo"))), 3)
+        omdb.close()
+        self.assertEqual(len(omdb.requests), 4)
+        self.assertEqual(omdb.prefetch.failed, 1)
+        self.assertEqual(omdb.prefetch.pending, 2)
+        self.assertIsNone(omdb.cache.get_entry({"i": "tt0149000"}))
+
+    def test_rate_limited(self):
+        omdb = self.build(rate_limiter=RateLimiter(per_second=0.01, burst=2))
+        omdb.search_movie("apollo")
+        omdb.prefetch.close()
+        # the search used one request of the budget, leaving one to prefetch
+        self.assertEqual(len(omdb.requests), 2)
+        self.assertEqual((omdb.prefetch.issued, omdb.prefetch.skipped), (1, 1))
+        self.assertFalse(omdb.rate_limiter.try_acquire())
+        omdb.close()
+
+    def test_requires_cache(self):
+        omdb = self.build(cache=None)
+        omdb.search_movie("apollo")
+        omdb.close()
+        self.assertEqual(len(omdb.requests), 1)
+        self.assertEqual(omdb.prefetch.issued, 0)
+
+    def test_cache_key(self):
+        omdb = self.build()
+        omdb.search_movie("apollo")
+        omdb.prefetch.close()
+        params = {"apikey": API_KEY, "i": "tt1772240"}
+        self.assertIsNotNone(omdb.cache.get_entry(params))
+        self.assertIsNotNone(omdb.cache.get_entry({**params, "type": "movie"}))
+        self.assertTrue(omdb.prefetch.used(cache_key(params)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Unittest class for the client side rate limiter
+"""
+
+import threading
+import time
+import unittest
+
+from omdb import OMDBRateLimited, RateLimiter
+from omdb.exceptions import OMDBLimitReached
+from omdb.rate_limiter import TokenBucket
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.wait_time(), 0.0)
+        bucket.consume()
+        bucket.consume()
+        self.assertGreater(bucket.wait_time(), 0.05)
+        bucket.drain()
+        self.assertLess(bucket.tokens, 1)
+
+    def test_bad_bucket(self):
+        self.assertRaises(ValueError, lambda: TokenBucket(rate=0, capacity=1))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_fail_fast(self):
+        limiter = RateLimiter(per_second=1, block=False)
+        limiter.acquire()
+        with self.assertRaises(OMDBRateLimited) as ctx:
+            limiter.acquire()
+        self.assertGreater(ctx.exception.retry_after, 0.5)
+        self.assertFalse(limiter.try_acquire())
+
+    def test_blocking(self):
+        limiter = RateLimiter(per_second=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_max_wait(self):
+        limiter = RateLimiter(per_second=1, max_wait=0.01)
+        limiter.acquire()
+        self.assertRaises(OMDBRateLimited, limiter.acquire)
+
+    def test_per_day(self):
+        limiter = RateLimiter(per_day=3, block=False)
+        self.assertEqual(limiter.per_day, 3)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(limiter.remaining_today, 0)
+        self.assertRaises(OMDBRateLimited, limiter.acquire)
+
+    def test_threads(self):
+        limiter = RateLimiter(per_second=100, per_day=20, block=False)
+        acquired = []
+
+        def worker():
+            for _ in range(10):
+                acquired.append(limiter.try_acquire())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(acquired), 20)
+
+    def test_no_limits(self):
+        limiter = RateLimiter()
+        for _ in range(100):
+            limiter.acquire()
+        self.assertIsNone(limiter.remaining_today)
+
+
+class TestOMDBRateLimiter(unittest.TestCase):
+    def test_throttled(self):
+        omdb = OMDBOverloaded(api_key=API_KEY, rate_limiter=RateLimiter(per_day=2, block=False))
+        omdb.get_movie(title="Apollo 13")
+        omdb.get_movie(imdbid="tt0190332")
+        self.assertRaises(OMDBRateLimited, lambda: omdb.get_movie(title="Apollo 13"))
+
+    def test_limit_reached(self):
+        def tmp_build_path(kwargs):
+            return f"exceptions/limit_reached/{kwargs['s']}"
+
+        omdb = OMDBOverloaded(api_key=API_KEY, rate_limiter=RateLimiter(per_day=1000, block=False))
+        omdb._build_path = tmp_build_path
+        self.assertRaises(OMDBLimitReached, lambda: omdb.search("order"))
+        self.assertEqual(omdb.rate_limiter.remaining_today, 0)
+        self.assertRaises(OMDBRateLimited, lambda: omdb.search("order"))
+
+    def test_bad_rate_limiter(self):
+        self.assertRaises(TypeError, lambda: OMDBOverloaded(api_key=API_KEY, rate_limiter=5))
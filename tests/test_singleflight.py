@@ -0,0 +1,185 @@
+"""
+Unittest class for coalescing concurrent identical requests
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from omdb import LRUCache
+from omdb.exceptions import OMDBNoResults
+from omdb.singleflight import AsyncSingleFlight, SingleFlight
+from tests.test_async_omdb import AsyncOMDBOverloaded
+from tests.test_omdb import API_KEY, OMDBOverloaded
+
+
+class SlowOMDB(OMDBOverloaded):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def _get_response(self, kwargs):
+        self.calls += 1
+        time.sleep(0.1)  # long enough for the other threads to join the in-flight request
+        return super()._get_response(kwargs)
+
+
+class SlowAsyncOMDB(AsyncOMDBOverloaded):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    async def _get_response(self, kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return await super()._get_response(kwargs)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_do(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(4)
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"title": "one", "ratings": []}
+
+        def caller(_):
+            barrier.wait()
+            return flight.do("key", func)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            res = list(pool.map(caller, range(4)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in res), [False, True, True, True])
+        self.assertEqual(len({id(val) for val, _ in res}), 4)  # each caller has its own copy
+        self.assertEqual(flight.do("key", lambda: 5), (5, False))  # not in flight anymore
+
+    def test_exception(self):
+        flight = SingleFlight()
+        barrier = threading.Barrier(3)
+
+        def func():
+            time.sleep(0.1)
+            raise ValueError("failed")
+
+        def caller(_):
+            barrier.wait()
+            try:
+                flight.do("key", func)
+            except ValueError as exc:
+                return exc
+            return None
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            res = list(pool.map(caller, range(3)))
+        self.assertEqual(len({id(exc) for exc in res}), 1)
+
+    def test_async_do(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"title": "one"}
+
+        async def main():
+            return await asyncio.gather(*[flight.do("key", func) for _ in range(5)])
+
+        res = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([shared for _, shared in res], [False, True, True, True, True])
+        self.assertEqual(len({id(val) for val, _ in res}), 5)
+
+    def test_async_leader_cancelled(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"title": "one"}
+
+        async def main():
+            leader = asyncio.ensure_future(flight.do("key", func))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flight.do("key", func))
+            await asyncio.sleep(0.01)
+            leader.cancel()  # e.g., the timeout of the first caller
+            res = await waiter
+            self.assertTrue(leader.cancelled())
+
+            # without waiters the call is cancelled with its caller
+            alone = asyncio.ensure_future(flight.do("other", func))
+            await asyncio.sleep(0.01)
+            alone.cancel()
+            await asyncio.gather(alone, return_exceptions=True)
+            self.assertEqual(flight._calls, {})
+            return res
+
+        self.assertEqual(asyncio.run(main()), ({"title": "one"}, True))
+        self.assertEqual(len(calls), 2)
+
+
+class TestOMDBCoalesce(unittest.TestCase):
+    def run_concurrently(self, omdb, func, num=8):
+        barrier = threading.Barrier(num)
+
+        def caller(_):
+            barrier.wait()
+            try:
+                return func(omdb)
+            except OMDBNoResults as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=num) as pool:
+            return list(pool.map(caller, range(num)))
+
+    def test_coalesced(self):
+        events = []
+        omdb = SlowOMDB(api_key=API_KEY, hooks=[events.append])
+        res = self.run_concurrently(omdb, lambda o: o.get_movie(imdbid="tt0190332"))
+        self.assertEqual(omdb.calls, 1)
+        self.assertTrue(all(r["title"] == "Crouching Tiger, Hidden Dragon" for r in res))
+        self.assertEqual(len({id(r) for r in res}), 8)
+        self.assertEqual(sum(e.coalesced for e in events), 7)
+
+    def test_coalesced_with_cache(self):
+        omdb = SlowOMDB(api_key=API_KEY, cache=LRUCache())
+        self.run_concurrently(omdb, lambda o: o.get_movie(imdbid="tt0190332"))
+        omdb.get_movie(imdbid="tt0190332")
+        self.assertEqual(omdb.calls, 1)
+        self.assertEqual(omdb.cache.hits, 1)
+
+    def test_coalesced_exception(self):
+        omdb = SlowOMDB(api_key=API_KEY)
+        res = self.run_concurrently(omdb, lambda o: o.get(title="Random Movie Title"))
+        self.assertEqual(omdb.calls, 1)
+        self.assertTrue(all(isinstance(r, OMDBNoResults) for r in res))
+
+    def test_not_coalesced(self):
+        omdb = SlowOMDB(api_key=API_KEY, coalesce=False)
+        self.run_concurrently(omdb, lambda o: o.get_movie(imdbid="tt0190332"), num=4)
+        self.assertEqual(omdb.calls, 4)
+
+
+class TestAsyncOMDBCoalesce(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesced(self):
+        omdb = SlowAsyncOMDB(api_key=API_KEY)
+        res = await asyncio.gather(*[omdb.get_movie(title="Apollo 13") for _ in range(5)])
+        self.assertEqual(omdb.calls, 1)
+        self.assertEqual(len({id(r) for r in res}), 5)
+        await omdb.close()
+
+    async def test_cache(self):
+        omdb = SlowAsyncOMDB(api_key=API_KEY, cache=LRUCache(), coalesce=False)
+        await omdb.get_movie(title="Apollo 13")
+        await omdb.get_movie(title="Apollo 13")
+        self.assertEqual(omdb.calls, 1)
+        await omdb.close()
@@ -0,0 +1,49 @@
+"""
+Unittest class for the utilities
+"""
+
+import json
+import unittest
+from copy import deepcopy
+
+from benchmarks.bench_format import legacy_format_results
+from benchmarks.cassettes import load_bodies
+from omdb.utilities import camelcase_to_snake_case, clean_up_strings, format_keys, is_imdbid, unique
+
+
+class TestUtilities(unittest.TestCase):
+    def test_camelcase_to_snake_case(self):
+        self.assertEqual(camelcase_to_snake_case("imdbID"), "imdb_id")
+        self.assertEqual(camelcase_to_snake_case("BoxOffice"), "box_office")
+        self.assertEqual(camelcase_to_snake_case("DVD"), "dvd")
+        self.assertEqual(camelcase_to_snake_case("totalSeasons"), "total_seasons")
+        self.assertEqual(camelcase_to_snake_case("Title"), "title")
+        self.assertEqual(camelcase_to_snake_case("aB"), "a_b")
+
+    def test_clean_up_strings(self):
+        self.assertEqual(clean_up_strings("2008–"), "2008-")
+        self.assertEqual(clean_up_strings("a‐b－c"), "a-b-c")
+        self.assertEqual(clean_up_strings("2008~2010"), "2008-2010")
+        self.assertEqual(clean_up_strings("Apollo 13"), "Apollo 13")
+
+    def test_format_keys_matches_legacy(self):
+        bodies = load_bodies()
+        self.assertGreater(len(bodies), 20)
+        for body in bodies:
+            expected = legacy_format_results(deepcopy(body))
+            res = format_keys(body)
+            self.assertEqual(json.dumps(res), json.dumps(expected))  # key order included
+
+    def test_format_keys_does_not_mutate(self):
+        body = {"Title": "Apollo 13", "Ratings": [{"Source": "x", "Value": "1"}]}
+        format_keys(body)
+        self.assertEqual(body, {"Title": "Apollo 13", "Ratings": [{"Source": "x", "Value": "1"}]})
+
+    def test_is_imdbid(self):
+        self.assertTrue(is_imdbid("tt0112384"))
+        self.assertTrue(is_imdbid(" tt0112384 "))
+        self.assertFalse(is_imdbid("Apollo 13"))
+        self.assertFalse(is_imdbid("tt"))
+
+    def test_unique(self):
+        self.assertEqual(list(unique(["a", "b", "a", "c", "b"])), ["a", "b", "c"])